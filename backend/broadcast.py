@@ -0,0 +1,78 @@
+import threading
+
+
+def batch_room(room_code):
+    """Socket.IO room that batched clients of ``room_code`` join instead"""
+    return f"{room_code}#batch"
+
+
+class BroadcastBatcher:
+    """
+    Coalesces a room's outbound events into periodic ``events_batch`` frames.
+
+    Events are buffered per room and flushed as one ordered list every
+    ``interval`` seconds, or immediately once a room has ``max_batch`` events
+    waiting. Only rooms with batched subscribers buffer anything; the owning
+    worker counts them with ``subscribe``/``unsubscribe``. Buffers are taken
+    under the lock and emitted after releasing it, with flushes serialised so
+    batches still leave in the order their events were added.
+    """
+
+    def __init__(self, emit_batch, interval, max_batch):
+        self.emit_batch = emit_batch  # emit_batch(room_code, [{"event", "data"}, ...])
+        self.interval = interval
+        self.max_batch = max_batch
+        self.buffers = {}  # room_code -> pending events
+        self.subscribers = {}  # room_code -> batched connections
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.stats = {"events": 0, "batches": 0, "sizeFlushes": 0}
+
+    def subscribe(self, room_code):
+        with self.lock:
+            self.subscribers[room_code] = self.subscribers.get(room_code, 0) + 1
+
+    def unsubscribe(self, room_code):
+        with self.lock:
+            count = self.subscribers.get(room_code, 0) - 1
+            if count > 0:
+                self.subscribers[room_code] = count
+            else:
+                self.subscribers.pop(room_code, None)
+                self.buffers.pop(room_code, None)
+
+    def add(self, room_code, event, data):
+        with self.lock:
+            if room_code not in self.subscribers:
+                return
+            buffer = self.buffers.setdefault(room_code, [])
+            buffer.append({"event": event, "data": data})
+            self.stats["events"] += 1
+            full = len(buffer) >= self.max_batch
+            if full:
+                self.stats["sizeFlushes"] += 1
+        if full:
+            self._flush([room_code])
+
+    def _flush(self, room_codes):
+        with self.flush_lock:
+            with self.lock:
+                batches = [(room_code, self.buffers.pop(room_code, None)) for room_code in room_codes]
+                batches = [(room_code, events) for room_code, events in batches if events]
+                self.stats["batches"] += len(batches)
+            for room_code, events in batches:
+                self.emit_batch(room_code, events)
+
+    def flush_all(self):
+        with self.lock:
+            room_codes = list(self.buffers)
+        self._flush(room_codes)
+
+    def run(self, sleep):
+        """Flush every ``interval`` seconds forever"""
+        while True:
+            sleep(self.interval)
+            try:
+                self.flush_all()
+            except Exception as e:
+                print(f"❌ Broadcast flush failed: {e}")
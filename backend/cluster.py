@@ -0,0 +1,163 @@
+import hashlib
+import hmac
+import http.cookiejar
+import json
+import queue
+import threading
+import time
+
+import requests
+from socketio.pubsub_manager import PubSubManager
+
+
+class LoopbackManager(PubSubManager):
+    """
+    In-process stand-in for a Socket.IO message queue.
+
+    Every manager created with the same channel in this process is a
+    subscriber, so several SocketIO servers (e.g. in tests) fan events out to
+    each other exactly as separate workers would through Redis or AMQP.
+    Messages are JSON round-tripped to behave like a real wire.
+    """
+    name = 'loopback'
+    channels = {}  # channel -> [inbox queue, ...]
+    channels_lock = threading.Lock()
+
+    def __init__(self, url='loopback://', channel='flask-socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.inbox = queue.Queue()
+        if not write_only:
+            with self.channels_lock:
+                self.channels.setdefault(channel, []).append(self.inbox)
+
+    def _publish(self, data):
+        payload = json.dumps(data)
+        with self.channels_lock:
+            inboxes = list(self.channels.get(self.channel, []))
+        for inbox in inboxes:
+            inbox.put(payload)
+
+    def _listen(self):
+        while True:
+            yield self.inbox.get()
+
+
+# Per-connection headers a proxy must not pass on
+HOP_BY_HOP = frozenset((
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te', 'trailer',
+    'transfer-encoding', 'upgrade', 'host', 'content-length'
+))
+
+
+def create_client_manager(url, channel='flask-socketio'):
+    """
+    Build SocketIO kwargs for the configured message queue URL.
+
+    ``loopback://`` selects the in-process broker; any other URL (redis://,
+    amqp://, ...) is handed to Flask-SocketIO, which picks the matching manager.
+    """
+    if not url:
+        return {}
+    if url.startswith('loopback://'):
+        return {"client_manager": LoopbackManager(url, channel=channel)}
+    return {"message_queue": url, "channel": channel}
+
+
+class RoomRouter:
+    """
+    Consistent room-to-worker assignment for a multi-process deployment.
+
+    Each room is owned by exactly one worker, chosen by rendezvous hashing over
+    the configured worker URLs, so adding or removing a worker only moves the
+    rooms that hashed to it. Requests for rooms owned elsewhere are proxied or
+    forwarded to the owner, which holds the room's state and emits through
+    the shared message queue.
+
+    Forwarded requests are signed over their method, path, body and a
+    millisecond timestamp. ``verify`` rejects timestamps more than
+    ``max_skew`` seconds away and signatures it has already accepted, so a
+    captured request cannot be replayed.
+    """
+
+    def __init__(self, worker_urls, worker_id, secret, timeout=30, proxy_timeout=120, max_skew=30):
+        self.worker_urls = [url.rstrip('/') for url in worker_urls]
+        self.worker_id = worker_id
+        self.secret = secret
+        self.timeout = timeout
+        self.proxy_timeout = proxy_timeout
+        self.max_skew = max_skew
+        self.session = requests.Session()
+        # Proxied requests carry each client's own cookies; never keep any in between
+        self.proxy_session = requests.Session()
+        self.proxy_session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        self.seen = {}  # signature -> expiry, for signatures accepted within the window
+        self.seen_lock = threading.Lock()
+
+    @property
+    def clustered(self):
+        return len(self.worker_urls) > 1
+
+    def owner(self, room_code):
+        """Index of the worker that owns ``room_code``"""
+        if not self.clustered:
+            return self.worker_id
+        return max(
+            range(len(self.worker_urls)),
+            key=lambda i: hashlib.blake2b(f"{self.worker_urls[i]}|{room_code}".encode(), digest_size=8).digest()
+        )
+
+    def is_local(self, room_code):
+        return self.owner(room_code) == self.worker_id
+
+    def owner_url(self, room_code):
+        return self.worker_urls[self.owner(room_code)]
+
+    def sign(self, method, path, body, timestamp):
+        message = f"{method.upper()}\n{path}\n{timestamp}\n".encode() + body
+        return hmac.new(self.secret.encode(), message, hashlib.sha256).hexdigest()
+
+    def verify(self, method, path, body, timestamp, signature):
+        """Check a forwarded request's signature, freshness and uniqueness"""
+        try:
+            sent_at = int(timestamp) / 1000
+        except (TypeError, ValueError):
+            return False
+        now = time.time()
+        if abs(now - sent_at) > self.max_skew:
+            return False
+        if not hmac.compare_digest(self.sign(method, path, body, timestamp), signature or ''):
+            return False
+        with self.seen_lock:
+            for seen, expiry in list(self.seen.items()):
+                if expiry < now:
+                    del self.seen[seen]
+            if signature in self.seen:
+                return False
+            self.seen[signature] = sent_at + self.max_skew
+        return True
+
+    def forward(self, room_code, action, payload):
+        """Send a room operation to the owning worker's internal endpoint"""
+        body = json.dumps(payload).encode()
+        path = f"/cluster/{action}"
+        timestamp = str(int(time.time() * 1000))
+        return self.session.post(
+            self.owner_url(room_code) + path,
+            data=body,
+            headers={"Content-Type": "application/json", "X-Cluster-Timestamp": timestamp,
+                     "X-Cluster-Signature": self.sign('POST', path, body, timestamp)},
+            timeout=self.timeout
+        )
+
+    def proxy(self, room_code, method, full_path, headers, body):
+        """
+        Replay a client's HTTP request on the owning worker.
+
+        Returns the owner's response unread (``stream=True``) so large or
+        streamed bodies can be relayed as they arrive.
+        """
+        headers = {key: value for key, value in headers.items() if key.lower() not in HOP_BY_HOP}
+        return self.proxy_session.request(
+            method, self.owner_url(room_code) + full_path, data=body, headers=headers,
+            stream=True, allow_redirects=False, timeout=self.proxy_timeout
+        )
@@ -0,0 +1,241 @@
+import gc
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import msgpack
+
+# msgpack has no native datetime type, so datetimes travel as an ext type
+DATETIME_EXT = 1
+
+SEGMENT_RE = re.compile(r'^events-(\d{8})\.log$')
+SNAPSHOT_RE = re.compile(r'^snapshot-(\d{8})\.msgpack$')
+
+_frozen = False  # set once startup recovery has frozen the heap
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(DATETIME_EXT, obj.isoformat().encode())
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _ext_hook(code, data):
+    if code == DATETIME_EXT:
+        return datetime.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+def pack(obj):
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def unpack(data):
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def freeze_recovered_state():
+    """
+    Move everything allocated so far out of the cyclic GC's reach.
+
+    Recovery allocates a huge number of long-lived containers at once; frozen,
+    later collections stop rescanning them. Call once, after startup recovery
+    and before serving, since garbage that exists at this point is never
+    collected. Only the first call has an effect.
+    """
+    global _frozen
+    if _frozen:
+        return
+    _frozen = True
+    gc.collect()
+    gc.freeze()
+
+
+class EventLog:
+    """
+    Append-only binary event log with periodic compact snapshots.
+
+    Events are msgpack-encoded ``[kind, data]`` records written to numbered
+    segment files. Taking a snapshot rotates to a fresh segment and captures
+    the in-memory state at that boundary; serialisation happens on a background
+    thread and older segments are deleted once the snapshot is durable.
+    Recovery loads the newest snapshot and replays only the segments after it,
+    so restart cost is bounded by snapshot size plus the un-snapshotted tail.
+
+    Replay must be idempotent: an event that raced with a snapshot capture can
+    appear both in the snapshot and in the following segment. Packing is CPU
+    bound, so it goes through ``offload(fn, *args)`` (e.g. ``Offloader.run``)
+    to keep it off an eventlet or gevent hub.
+    """
+
+    def __init__(self, directory, fsync=False, offload=None):
+        self.directory = directory
+        self.fsync = fsync
+        self.offload = offload or (lambda fn, *args: fn(*args))
+        self.lock = threading.Lock()
+        self.segment = None
+        self.file = None
+        self.events_since_snapshot = 0
+        self.snapshot_in_progress = False
+        self.last_snapshot_at = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, template, number):
+        return os.path.join(self.directory, template.format(number))
+
+    def _list(self, pattern):
+        numbers = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def recover(self):
+        """
+        Load the latest snapshot and the event tail written after it.
+
+        Returns (state, events) where state is the snapshot payload (or None)
+        and events is an iterator of (kind, data) tuples. Appending is only
+        possible after the iterator has been consumed and ``open`` is called.
+        """
+        state = None
+        first_segment = 0
+        for number in reversed(self._list(SNAPSHOT_RE)):
+            try:
+                with open(self._path('snapshot-{:08d}.msgpack', number), 'rb') as f:
+                    data = f.read()
+                # Recovery runs before any other thread starts, so pausing the
+                # process-wide GC for the one big decode is safe here
+                enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    state = unpack(data)
+                finally:
+                    if enabled:
+                        gc.enable()
+                first_segment = number
+                break
+            except (OSError, ValueError, msgpack.UnpackException) as e:
+                print(f"⚠️ Skipping unreadable snapshot {number}: {e}")
+
+        segments = [n for n in self._list(SEGMENT_RE) if n >= first_segment]
+        self.segment = max(segments + [first_segment - 1]) + 1
+        return state, self._replay(segments)
+
+    def _replay(self, segments):
+        for number in segments:
+            with open(self._path('events-{:08d}.log', number), 'rb') as f:
+                unpacker = msgpack.Unpacker(f, ext_hook=_ext_hook, raw=False,
+                                            strict_map_key=False)
+                try:
+                    for kind, data in unpacker:
+                        yield kind, data
+                except (ValueError, msgpack.UnpackException) as e:
+                    # A torn record at the end of a segment means a crash mid-write
+                    print(f"⚠️ Stopped replaying segment {number} at a corrupt record: {e}")
+
+    def open(self):
+        """Start appending to a fresh segment"""
+        with self.lock:
+            if self.segment is None:
+                self.segment = max(self._list(SEGMENT_RE) + self._list(SNAPSHOT_RE) + [-1]) + 1
+            self.file = open(self._path('events-{:08d}.log', self.segment), 'ab')
+
+    def append(self, kind, data):
+        """Durably append one event"""
+        record = pack([kind, data])
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(record)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+            self.events_since_snapshot += 1
+
+    def snapshot(self, capture_state):
+        """
+        Rotate to a new segment and write a snapshot of ``capture_state()``.
+
+        ``capture_state`` runs under the log lock and must return a cheap,
+        consistent copy of the state; packing and writing happen in the
+        background so appends are only blocked for the capture itself.
+        ``state["messages"]`` maps rooms to ``{"count", "packed"}`` where
+        ``packed`` is either a message list, of which only the first ``count``
+        messages are written, or an already-packed blob, optionally followed by
+        a ``tail`` list of later messages.
+        """
+        with self.lock:
+            if self.file is None or self.snapshot_in_progress:
+                return False
+            self.file.close()
+            boundary = self.segment + 1
+            self.segment = boundary
+            self.file = open(self._path('events-{:08d}.log', boundary), 'ab')
+            state = capture_state()
+            self.events_since_snapshot = 0
+            self.snapshot_in_progress = True
+
+        thread = threading.Thread(target=self._write_snapshot, args=(boundary, state), daemon=True)
+        thread.start()
+        return True
+
+    @staticmethod
+    def _pack_state(state):
+        # Each room's messages are packed as a separate blob so recovery can
+        # defer decoding them until the room is first used
+        for entry in state["messages"].values():
+            tail = entry.pop("tail", None)
+            if tail:
+                entry["packed"] = pack(unpack(entry["packed"]) + tail)
+            elif not isinstance(entry["packed"], bytes):
+                entry["packed"] = pack(entry["packed"][:entry["count"]])
+        return pack(state)
+
+    def _write_snapshot(self, boundary, state):
+        try:
+            path = self._path('snapshot-{:08d}.msgpack', boundary)
+            tmp_path = path + '.tmp'
+            data = self.offload(self._pack_state, state)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            # Everything before the boundary is now covered by the snapshot
+            for number in self._list(SEGMENT_RE):
+                if number < boundary:
+                    os.remove(self._path('events-{:08d}.log', number))
+            for number in self._list(SNAPSHOT_RE):
+                if number < boundary:
+                    os.remove(self._path('snapshot-{:08d}.msgpack', number))
+            self.last_snapshot_at = datetime.now()
+            print(f"💾 Wrote snapshot {boundary}")
+        except OSError as e:
+            print(f"❌ Snapshot {boundary} failed: {e}")
+        finally:
+            self.snapshot_in_progress = False
+
+    def start_snapshotter(self, capture_state, interval, min_events=1):
+        """Periodically snapshot in a daemon thread when enough events accumulated"""
+        def run():
+            while True:
+                time.sleep(interval)
+                if self.events_since_snapshot >= min_events:
+                    self.snapshot(capture_state)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,206 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Priority classes, most urgent first
+INTERACTIVE = 0  # chat text typed by a user
+VOICE = 1  # voice messages posted to a room
+BULK = 2  # bulk and test endpoints
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", VOICE: "voice", BULK: "bulk"}
+
+
+class Overloaded(Exception):
+    """Raised when a request is not admitted to a model"""
+
+    def __init__(self, model, retry_after, reason="overloaded"):
+        super().__init__(f"{model} model is {reason}")
+        self.model = model
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Overloaded):
+    """Raised when a request's deadline passed while it was queued"""
+
+    def __init__(self, model, retry_after):
+        super().__init__(model, retry_after, reason="too busy to meet the request deadline")
+
+
+class Cancelled(Overloaded):
+    """Raised when the requesting client went away while the request was queued"""
+
+    def __init__(self, model):
+        super().__init__(model, 0, reason="no longer needed by a disconnected client")
+
+
+class _Waiter:
+    __slots__ = ("priority", "event", "granted", "rejection")
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.event = threading.Event()
+        self.granted = False
+        self.rejection = None
+
+
+class AdmissionGate:
+    """
+    Bounded, priority-ordered admission queue in front of one model.
+
+    At most ``concurrency`` calls run at once; classes below INTERACTIVE may
+    only use ``concurrency - reserved`` of those slots, so chat text always
+    has a slot that bulk work cannot take. Up to ``max_queue`` callers wait,
+    most urgent class first and FIFO within a class. When the queue is full a
+    more urgent caller displaces the newest less urgent waiter, otherwise the
+    caller is rejected with ``Overloaded``. Waiters give up with
+    ``DeadlineExceeded`` or ``Cancelled`` when their deadline passes or their
+    client disconnects; a call that is already running is never interrupted.
+    """
+
+    POLL_INTERVAL = 0.25  # seconds between cancellation checks while queued
+
+    def __init__(self, name, concurrency, max_queue, reserved=0):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.reserved = reserved
+        self.lock = threading.Lock()
+        self.queue = []  # heap of (priority, sequence, waiter)
+        self.sequence = itertools.count()
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+        self.cancelled = 0
+        self.avg_service = None  # seconds, exponentially weighted
+        self.avg_wait = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self.max_wait = {priority: 0.0 for priority in PRIORITY_NAMES}
+
+    def retry_after(self):
+        """Seconds a rejected caller should wait before retrying"""
+        service = self.avg_service or 1.0
+        return max(1, math.ceil(service * (len(self.queue) + 1) / self.concurrency))
+
+    def _slots(self, priority):
+        if priority == INTERACTIVE:
+            return self.concurrency
+        return max(1, self.concurrency - self.reserved)
+
+    def _dispatch(self):
+        # Hand free slots to the most urgent waiters. If the head cannot run,
+        # nothing behind it can either, since less urgent classes get no more slots.
+        while self.queue:
+            priority, _, waiter = self.queue[0]
+            if self.running >= self._slots(priority):
+                break
+            heapq.heappop(self.queue)
+            self.running += 1
+            waiter.granted = True
+            waiter.event.set()
+
+    def _enqueue(self, priority):
+        if len(self.queue) >= self.max_queue:
+            victim = max(self.queue, key=lambda entry: entry[:2], default=None)
+            if victim is None or victim[0] <= priority:
+                self.rejected += 1
+                raise Overloaded(self.name, self.retry_after())
+            self.queue.remove(victim)
+            heapq.heapify(self.queue)
+            self.rejected += 1
+            victim[2].rejection = Overloaded(self.name, self.retry_after())
+            victim[2].event.set()
+        waiter = _Waiter(priority)
+        heapq.heappush(self.queue, (priority, next(self.sequence), waiter))
+        return waiter
+
+    def _abandon(self, waiter, error):
+        with self.lock:
+            if waiter.granted:
+                # Granted in the meantime: give the slot straight back
+                self.running -= 1
+                self._dispatch()
+            else:
+                self.queue = [entry for entry in self.queue if entry[2] is not waiter]
+                heapq.heapify(self.queue)
+        raise error
+
+    def _wait(self, waiter, deadline, cancelled):
+        while not waiter.event.is_set():
+            timeout = self.POLL_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self.lock:
+                        self.expired += 1
+                    self._abandon(waiter, DeadlineExceeded(self.name, self.retry_after()))
+                timeout = min(timeout, remaining)
+            if cancelled is not None and cancelled():
+                with self.lock:
+                    self.cancelled += 1
+                self._abandon(waiter, Cancelled(self.name))
+            waiter.event.wait(timeout)
+        if waiter.rejection is not None:
+            raise waiter.rejection
+
+    @contextmanager
+    def admit(self, priority=INTERACTIVE, deadline=None, cancelled=None):
+        """
+        Hold one of the model's slots for the duration of the block.
+
+        ``deadline`` is a ``time.monotonic()`` value after which a still
+        queued request gives up, including one whose deadline already passed
+        before it got here; ``cancelled`` is polled while queued and returns
+        True once the requesting client has gone away.
+        """
+        start = time.perf_counter()
+        with self.lock:
+            if deadline is not None and time.monotonic() >= deadline:
+                self.expired += 1
+                raise DeadlineExceeded(self.name, self.retry_after())
+            if (not self.queue or self.queue[0][0] > priority) and self.running < self._slots(priority):
+                self.running += 1
+                waiter = None
+            else:
+                waiter = self._enqueue(priority)
+        if waiter is not None:
+            self._wait(waiter, deadline, cancelled)
+
+        waited = time.perf_counter() - start
+        with self.lock:
+            self.admitted += 1
+            self.avg_wait[priority] = 0.9 * self.avg_wait[priority] + 0.1 * waited
+            self.max_wait[priority] = max(self.max_wait[priority], waited)
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.running -= 1
+                self.avg_service = elapsed if self.avg_service is None else 0.9 * self.avg_service + 0.1 * elapsed
+                self._dispatch()
+
+    def stats(self):
+        with self.lock:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, _ in self.queue:
+                queued[PRIORITY_NAMES[priority]] += 1
+            return {
+                "concurrency": self.concurrency,
+                "reserved": self.reserved,
+                "maxQueue": self.max_queue,
+                "running": self.running,
+                "queued": len(self.queue),
+                "queuedByPriority": queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "cancelled": self.cancelled,
+                "avgWaitMs": {PRIORITY_NAMES[p]: round(w * 1000, 1) for p, w in self.avg_wait.items()},
+                "maxWaitMs": {PRIORITY_NAMES[p]: round(w * 1000, 1) for p, w in self.max_wait.items()},
+                "avgServiceMs": round((self.avg_service or 0) * 1000, 1)
+            }
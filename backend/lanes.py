@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from inference import Overloaded
+
+
+class Backlogged(Overloaded):
+    """Raised when a room already has its limit of tasks waiting"""
+
+    def __init__(self, room_code, retry_after=1):
+        super().__init__("room", retry_after)
+        self.args = (f"room {room_code} has too many messages waiting",)
+
+
+class Saturated(Overloaded):
+    """Raised when all rooms together already have their limit of tasks waiting"""
+
+    def __init__(self, retry_after=1):
+        super().__init__("lanes", retry_after)
+        self.args = ("too many messages are waiting across rooms",)
+
+
+class _Task:
+    __slots__ = ("room_code", "fn", "args", "future", "ready")
+
+    def __init__(self, room_code):
+        self.room_code = room_code
+        self.fn = None
+        self.args = ()
+        self.future = Future()
+        self.ready = False
+
+
+class RoomLanes:
+    """
+    Ordered per-room task execution on a shared worker pool.
+
+    Tasks submitted for the same room run one at a time in submission order;
+    tasks for different rooms run in parallel on up to ``workers`` threads.
+    Instead of pinning rooms to fixed lanes, a room only occupies a worker
+    while one of its tasks is running and is requeued behind other rooms after
+    each task, so a slow room never holds up another room's messages.
+
+    Slow preparation such as model inference should not run on a lane: take
+    the room's place in line with ``reserve`` when the message arrives, do the
+    work on the caller's thread, then ``fill`` the ticket with the quick commit
+    step (or ``skip`` it). Later tasks in the room wait for an unfilled ticket
+    without holding a worker. At most ``backlog_limit`` tasks wait per room and
+    ``total_backlog_limit`` across rooms; beyond that ``reserve`` and
+    ``submit`` raise ``Backlogged`` or ``Saturated``.
+    """
+
+    def __init__(self, workers, backlog_limit=256, total_backlog_limit=4096):
+        self.workers = workers
+        self.backlog_limit = backlog_limit
+        self.total_backlog_limit = total_backlog_limit
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='lane')
+        self.lock = threading.Lock()
+        self.queues = {}  # room_code -> deque of tasks not yet finished, oldest first
+        self.scheduled = set()  # rooms whose oldest task is running or handed to the pool
+        self.waiting = 0  # tasks across rooms that have not started
+        self.started_at = time.perf_counter()
+        self.busy = 0
+        self.busy_seconds = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.max_backlog = 0
+        self.rejected = 0
+
+    def reserve(self, room_code):
+        """Take the room's next place in line; returns a ticket to ``fill`` or ``skip``"""
+        with self.lock:
+            queue = self.queues.get(room_code)
+            backlog = len(queue) - (room_code in self.scheduled) if queue else 0
+            if backlog >= self.backlog_limit:
+                self.rejected += 1
+                raise Backlogged(room_code)
+            if self.waiting >= self.total_backlog_limit:
+                self.rejected += 1
+                raise Saturated()
+            task = _Task(room_code)
+            self.queues.setdefault(room_code, deque()).append(task)
+            self.waiting += 1
+            self.max_backlog = max(self.max_backlog, backlog + 1)
+        return task
+
+    def fill(self, ticket, fn, *args):
+        """Give a reserved place its task; returns a Future for its result"""
+        with self.lock:
+            ticket.fn, ticket.args, ticket.ready = fn, args, True
+            following = self._next(ticket.room_code)
+        if following is not None:
+            self.executor.submit(self._run, following)
+        return ticket.future
+
+    def skip(self, ticket):
+        """Give up a reserved place, e.g. when preparing its message failed"""
+        return self.fill(ticket, lambda: None)
+
+    def submit(self, room_code, fn, *args):
+        """Queue ``fn(*args)`` behind the room's earlier tasks; returns a Future"""
+        return self.fill(self.reserve(room_code), fn, *args)
+
+    def run(self, room_code, fn, *args):
+        """Run ``fn(*args)`` in the room's order and wait for its result"""
+        return self.submit(room_code, fn, *args).result()
+
+    def _next(self, room_code):
+        # The room's oldest task, if it is ready and not already on its way; lock held
+        queue = self.queues.get(room_code)
+        if room_code in self.scheduled or not queue or not queue[0].ready:
+            return None
+        self.scheduled.add(room_code)
+        self.waiting -= 1
+        return queue[0]
+
+    def _run(self, task):
+        room_code, future = task.room_code, task.future
+        with self.lock:
+            self.busy += 1
+        start = time.perf_counter()
+        try:
+            if future.set_running_or_notify_cancel():
+                future.set_result(task.fn(*task.args))
+        except Exception as e:
+            print(f"❌ Task for room {room_code} failed: {e}")
+            future.set_exception(e)
+            with self.lock:
+                self.failed += 1
+        finally:
+            with self.lock:
+                self.busy -= 1
+                self.busy_seconds += time.perf_counter() - start
+                self.completed += 1
+                queue = self.queues[room_code]
+                queue.popleft()
+                self.scheduled.discard(room_code)
+                if queue:
+                    following = self._next(room_code)
+                else:
+                    del self.queues[room_code]
+                    following = None
+            if following is not None:
+                # Back of the pool queue, so busy rooms take turns with quiet ones
+                self.executor.submit(self._run, following)
+
+    def stats(self):
+        with self.lock:
+            elapsed = time.perf_counter() - self.started_at
+            return {
+                "workers": self.workers,
+                "busy": self.busy,
+                "activeRooms": len(self.queues),
+                "queued": self.waiting,
+                "maxRoomBacklog": self.max_backlog,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "utilisation": round(self.busy_seconds / (elapsed * self.workers), 4) if elapsed else 0
+            }
@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Offloader:
+    """
+    Bounded pool of OS threads for blocking model and ffmpeg work.
+
+    ``run(fn, *args)`` blocks the calling handler until ``fn`` finishes, but
+    the work itself happens on one of ``max_workers`` real threads. Under
+    eventlet or gevent the caller yields to the hub while it waits, so
+    heartbeats and other rooms keep being served during inference. Work must
+    not call ``run`` again from inside the pool, or a full pool deadlocks.
+    """
+
+    def __init__(self, async_mode, max_workers):
+        self.async_mode = async_mode
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+
+        if async_mode == 'eventlet':
+            from eventlet import tpool
+            tpool.set_num_threads(max_workers)
+            self._execute = tpool.execute
+        elif async_mode in ('gevent', 'gevent_uwsgi'):
+            from gevent.threadpool import ThreadPool
+            pool = ThreadPool(max_workers)
+            self._execute = lambda fn, *args: pool.apply(fn, args)
+        else:
+            executor = ThreadPoolExecutor(max_workers, thread_name_prefix='offload')
+            self._execute = lambda fn, *args: executor.submit(fn, *args).result()
+
+    def _call(self, fn, args):
+        with self.lock:
+            self.started += 1
+        try:
+            return fn(*args)
+        except Exception:
+            with self.lock:
+                self.failed += 1
+            raise
+        finally:
+            with self.lock:
+                self.completed += 1
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` on the pool and return its result"""
+        with self.lock:
+            self.submitted += 1
+        return self._execute(self._call, fn, args)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "mode": self.async_mode,
+                "maxWorkers": self.max_workers,
+                "queued": self.submitted - self.started,
+                "running": self.started - self.completed,
+                "completed": self.completed,
+                "failed": self.failed
+            }
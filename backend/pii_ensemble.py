@@ -0,0 +1,120 @@
+import os
+import sys
+
+# Interval selection is shared with the rule-based detector's own redaction
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'scripts'))
+from pii_redaction import select_disjoint
+
+# Rule-based detector types mapped onto the PII model's entity groups, so both
+# sources report the same field names
+RULE_TYPES = {
+    "phone_number": "TELEPHONENUM",
+    "email": "EMAIL",
+    "ssn": "SOCIALNUM",
+    "credit_card": "CREDITCARDNUMBER",
+    "address": "STREET",
+    "ip_address": "IPADDRESS",
+    "date_of_birth": "DATEOFBIRTH"
+}
+
+# Lower wins when overlapping spans of different types are equally confident:
+# structured identifiers a validator or checksum can confirm come first
+TYPE_PRIORITY = {
+    "CREDITCARDNUMBER": 0, "SOCIALNUM": 1, "ACCOUNTNUM": 2, "TAXNUM": 2, "IDCARDNUM": 2,
+    "DRIVERLICENSENUM": 2, "EMAIL": 3, "TELEPHONENUM": 4, "IPADDRESS": 4, "PASSWORD": 5,
+    "USERNAME": 5, "DATEOFBIRTH": 6, "STREET": 7, "BUILDINGNUM": 7, "ZIPCODE": 7, "CITY": 8,
+    "GIVENNAME": 9, "SURNAME": 9
+}
+DEFAULT_PRIORITY = 10
+
+# Spans below their type's floor are dropped before merging, from either source
+MIN_CONFIDENCE = {"GIVENNAME": 0.6, "SURNAME": 0.6, "CITY": 0.6}
+DEFAULT_MIN_CONFIDENCE = 0.5
+
+
+def model_spans(results, source="model"):
+    """Spans from token-classification pipeline results"""
+    return [
+        {"type": r["entity_group"], "start": r["start"], "end": r["end"],
+         "confidence": float(r["score"]), "source": source}
+        for r in results
+    ]
+
+
+def rule_spans(detection, source="rules"):
+    """Spans from an EnhancedPIIDetector result"""
+    return [
+        {"type": RULE_TYPES.get(r["type"], r["type"].upper()), "start": r["position"][0],
+         "end": r["position"][1], "confidence": float(r["confidence"]), "source": source}
+        for r in detection["redactions"]
+    ]
+
+
+def _combine(group):
+    """One span for overlapping same-type spans; independent sources reinforce each other"""
+    best = {}
+    for span in group:
+        best[span["source"]] = max(best.get(span["source"], 0.0), span["confidence"])
+    missed = 1.0
+    for confidence in best.values():
+        missed *= 1.0 - confidence
+    return {
+        "type": group[0]["type"],
+        "start": min(span["start"] for span in group),
+        "end": max(span["end"] for span in group),
+        "confidence": 1.0 - missed,
+        "sources": sorted(best)
+    }
+
+
+def _agree(spans):
+    """Merge same-type spans that overlap, per type, in one sweep over start order"""
+    merged = []
+    open_groups = {}  # type -> (end, spans) of the group still accepting overlaps
+    for span in spans:
+        current = open_groups.get(span["type"])
+        if current is not None and span["start"] < current[0]:
+            current[1].append(span)
+            open_groups[span["type"]] = (max(current[0], span["end"]), current[1])
+            continue
+        if current is not None:
+            merged.append(_combine(current[1]))
+        open_groups[span["type"]] = (span["end"], [span])
+    merged.extend(_combine(group) for _, group in open_groups.values())
+    return merged
+
+
+def merge_spans(*span_lists, priority=TYPE_PRIORITY, min_confidence=MIN_CONFIDENCE):
+    """
+    Merge span lists from any number of detectors into one canonical set.
+
+    Spans below their type's confidence floor are dropped. Overlapping spans
+    of the same type are unioned, and their sources' confidences combine
+    (noisy-or). Overlapping spans of different types are then resolved
+    greedily: highest confidence first, then type priority, then the longer
+    span, using ``select_disjoint``. Sorting dominates, so merging n spans
+    is O(n log n). Returns non-overlapping spans in text order.
+    """
+    spans = [
+        span for spans in span_lists for span in spans
+        if span["end"] > span["start"]
+        and span["confidence"] >= min_confidence.get(span["type"], DEFAULT_MIN_CONFIDENCE)
+    ]
+    spans.sort(key=lambda span: (span["start"], span["end"]))
+    candidates = _agree(spans)
+
+    order = sorted(range(len(candidates)), key=lambda i: (
+        -candidates[i]["confidence"], priority.get(candidates[i]["type"], DEFAULT_PRIORITY),
+        candidates[i]["start"] - candidates[i]["end"], candidates[i]["start"]
+    ))
+    bounds = [(span["start"], span["end"]) for span in candidates]
+    return [candidates[i] for i in select_disjoint(bounds, order)]
+
+
+def to_results(spans):
+    """Canonical spans in the model's result shape, for redaction and detectionDetails"""
+    return [
+        {"entity_group": span["type"], "start": span["start"], "end": span["end"],
+         "score": span["confidence"], "sources": span["sources"]}
+        for span in spans
+    ]
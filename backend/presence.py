@@ -0,0 +1,160 @@
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+class PresenceRegistry:
+    """
+    Users, room membership and live connection counts.
+
+    ``users`` is kept in least-recently-seen order so TTL and capacity eviction
+    only ever look at the oldest entries. Room membership lives in each chat's
+    ``participants`` dict (user_id -> display name) so it is dropped together
+    with the room. Socket connections are reference counted per (room, user),
+    which keeps a user present until their last tab disconnects.
+    """
+
+    def __init__(self, rooms, max_users, user_ttl):
+        self.rooms = rooms
+        self.max_users = max_users
+        self.user_ttl = timedelta(seconds=user_ttl)
+        self.users = OrderedDict()  # user_id -> user, least recently seen first
+        self.memberships = {}  # user_id -> {room_code, ...}
+        self.connections = {}  # (room_code, user_id) -> open connection count
+        self.user_connections = {}  # user_id -> open connections across rooms
+        self.connection_count = 0
+        self.lock = threading.RLock()
+
+    def session_user(self, name, user_id=None):
+        """Return the session's existing user, or create one for ``name``"""
+        with self.lock:
+            user = self.users.get(user_id) if user_id else None
+            if user is None or user["name"] != name:
+                user = {
+                    "id": str(uuid.uuid4()),
+                    "name": name,
+                    "email": f"{name}@example.com",  # Placeholder
+                    "avatar": None,
+                    "isOnline": False,  # becomes True once a Socket.IO connection is made
+                    "lastSeen": datetime.now()
+                }
+                self.users[user["id"]] = user
+                self._enforce_capacity()
+            self._touch(user["id"])
+            return user
+
+    def add_user(self, user):
+        """Insert or replace a user record (used when restoring state)"""
+        with self.lock:
+            self.users[user["id"]] = user
+            self.users.move_to_end(user["id"])
+
+    def _touch(self, user_id):
+        self.users[user_id]["lastSeen"] = datetime.now()
+        self.users.move_to_end(user_id)
+
+    def join(self, room_code, user_id, name):
+        """Add a user to a room's participants"""
+        with self.lock:
+            chat = self.rooms.get(room_code)
+            if chat is None:
+                return
+            chat["participants"][user_id] = name
+            self.memberships.setdefault(user_id, set()).add(room_code)
+
+    def leave(self, room_code, user_id):
+        """Remove a user from a room's participants"""
+        with self.lock:
+            chat = self.rooms.get(room_code)
+            if chat is not None:
+                chat["participants"].pop(user_id, None)
+            rooms_joined = self.memberships.get(user_id)
+            if rooms_joined is not None:
+                rooms_joined.discard(room_code)
+                if not rooms_joined:
+                    del self.memberships[user_id]
+
+    def connect(self, room_code, user_id):
+        """Count a new connection; returns True for the user's first one in the room"""
+        with self.lock:
+            key = (room_code, user_id)
+            self.connections[key] = self.connections.get(key, 0) + 1
+            self.connection_count += 1
+            self.user_connections[user_id] = self.user_connections.get(user_id, 0) + 1
+            if user_id in self.users:
+                self.users[user_id]["isOnline"] = True
+                self._touch(user_id)
+            return self.connections[key] == 1
+
+    def disconnect(self, room_code, user_id):
+        """Drop a connection; returns True when the user's last one in the room closed"""
+        with self.lock:
+            key = (room_code, user_id)
+            if key not in self.connections:
+                return False
+            self.connection_count -= 1
+            total = self.user_connections.get(user_id, 0) - 1
+            if total > 0:
+                self.user_connections[user_id] = total
+            else:
+                self.user_connections.pop(user_id, None)
+                if user_id in self.users:
+                    self.users[user_id]["isOnline"] = False
+                    self._touch(user_id)
+
+            count = self.connections[key] - 1
+            if count > 0:
+                self.connections[key] = count
+                return False
+            del self.connections[key]
+            return True
+
+    def participants(self, room_code):
+        """Display names of a room's participants"""
+        return list(self.rooms[room_code]["participants"].values())
+
+    def _evict(self, user_id):
+        self.users.pop(user_id, None)
+        for room_code in self.memberships.pop(user_id, ()):
+            chat = self.rooms.get(room_code)
+            if chat is not None:
+                chat["participants"].pop(user_id, None)
+
+    def _enforce_capacity(self):
+        # Over capacity: drop the least recently seen users without live connections
+        excess = len(self.users) - self.max_users
+        if excess <= 0:
+            return
+        victims = []
+        for user_id in self.users:
+            if len(victims) >= excess:
+                break
+            if not self.user_connections.get(user_id):
+                victims.append(user_id)
+        for user_id in victims:
+            self._evict(user_id)
+
+    def evict_expired(self, limit, now=None):
+        """Evict up to ``limit`` users unseen for longer than the TTL; returns the count"""
+        cutoff = (now or datetime.now()) - self.user_ttl
+        evicted = 0
+        with self.lock:
+            for _ in range(min(limit, len(self.users))):
+                user_id, user = next(iter(self.users.items()))
+                if user["lastSeen"] >= cutoff:
+                    break
+                if self.user_connections.get(user_id):
+                    # Still connected, so the user has effectively been seen now
+                    self._touch(user_id)
+                    continue
+                self._evict(user_id)
+                evicted += 1
+        return evicted
+
+    def stats(self):
+        return {
+            "users": len(self.users),
+            "onlineUsers": len(self.user_connections),
+            "connections": self.connection_count
+        }
@@ -0,0 +1,98 @@
+import re
+import bisect
+import threading
+
+# Bracketed placeholders such as "[REDACTED]" or "[Voice message]" are not
+# searchable content, so they are stripped before tokenising.
+PLACEHOLDER_RE = re.compile(r'\[[^\]]*\]')
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Split redacted text into lowercase search tokens"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(PLACEHOLDER_RE.sub(' ', text).lower())
+
+
+class RoomSearchIndex:
+    """
+    Incrementally maintained inverted index over the redacted content of one room.
+
+    Postings are message positions in the room's ``messages`` list. Messages are
+    only ever appended, so every postings list is already sorted by recency and
+    new messages are indexed in O(tokens). New terms are collected unsorted and
+    merged into the sorted vocabulary on the next query, which then expands
+    prefixes to all matching terms with two binary searches.
+    """
+
+    def __init__(self):
+        self.postings = {}  # term -> [message position, ...] (ascending)
+        self.vocabulary = []  # sorted list of terms, as of the last query
+        self.new_terms = []  # terms added since, not yet in the vocabulary
+        self.vocabulary_lock = threading.Lock()
+        self.size = 0  # number of messages indexed
+
+    def add(self, position, text):
+        """Index the redacted text of the message stored at ``position``"""
+        for term in set(tokenize(text)):
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = []
+                with self.vocabulary_lock:
+                    self.new_terms.append(term)
+            postings.append(position)
+        self.size = max(self.size, position + 1)
+
+    def _sorted_vocabulary(self):
+        with self.vocabulary_lock:
+            if self.new_terms:
+                # Two sorted runs, so this sort is a linear merge
+                self.new_terms.sort()
+                self.vocabulary = self.vocabulary + self.new_terms
+                self.vocabulary.sort()
+                self.new_terms = []
+            return self.vocabulary
+
+    def _expand(self, prefix):
+        """Return the postings lists of every term starting with ``prefix``"""
+        vocabulary = self._sorted_vocabulary()
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + '\uffff', start)
+        return [self.postings[term] for term in vocabulary[start:end]]
+
+    def search(self, query, offset=0, limit=20):
+        """
+        Find messages containing every query term as a word prefix.
+
+        Returns (positions, total) where positions are newest first.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return [], 0
+
+        expansions = [self._expand(term) for term in terms]
+        if len(expansions) == 1 and len(expansions[0]) == 1:
+            # Single exact-prefix term: the postings list is the ranking
+            postings = expansions[0][0]
+            end = len(postings) - offset
+            return postings[max(0, end - limit):max(0, end)][::-1], len(postings)
+
+        matches = None
+        # Resolve the most selective term first so later intersections stay small
+        expansions.sort(key=lambda lists: sum(len(p) for p in lists))
+        for lists in expansions:
+            if not lists:
+                return [], 0
+            if matches is None:
+                matches = set().union(*lists)
+            else:
+                matches.intersection_update(
+                    position for postings in lists for position in postings
+                    if position in matches
+                )
+            if not matches:
+                return [], 0
+
+        ranked = sorted(matches, reverse=True)
+        return ranked[offset:offset + limit], len(ranked)
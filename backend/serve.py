@@ -0,0 +1,58 @@
+"""
+Production entry point.
+
+    python serve.py
+    gunicorn -k eventlet -w 1 serve:app
+
+ASYNC_MODE selects eventlet or gevent; unset, whichever is installed is used
+(eventlet first). Cooperative modes are monkey patched here, before the
+server module and its dependencies are imported. ``python serve.py`` refuses
+to run in threading mode, which only has the Werkzeug development server;
+use ``python server.py`` for development. HOST and PORT set the listen
+address for ``python serve.py``.
+"""
+import os
+import sys
+import importlib.util
+
+COOPERATIVE_MODES = ('eventlet', 'gevent')
+
+
+def choose_async_mode(requested):
+    """The configured async mode, or the first cooperative one installed"""
+    if requested:
+        return requested
+    for mode in COOPERATIVE_MODES:
+        if importlib.util.find_spec(mode) is not None:
+            return mode
+    return 'threading'
+
+
+ASYNC_MODE = os.environ['ASYNC_MODE'] = choose_async_mode(os.environ.get('ASYNC_MODE'))
+
+if __name__ == "__main__" and ASYNC_MODE not in COOPERATIVE_MODES:
+    sys.exit(f"❌ serve.py needs ASYNC_MODE=eventlet or gevent (got {ASYNC_MODE}); install one of them, "
+             f"run a gunicorn worker class instead, or use 'python server.py' for development")
+
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from server import app, socketio, init_event_log, start_sweeper, start_broadcaster, offloader
+
+init_event_log()
+start_sweeper()
+start_broadcaster()
+print(f"🚀 Serving with async mode {socketio.async_mode} and {offloader.max_workers} inference workers")
+
+if __name__ == "__main__":
+    socketio.run(
+        app,
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', 5000)),
+        debug=False,
+        use_reloader=False
+    )
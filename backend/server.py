@@ -1,8 +1,9 @@
-from flask import Flask, request, jsonify, session, send_from_directory
+from flask import Flask, request, jsonify, session, send_from_directory, redirect, Response, stream_with_context
 from flask_socketio import SocketIO, join_room, leave_room, send
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import uuid
+import json
 from datetime import datetime
 import os
 import time
@@ -14,37 +15,148 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'util'))
 import importlib.util
 from pydub import AudioSegment
 import subprocess
+import threading
+import requests
+from search_index import RoomSearchIndex
+from event_log import EventLog, unpack, freeze_recovered_state
+from sweeper import IdleSweeper
+from presence import PresenceRegistry
+from cluster import RoomRouter, create_client_manager, HOP_BY_HOP
+from offload import Offloader
+from broadcast import BroadcastBatcher, batch_room
+from inference import AdmissionGate, Overloaded, Cancelled, INTERACTIVE, VOICE, BULK
+from lanes import RoomLanes
+from pii_ensemble import merge_spans, model_spans, rule_spans, to_results
 
 # Lazy loading variables for ML models
 _t2s_model = None
 _piiranha_model = None
+_rule_detector = None
+_model_load_lock = threading.Lock()  # offloaded requests may race to load a model
 
 def get_t2s_model():
     """Lazy load the text-to-speech model"""
     global _t2s_model
-    if _t2s_model is None:
-        t2s_spec = importlib.util.spec_from_file_location("t2s_model", os.path.join(os.path.dirname(__file__), '..', 'util', 't2s-model.py'))
-        _t2s_model = importlib.util.module_from_spec(t2s_spec)
-        t2s_spec.loader.exec_module(_t2s_model)
+    with _model_load_lock:
+        if _t2s_model is None:
+            t2s_spec = importlib.util.spec_from_file_location("t2s_model", os.path.join(os.path.dirname(__file__), '..', 'util', 't2s-model.py'))
+            _t2s_model = importlib.util.module_from_spec(t2s_spec)
+            t2s_spec.loader.exec_module(_t2s_model)
     return _t2s_model
 
 def get_piiranha_model():
     """Lazy load the PII detection model"""
     global _piiranha_model
-    if _piiranha_model is None:
-        pii_spec = importlib.util.spec_from_file_location("piiranha_model", os.path.join(os.path.dirname(__file__), '..', 'util', 'piiranha-model.py'))
-        _piiranha_model = importlib.util.module_from_spec(pii_spec)
-        pii_spec.loader.exec_module(_piiranha_model)
+    with _model_load_lock:
+        if _piiranha_model is None:
+            pii_spec = importlib.util.spec_from_file_location("piiranha_model", os.path.join(os.path.dirname(__file__), '..', 'util', 'piiranha-model.py'))
+            _piiranha_model = importlib.util.module_from_spec(pii_spec)
+            pii_spec.loader.exec_module(_piiranha_model)
     return _piiranha_model
 
+def get_rule_detector():
+    """Lazy load the rule-based PII detector from frontend/scripts"""
+    global _rule_detector
+    with _model_load_lock:
+        if _rule_detector is None:
+            sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'frontend', 'scripts'))
+            from enhanced_pii_detection import EnhancedPIIDetector
+            _rule_detector = EnhancedPIIDetector()
+    return _rule_detector
+
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "supersecretkey"
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB upload limit
 CORS(app, supports_credentials=True)
-socketio = SocketIO(app, cors_allowed_origins="*")
 
-# File uploads (kept under backend/ so backend/.gitignore can ignore them)
-app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'uploads', 'audio')
+# Multi-worker deployment: every worker gets the same WORKER_URLS list and its own
+# WORKER_ID. Socket.IO fan-out goes through SOCKETIO_MESSAGE_QUEUE (redis://,
+# amqp://, or loopback:// for an in-process broker) and each room's state lives on
+# the single worker that owns it. Forwarded socket events are signed with
+# CLUSTER_SECRET, which every worker must share, are rejected once more than
+# CLUSTER_MAX_SKEW seconds old, and give up after CLUSTER_FORWARD_TIMEOUT seconds.
+# HTTP requests for a room owned elsewhere are proxied to the owner (waiting up to
+# CLUSTER_PROXY_TIMEOUT seconds); CLUSTER_REDIRECTS=1 instead sends clients a 307
+# to the owner's URL, which then has to be reachable by clients.
+WORKER_URLS = [url for url in os.environ.get('WORKER_URLS', '').split(',') if url]
+WORKER_ID = int(os.environ.get('WORKER_ID', 0))
+SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE', '')
+CLUSTER_SECRET = os.environ.get('CLUSTER_SECRET', '')
+CLUSTER_FORWARD_TIMEOUT = float(os.environ.get('CLUSTER_FORWARD_TIMEOUT', 5))
+CLUSTER_PROXY_TIMEOUT = float(os.environ.get('CLUSTER_PROXY_TIMEOUT', 120))
+CLUSTER_MAX_SKEW = float(os.environ.get('CLUSTER_MAX_SKEW', 30))
+CLUSTER_REDIRECTS = os.environ.get('CLUSTER_REDIRECTS', '0') == '1'
+router = RoomRouter(WORKER_URLS, WORKER_ID, CLUSTER_SECRET, timeout=CLUSTER_FORWARD_TIMEOUT,
+                    proxy_timeout=CLUSTER_PROXY_TIMEOUT, max_skew=CLUSTER_MAX_SKEW)
+if router.clustered and not CLUSTER_SECRET:
+    # Without a shared secret anyone could sign forwarded events for any room
+    raise RuntimeError("CLUSTER_SECRET must be set when WORKER_URLS lists more than one worker")
+
+# ASYNC_MODE picks the Socket.IO server (threading, eventlet or gevent). Cooperative
+# modes must be monkey patched before this module is imported, which serve.py does,
+# so unset means threading. Model inference and ffmpeg always run on a bounded pool
+# of OFFLOAD_WORKERS threads so they never stall the server's event loop.
+ASYNC_MODE = os.environ.get('ASYNC_MODE') or 'threading'
+OFFLOAD_WORKERS = int(os.environ.get('OFFLOAD_WORKERS', 4))
+
+# SOCKETIO_SERIALIZER=msgpack switches Socket.IO packets to binary msgpack; clients
+# must then use the matching parser (socket.io-msgpack-parser)
+SOCKETIO_SERIALIZER = os.environ.get('SOCKETIO_SERIALIZER', 'default')
+
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE,
+                    serializer=SOCKETIO_SERIALIZER,
+                    **create_client_manager(SOCKETIO_MESSAGE_QUEUE))
+offloader = Offloader(socketio.async_mode, OFFLOAD_WORKERS)
+
+# Per-model admission: *_CONCURRENCY calls run at once and up to *_QUEUE_DEPTH more
+# wait; beyond that requests are rejected with 503 + Retry-After instead of queueing.
+# Waiters are served interactive text first, then room voice, then bulk/test work,
+# and PII_RESERVED_SLOTS slots are kept free of anything but interactive text.
+inference_gates = {
+    "stt": AdmissionGate("stt", int(os.environ.get('STT_CONCURRENCY', 1)), int(os.environ.get('STT_QUEUE_DEPTH', 8))),
+    "pii": AdmissionGate("pii", int(os.environ.get('PII_CONCURRENCY', 2)), int(os.environ.get('PII_QUEUE_DEPTH', 32)),
+                         reserved=int(os.environ.get('PII_RESERVED_SLOTS', 1)))
+}
+# Longest a request of each class may wait for a model slot, in seconds
+INFERENCE_DEADLINES = {
+    INTERACTIVE: float(os.environ.get('INTERACTIVE_DEADLINE', 10)),
+    VOICE: float(os.environ.get('VOICE_DEADLINE', 120)),
+    BULK: float(os.environ.get('BULK_DEADLINE', 600))
+}
+
+# Bulk PII requests are processed PII_BULK_WINDOW texts at a time, in model batches
+# of PII_BATCH_SIZE similar-length texts
+PII_BATCH_SIZE = int(os.environ.get('PII_BATCH_SIZE', 16))
+PII_BULK_WINDOW = int(os.environ.get('PII_BULK_WINDOW', 256))
+
+# The model's spans are merged with the rule-based detector's (phone numbers, cards,
+# SSNs, ...) into one canonical span set. PII_RULE_DETECTION=0 uses the model alone.
+PII_RULE_DETECTION = os.environ.get('PII_RULE_DETECTION', '1') == '1'
+
+# Messages are published in send order within a room and in parallel across rooms
+# on ROOM_LANE_WORKERS threads; their model inference runs beforehand on the request's
+# own thread, through the admission gates. Once ROOM_LANE_BACKLOG messages are waiting
+# in one room, or ROOM_LANE_TOTAL_BACKLOG across rooms, further ones are rejected like
+# an overloaded model.
+ROOM_LANE_WORKERS = int(os.environ.get('ROOM_LANE_WORKERS', 16))
+ROOM_LANE_BACKLOG = int(os.environ.get('ROOM_LANE_BACKLOG', 256))
+ROOM_LANE_TOTAL_BACKLOG = int(os.environ.get('ROOM_LANE_TOTAL_BACKLOG', 4096))
+lanes = RoomLanes(ROOM_LANE_WORKERS, ROOM_LANE_BACKLOG, ROOM_LANE_TOTAL_BACKLOG)
+
+# Clients that connect with {"batch": true} in their auth payload receive a room's
+# events as 'events_batch' lists, flushed every BROADCAST_BATCH_MS milliseconds or
+# once BROADCAST_BATCH_MAX events are waiting. 0 disables batching.
+BROADCAST_BATCH_MS = int(os.environ.get('BROADCAST_BATCH_MS', 20))
+BROADCAST_BATCH_MAX = int(os.environ.get('BROADCAST_BATCH_MAX', 100))
+batcher = BroadcastBatcher(
+    lambda room_code, events: socketio.emit('events_batch', events, room=batch_room(room_code)),
+    interval=BROADCAST_BATCH_MS / 1000, max_batch=BROADCAST_BATCH_MAX
+)
+
+# File uploads (kept under backend/ so backend/.gitignore can ignore them). Workers
+# sweep their own folder, so each one in a cluster gets its own.
+app.config['UPLOAD_FOLDER'] = os.path.join(
+    os.path.dirname(__file__), 'uploads', f'audio-{WORKER_ID}' if router.clustered else 'audio')
 ALLOWED_AUDIO_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.m4a', '.webm', '.aac', '.amr', '.flac', '.opus'}
 MAX_AUDIO_DURATION = 300  # 5 minutes max
 MAX_AUDIO_SIZE = 50 * 1024 * 1024  # 50MB max
@@ -52,14 +164,390 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Enhanced data structures matching frontend schemas
 rooms = {}  # room_code -> Chat object
-users = {}  # user_id -> User object
+search_indexes = {}  # room_code -> RoomSearchIndex over redacted content
+voice_histories = {}  # room_code -> [voice message summary, ...] in arrival order
+message_positions = {}  # room_code -> {message_id: position}
+# Derived views exist from room creation, or are built after recovery; appends take
+# the room's lock, and builds take it only to catch up and publish
+index_locks = {}  # room_code -> lock
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+VOICE_HISTORY_PAGE_SIZE = 50
+VOICE_HISTORY_MAX_PAGE_SIZE = 200
+# Most missed messages pushed on reconnect; clients page through the rest via /messages
+RECONNECT_CATCHUP_LIMIT = int(os.environ.get('RECONNECT_CATCHUP_LIMIT', 200))
+
+# Append-only event log for crash recovery (enabled by init_event_log at startup)
+EVENT_LOG_DIR = os.environ.get('EVENT_LOG_DIR', os.path.join(
+    os.path.dirname(__file__), 'data', f'events-{WORKER_ID}' if router.clustered else 'events'))
+SNAPSHOT_INTERVAL = int(os.environ.get('SNAPSHOT_INTERVAL', 300))  # seconds
+SNAPSHOT_MIN_EVENTS = int(os.environ.get('SNAPSHOT_MIN_EVENTS', 1000))
+event_log = None
+pending_messages = {}  # room_code -> {"packed", "count", "tail"} from a snapshot, decoded on first use
+pending_messages_lock = threading.Lock()
+
+# Idle garbage collection (started by start_sweeper at startup)
+ROOM_IDLE_TTL = int(os.environ.get('ROOM_IDLE_TTL', 24 * 60 * 60))  # seconds without activity or participants
+USER_IDLE_TTL = int(os.environ.get('USER_IDLE_TTL', 60 * 60))  # seconds offline before a user entry is dropped
+UPLOAD_ORPHAN_GRACE = int(os.environ.get('UPLOAD_ORPHAN_GRACE', 10 * 60))  # seconds before orphaned audio is removed
+SWEEP_INTERVAL = int(os.environ.get('SWEEP_INTERVAL', 30))  # seconds between sweeper ticks
+SWEEP_BATCH_SIZE = int(os.environ.get('SWEEP_BATCH_SIZE', 500))  # items examined per tick
+MAX_USERS = int(os.environ.get('MAX_USERS', 100000))  # least recently seen users are evicted beyond this
+
+presence = PresenceRegistry(rooms, max_users=MAX_USERS, user_ttl=USER_IDLE_TTL)
+users = presence.users  # user_id -> User object, least recently seen first
 
 def generate_room_code(length=6):
     while True:
         code = ''.join(random.choices(string.ascii_letters + string.digits, k=length))
-        if code not in rooms:
+        # Only hand out codes this worker owns so the room is created where it lives
+        if code not in rooms and router.is_local(code):
             return code
 
+def create_room(room_code):
+    """Create an empty chat room"""
+    chat = {
+        "id": room_code,
+        "name": None,
+        "participants": {},  # user_id -> display name
+        "messages": [],
+        "lastMessage": None,
+        "createdAt": datetime.now(),
+        "updatedAt": datetime.now(),
+        "isGroup": False
+    }
+    rooms[room_code] = chat
+    # New rooms start with empty derived views that appends keep current
+    search_indexes[room_code] = RoomSearchIndex()
+    voice_histories[room_code] = []
+    message_positions[room_code] = {}
+    record_event("room_created", room=room_code, at=chat["createdAt"])
+    return chat
+
+def room_messages(room_code):
+    """Return a room's message list, decoding it from the snapshot if needed"""
+    chat = rooms[room_code]
+    if room_code in pending_messages:
+        with pending_messages_lock:
+            # Publish the decoded list before dropping the blob so concurrent
+            # callers never observe the empty placeholder
+            pending = pending_messages.get(room_code)
+            if pending is not None:
+                # Decoding is CPU bound; keep it off the event loop
+                chat["messages"] = offloader.run(unpack, pending["packed"]) + pending["tail"]
+                del pending_messages[room_code]
+    return chat["messages"]
+
+def room_message_count(room_code):
+    """Number of messages in a room, without decoding snapshot data"""
+    pending = pending_messages.get(room_code)
+    if pending is not None:
+        return pending["count"] + len(pending["tail"])
+    return len(rooms[room_code]["messages"])
+
+def store_message(room_code, message):
+    """Append to the room's message list (or its undecoded tail); returns the position"""
+    if room_code in pending_messages:
+        with pending_messages_lock:
+            pending = pending_messages.get(room_code)
+            if pending is not None:
+                pending["tail"].append(message)
+                return pending["count"] + len(pending["tail"]) - 1
+    messages = rooms[room_code]["messages"]
+    messages.append(message)
+    return len(messages) - 1
+
+def delete_room(room_code):
+    """Delete a room together with its derived indexes"""
+    rooms.pop(room_code, None)
+    pending_messages.pop(room_code, None)
+    search_indexes.pop(room_code, None)
+    voice_histories.pop(room_code, None)
+    message_positions.pop(room_code, None)
+    index_locks.pop(room_code, None)
+    record_event("room_deleted", room=room_code)
+
+def room_index_lock(room_code):
+    """The lock ordering a room's appends against builds of its derived indexes"""
+    lock = index_locks.get(room_code)
+    if lock is None:
+        lock = index_locks.setdefault(room_code, threading.Lock())
+    return lock
+
+def append_message(room_code, message):
+    """Append a processed message to a room and update derived indexes"""
+    chat = rooms[room_code]
+    with room_index_lock(room_code):
+        position = store_message(room_code, message)
+        chat["lastMessage"] = {
+            "id": message["id"],
+            "content": message["content"],
+            "type": message["type"],
+            "timestamp": message["timestamp"],
+            "senderId": message["senderId"]
+        }
+        chat["updatedAt"] = datetime.now()
+        record_event("message", room=room_code, position=position, message=message, at=chat["updatedAt"])
+
+        for views, add in ((search_indexes, add_search_content), (voice_histories, add_voice_summary),
+                           (message_positions, add_message_position)):
+            view = views.get(room_code)
+            if view is not None:
+                add(view, position, message)
+
+def add_search_content(index, position, message):
+    # Only the redacted content is ever indexed, never the original text
+    index.add(position, message["content"])
+
+def add_message_position(positions, position, message):
+    positions[message["id"]] = position
+
+def add_voice_summary(history, position, message):
+    if message["type"] == "voice":
+        history.append(summarize_voice_message(message))
+
+def build_room_view(room_code, views, view, add):
+    """
+    Build a derived view of a room's messages without blocking its appends.
+
+    Messages already stored are added off-lock; the few appended meanwhile are
+    replayed under the room lock right before the view is published, and from
+    then on ``append_message`` keeps it current.
+    """
+    messages = room_messages(room_code)
+    count = len(messages)
+    for position in range(count):
+        add(view, position, messages[position])
+    with room_index_lock(room_code):
+        existing = views.get(room_code)
+        if existing is not None:
+            return existing
+        for position in range(count, len(messages)):
+            add(view, position, messages[position])
+        views[room_code] = view
+    return view
+
+def get_search_index(room_code):
+    """Return the room's search index, building it if recovery has not yet"""
+    index = search_indexes.get(room_code)
+    if index is None:
+        index = build_room_view(room_code, search_indexes, RoomSearchIndex(), add_search_content)
+    return index
+
+def get_message_positions(room_code):
+    """Return the room's message id -> position map, building it on first use"""
+    positions = message_positions.get(room_code)
+    if positions is None:
+        positions = build_room_view(room_code, message_positions, {}, add_message_position)
+    return positions
+
+def find_message(room_code, message_id):
+    """Look up a message in a room by id"""
+    position = get_message_positions(room_code).get(message_id)
+    return None if position is None else room_messages(room_code)[position]
+
+def messages_after(room_code, message_id=None, timestamp_ms=None):
+    """
+    Position of the first message after a client's cursor.
+
+    A known message id wins; otherwise the first message newer than
+    ``timestamp_ms`` is found by binary search, since ``publish_message``
+    stamps messages in storage order. Returns None when neither cursor can be
+    resolved.
+    """
+    if message_id:
+        position = get_message_positions(room_code).get(message_id)
+        if position is not None:
+            return position + 1
+    if timestamp_ms is None:
+        return None
+    messages = room_messages(room_code)
+    low, high = 0, len(messages)
+    while low < high:
+        middle = (low + high) // 2
+        if (messages[middle].get("timestampMs") or 0) <= timestamp_ms:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def record_event(kind, **data):
+    """Append a state change to the event log when persistence is enabled"""
+    if event_log is not None:
+        event_log.append(kind, data)
+
+def apply_event(kind, data):
+    """Replay one logged state change; replaying an event twice is harmless"""
+    room_code = data.get("room")
+    if kind == "room_created":
+        if room_code not in rooms:
+            create_room(room_code)["createdAt"] = data["at"]
+    elif kind == "room_deleted":
+        delete_room(room_code)
+    elif kind == "message":
+        if room_code in rooms and data["position"] >= room_message_count(room_code):
+            append_message(room_code, data["message"])
+            rooms[room_code]["updatedAt"] = data["at"]
+    elif kind == "joined":
+        presence.add_user(data["user"])
+        presence.join(room_code, data["user"]["id"], data["name"])
+    elif kind == "left":
+        if data["user_id"] in users:
+            users[data["user_id"]]["isOnline"] = False
+            users[data["user_id"]]["lastSeen"] = data["at"]
+        presence.leave(room_code, data["user_id"])
+
+def capture_state():
+    """
+    Shallow copy of rooms and users for a snapshot (messages are never mutated).
+
+    Runs under the event log lock, so message lists are captured by reference
+    and length only: message lists are append-only, and an undecoded snapshot
+    blob is merged with its tail when the snapshot is packed, off the lock.
+    """
+    state = {"version": 1, "rooms": {}, "messages": {}}
+    for room_code, chat in list(rooms.items()):
+        state["rooms"][room_code] = {key: value for key, value in chat.items() if key != "messages"}
+        state["rooms"][room_code]["participants"] = dict(chat["participants"])
+        # Rooms nobody read since the last restart keep their packed form
+        pending = pending_messages.get(room_code)
+        if pending is not None:
+            tail = list(pending["tail"])
+            state["messages"][room_code] = {"count": pending["count"] + len(tail),
+                                            "packed": pending["packed"], "tail": tail}
+        else:
+            messages = chat["messages"]
+            state["messages"][room_code] = {"count": len(messages), "packed": messages}
+    state["users"] = {user_id: dict(user) for user_id, user in list(users.items())}
+    return state
+
+def warm_pending_rooms():
+    """Decode snapshot messages and build search indexes in the background after startup"""
+    for room_code in list(pending_messages):
+        if room_code in rooms:
+            get_search_index(room_code)
+        time.sleep(0)
+
+def init_event_log():
+    """Recover state from the latest snapshot plus log tail, then start logging"""
+    global event_log
+    start_time = time.perf_counter()
+    log = EventLog(EVENT_LOG_DIR, offload=offloader.run)
+    state, events = log.recover()
+    if state:
+        for room_code, chat in state["rooms"].items():
+            chat["messages"] = []
+            rooms[room_code] = chat
+        for room_code, entry in state["messages"].items():
+            pending_messages[room_code] = dict(entry, tail=[])
+        for user in state["users"].values():
+            user["isOnline"] = False  # connections do not survive a restart
+            presence.add_user(user)
+        for room_code, chat in rooms.items():
+            for user_id, name in chat["participants"].items():
+                presence.join(room_code, user_id, name)
+    replayed = 0
+    for kind, data in events:
+        apply_event(kind, data)
+        replayed += 1
+    freeze_recovered_state()
+    log.open()
+    event_log = log
+    log.start_snapshotter(capture_state, SNAPSHOT_INTERVAL, SNAPSHOT_MIN_EVENTS)
+    socketio.start_background_task(warm_pending_rooms)
+    print(f"♻️ Recovered {len(rooms)} rooms and replayed {replayed} events "
+          f"in {time.perf_counter() - start_time:.2f}s")
+
+def to_wire_message(message):
+    """
+    Client-facing view of a stored message.
+
+    Only the fields clients render are sent: never the unredacted original,
+    the server-side audio path or per-detection details, which are available
+    from /messages/<room_code>/<message_id> when needed.
+    """
+    pii_detection = message.get("piiDetection", {})
+    wire = {
+        "id": message["id"],
+        "chatId": message["chatId"],
+        "senderId": message["senderId"],
+        "content": message["content"],
+        "type": message["type"],
+        "timestamp": message["timestamp"],
+        "timestampMs": message.get("timestampMs"),
+        "isRedacted": pii_detection.get("hasRedactions", False),
+        "redactedFields": pii_detection.get("detectedFields", [])
+    }
+    if message["type"] == "voice":
+        wire["audioUrl"] = message.get("audioUrl")
+        wire["duration"] = message.get("duration", 0)
+    return wire
+
+def redacted_transcription(message):
+    """A message's transcription without the unredacted original"""
+    transcription = message.get("transcription", {})
+    return {
+        "redacted": transcription.get("redacted", ""),
+        "hasRedactions": transcription.get("hasRedactions", False)
+    }
+
+def redacted_pii_detection(message):
+    """A message's PII detection results without the detected values"""
+    pii_detection = message.get("piiDetection", {})
+    return {
+        "hasRedactions": pii_detection.get("hasRedactions", False),
+        "detectedFields": pii_detection.get("detectedFields", []),
+        # Positions and confidences only; the detected values are the PII itself
+        "detectionDetails": [
+            {key: detail[key] for key in ("type", "confidence", "position", "sources") if key in detail}
+            for detail in pii_detection.get("detectionDetails", [])
+        ]
+    }
+
+def summarize_voice_message(message):
+    """Build the voice-history entry for a voice message"""
+    transcription = message.get("transcription", {})
+    pii_detection = message.get("piiDetection", {})
+    return {
+        "id": message["id"],
+        "senderId": message["senderId"],
+        "timestamp": message["timestamp"],
+        "duration": message.get("duration", 0),
+        "audioUrl": message["audioUrl"],
+        "transcription": transcription.get("redacted", ""),
+        "hasRedactions": pii_detection.get("hasRedactions", False),
+        "detectedFields": pii_detection.get("detectedFields", [])
+    }
+
+def get_voice_history_view(room_code):
+    """Return the room's voice-history view, building it on first use"""
+    history = voice_histories.get(room_code)
+    if history is None:
+        history = build_room_view(room_code, voice_histories, [], add_voice_summary)
+    return history
+
+sweeper = IdleSweeper(
+    rooms, presence.evict_expired, delete_room, app.config['UPLOAD_FOLDER'],
+    room_ttl=ROOM_IDLE_TTL,
+    upload_grace=UPLOAD_ORPHAN_GRACE, batch_size=SWEEP_BATCH_SIZE
+)
+
+def start_sweeper():
+    """Run the idle sweeper as a background task"""
+    socketio.start_background_task(sweeper.run, SWEEP_INTERVAL, socketio.sleep)
+
+def start_broadcaster():
+    """Run the broadcast batcher's periodic flush as a background task"""
+    if BROADCAST_BATCH_MS > 0:
+        socketio.start_background_task(batcher.run, socketio.sleep)
+
+def broadcast(event, data, room_code):
+    """Send an event to everyone in a room, batching it if any client opted in"""
+    socketio.emit(event, data, room=room_code)
+    if BROADCAST_BATCH_MS > 0:
+        batcher.add(room_code, event, data)
+
 def get_audio_duration(file_path):
     try:
         audio = AudioSegment.from_file(file_path)
@@ -88,24 +576,22 @@ def convert_to_wav(input_path):
         print(f"FFmpeg conversion failed: {e}")
         return None
 
-def process_audio_message(audio_path, room_code, sender_name):
+def process_audio_message(audio_path, room_code, sender_name, deadline=None):
     """Process audio message: transcribe, detect PII, create message object"""
     message_id = create_message_id()
-    timestamp = datetime.now()
     public_url = f"/voice/{room_code}/{os.path.basename(audio_path)}"
     
     # Get audio duration
-    duration = float(get_audio_duration(audio_path))
+    duration = float(offloader.run(get_audio_duration, audio_path))
     
     try:
         # Transcribe the audio
-        t2s_model = get_t2s_model()
         print(f"🎙️ Transcribing audio: {audio_path}")
-        transcription = t2s_model.transcribe_audio(audio_path)
+        transcription = run_stt(audio_path, VOICE, deadline)
         print(f"📝 Transcription: {transcription}")
         
         # Process transcription through PII detection
-        pii_result = process_text_with_pii(transcription)
+        pii_result = process_text_with_pii(transcription, VOICE, deadline=deadline)
         print(f"🔒 PII detected: {pii_result['hasRedactions']}")
         
         # Create enhanced message with all metadata
@@ -115,8 +601,6 @@ def process_audio_message(audio_path, room_code, sender_name):
             "senderId": sender_name,
             "content": pii_result["redactedContent"] if pii_result["redactedContent"].strip() else "[Voice message]",
             "type": "voice",
-            "timestamp": timestamp.isoformat(),
-            "timestampMs": int(timestamp.timestamp() * 1000),
             "duration": float(round(duration, 2)),
             "audioUrl": public_url,
             "audioPath": audio_path,
@@ -140,6 +624,9 @@ def process_audio_message(audio_path, room_code, sender_name):
         print(f"✅ Audio message processed successfully")
         return message
         
+    except Overloaded:
+        raise
+        
     except Exception as e:
         print(f"❌ Audio processing failed: {e}")
         # Fallback message if transcription fails
@@ -149,8 +636,6 @@ def process_audio_message(audio_path, room_code, sender_name):
             "senderId": sender_name,
             "content": "[Voice message - processing failed]",
             "type": "voice",
-            "timestamp": timestamp.isoformat(),
-            "timestampMs": int(timestamp.timestamp() * 1000),
             "duration": float(round(duration, 2)),
             "audioUrl": public_url,
             "audioPath": audio_path,
@@ -175,28 +660,155 @@ def process_audio_message(audio_path, room_code, sender_name):
 def create_message_id():
     return str(uuid.uuid4())
 
-def process_text_with_pii(text):
-    """Process text through PII detection and redaction"""
+def transcribe_audio(audio_path):
+    """Blocking speech-to-text; call through the offloader"""
+    return get_t2s_model().transcribe_audio(audio_path)
+
+def run_pii_model(text):
+    """Blocking PII detection and redaction; call through the offloader"""
     piiranha_model = get_piiranha_model()
-    results = piiranha_model.pipe(text)
-    redacted_content = piiranha_model.redact_text(text, results)
-    detected_fields = [r['entity_group'] for r in results]
-    
+    # Texts beyond the model's token limit are split into overlapping windows
+    results = piiranha_model.detect_long(text, batch_size=PII_BATCH_SIZE)
+    results = merge_with_rules([text], [results])[0]
+    return results, piiranha_model.redact_text(text, results)
+
+def run_pii_model_batch(texts):
+    """Blocking length-bucketed PII detection over many texts; call through the offloader"""
+    piiranha_model = get_piiranha_model()
+    batch_results = merge_with_rules(texts, piiranha_model.detect_batch(texts, batch_size=PII_BATCH_SIZE))
+    return [
+        (results, piiranha_model.redact_text(text, results))
+        for text, results in zip(texts, batch_results)
+    ]
+
+def merge_with_rules(texts, model_results):
+    """Merge each text's model spans with the rule-based detector's into one canonical set"""
+    if not PII_RULE_DETECTION:
+        return model_results
+    detections = get_rule_detector().detect_pii_batch(texts)
+    return [
+        to_results(merge_spans(model_spans(results), rule_spans(detection)))
+        for results, detection in zip(model_results, detections)
+    ]
+
+def inference_deadline(priority):
+    """
+    Monotonic time by which a request of this class must have been admitted.
+
+    Take it when the request arrives, so time spent waiting on the room's lane
+    counts towards it.
+    """
+    return time.monotonic() + INFERENCE_DEADLINES[priority]
+
+def run_stt(audio_path, priority, deadline=None):
+    """Transcribe audio through the speech-to-text admission queue"""
+    with inference_gates["stt"].admit(priority, deadline or inference_deadline(priority)):
+        return offloader.run(transcribe_audio, audio_path)
+
+def process_text_with_pii(text, priority=INTERACTIVE, cancelled=None, deadline=None):
+    """Process text through PII detection and redaction"""
+    with inference_gates["pii"].admit(priority, deadline or inference_deadline(priority), cancelled):
+        results, redacted_content = offloader.run(run_pii_model, text)
+    return build_pii_result(text, results, redacted_content)
+
+def build_pii_result(text, results, redacted_content):
+    """PII detection response for one text from raw model results"""
     return {
         "hasRedactions": len(results) > 0,
         "redactedContent": redacted_content,
-        "detectedFields": detected_fields,
+        "detectedFields": [r['entity_group'] for r in results],
         "originalContent": text,
         "detectionDetails": [
             {
                 "type": r['entity_group'],
                 "original": text[r['start']:r['end']],
                 "confidence": float(r['score']),
-                "position": [r['start'], r['end']]
+                "position": [r['start'], r['end']],
+                "sources": r.get('sources', ["model"])
             } for r in results
         ]
     }
 
+def requested_room():
+    """Room code a request operates on, if any"""
+    room_code = (request.view_args or {}).get('room_code') or request.args.get('room')
+    if not room_code and request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            room_code = data.get('room') or data.get('room_code')
+    return room_code
+
+def proxy_to_owner(room_code):
+    """Relay the current request to the worker that owns ``room_code`` and stream back its reply"""
+    headers = dict(request.headers)
+    forwarded_for = headers.get('X-Forwarded-For')
+    headers['X-Forwarded-For'] = f"{forwarded_for}, {request.remote_addr}" if forwarded_for else request.remote_addr
+    try:
+        upstream = router.proxy(room_code, request.method, request.full_path.rstrip('?'), headers,
+                                request.get_data())
+    except requests.RequestException as e:
+        print(f"❌ Could not proxy {request.path} for room {room_code} to its owner: {e}")
+        response = jsonify({"error": "Room is temporarily unavailable", "retryAfter": 1})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    def relay():
+        try:
+            # Relay the body still encoded, so Content-Length and Content-Encoding stay valid
+            yield from upstream.raw.stream(64 * 1024, decode_content=False)
+        finally:
+            upstream.close()
+
+    headers = [(key, value) for key, value in upstream.raw.headers.items()
+               if key.lower() not in HOP_BY_HOP or key.lower() == 'content-length']
+    return Response(relay(), status=upstream.status_code, headers=headers)
+
+@app.before_request
+def route_to_room_owner():
+    """Send room requests that reached the wrong worker to the room's owner"""
+    if not router.clustered or request.path.startswith('/cluster/'):
+        return None
+    room_code = requested_room()
+    if room_code and not router.is_local(room_code):
+        if CLUSTER_REDIRECTS:
+            # 307 keeps the method and body, so uploads and session posts replay as-is
+            return redirect(router.owner_url(room_code) + request.full_path.rstrip('?'), code=307)
+        return proxy_to_owner(room_code)
+    return None
+
+@app.route('/cluster/<action>', methods=['POST'])
+def cluster_forward(action):
+    """Room operations forwarded by Socket.IO handlers on other workers"""
+    if not router.verify(request.method, request.path, request.get_data(),
+                         request.headers.get('X-Cluster-Timestamp'), request.headers.get('X-Cluster-Signature')):
+        return jsonify({"error": "Invalid or expired cluster signature"}), 403
+    data = request.get_json()
+    room = data["room"]
+    if room not in rooms:
+        return jsonify({"error": "Room not found"}), 404
+
+    if action == 'connect':
+        room_connected(room, data["user_id"], data["name"], data.get("batch", False))
+        if data.get("cursor"):
+            submit_catchup(room, data["sid"], data["cursor"])
+    elif action == 'disconnect':
+        room_disconnected(room, data["user_id"], data["name"], data.get("batch", False))
+    elif action == 'message':
+        ticket = lanes.reserve(room)
+        socketio.start_background_task(post_text_message, room, data["name"], data["message"], ticket,
+                                       data.get("sid"), None, inference_deadline(INTERACTIVE))
+    else:
+        return jsonify({"error": f"Unknown action: {action}"}), 404
+    return jsonify({"ok": True}), 200
+
+@app.errorhandler(Overloaded)
+def handle_overloaded(e):
+    """Fast rejection when a model's inference queue is full"""
+    print(f"🚦 Rejected request: {e}")
+    response = jsonify({"error": str(e), "model": e.model, "retryAfter": e.retry_after})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
 # REST routes
 @app.route('/detect_pii', methods=['POST'])
 def detect_pii():
@@ -217,6 +829,8 @@ def detect_pii():
             "detectionDetails": pii_result["detectionDetails"]
         }), 200
         
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"PII detection error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -224,17 +838,7 @@ def detect_pii():
 @app.route('/conversations', methods=['POST'])
 def create_conversation():
     room_code = generate_room_code()
-    chat = {
-        "id": room_code,
-        "name": None,
-        "participants": [],
-        "messages": [],
-        "lastMessage": None,
-        "createdAt": datetime.now(),
-        "updatedAt": datetime.now(),
-        "isGroup": False
-    }
-    rooms[room_code] = chat
+    create_room(room_code)
     return jsonify({"room_code": room_code}), 201
 
 @app.route('/conversations/<room_code>', methods=['GET'])
@@ -245,8 +849,8 @@ def get_conversation(room_code):
     return jsonify({
         "id": chat["id"],
         "name": chat["name"],
-        "participants": chat["participants"],
-        "messageCount": len(chat["messages"]),
+        "participants": presence.participants(room_code),
+        "messageCount": room_message_count(room_code),
         "lastMessage": chat["lastMessage"],
         "createdAt": chat["createdAt"],
         "updatedAt": chat["updatedAt"],
@@ -257,13 +861,86 @@ def get_conversation(room_code):
 def get_messages(room_code):
     if room_code not in rooms:
         return jsonify({"error": "Room not found"}), 404
-    chat = rooms[room_code]
-    return jsonify(chat["messages"]), 200
+    messages = room_messages(room_code)
+    after = request.args.get('after')
+    since = request.args.get('since')
+    if after is None and since is None:
+        return jsonify([to_wire_message(message) for message in messages]), 200
+    
+    # Cursor paging: messages after a message id or a timestampMs, oldest first
+    try:
+        start = messages_after(room_code, after, int(since) if since is not None else None)
+        limit = min(RECONNECT_CATCHUP_LIMIT, max(1, int(request.args.get('limit', RECONNECT_CATCHUP_LIMIT))))
+    except ValueError:
+        return jsonify({"error": "'since' and 'limit' must be integers"}), 400
+    if start is None:
+        return jsonify({"error": "Message not found"}), 404
+    return jsonify([to_wire_message(message) for message in messages[start:start + limit]]), 200
+
+@app.route('/messages/<room_code>/<message_id>', methods=['GET'])
+def get_message_details(room_code, message_id):
+    """Redacted transcription and PII detection details for one message"""
+    if room_code not in rooms:
+        return jsonify({"error": "Room not found"}), 404
+    
+    message = find_message(room_code, message_id)
+    if not message:
+        return jsonify({"error": "Message not found"}), 404
+    
+    details = to_wire_message(message)
+    details["transcription"] = redacted_transcription(message)
+    details["piiDetection"] = redacted_pii_detection(message)
+    if "metadata" in message:
+        details["metadata"] = {key: value for key, value in message["metadata"].items() if key != "error"}
+    return jsonify(details), 200
+
+@app.route('/search/<room_code>', methods=['GET'])
+def search_messages(room_code):
+    """Prefix search over a room's redacted messages, newest first"""
+    if room_code not in rooms:
+        return jsonify({"error": "Room not found"}), 404
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Missing 'q' parameter"}), 400
+
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = min(SEARCH_MAX_PAGE_SIZE, max(1, int(request.args.get('limit', SEARCH_PAGE_SIZE))))
+    except ValueError:
+        return jsonify({"error": "'offset' and 'limit' must be integers"}), 400
+
+    start_time = time.perf_counter()
+    positions, total = get_search_index(room_code).search(query, offset, limit)
+    messages = room_messages(room_code)
+    results = [
+        {
+            "id": messages[position]["id"],
+            "senderId": messages[position]["senderId"],
+            "content": messages[position]["content"],
+            "type": messages[position]["type"],
+            "timestamp": messages[position]["timestamp"]
+        }
+        for position in positions
+    ]
+
+    return jsonify({
+        "roomCode": room_code,
+        "query": query,
+        "results": results,
+        "totalCount": total,
+        "offset": offset,
+        "limit": limit,
+        "hasMore": offset + len(results) < total,
+        "tookMs": round((time.perf_counter() - start_time) * 1000, 3)
+    }), 200
 
 @app.route('/voice/<room_code>', methods=['POST'])
 def upload_voice(room_code):
     """Enhanced voice message upload with comprehensive processing"""
     print(f"🎙️ Voice upload request for room: {room_code}")
+    # The deadline runs from arrival, including any wait behind the room's other messages
+    deadline = inference_deadline(VOICE)
     
     # Validate room exists
     if room_code not in rooms:
@@ -316,25 +993,8 @@ def upload_voice(room_code):
         file.save(save_path)
         print(f"💾 Saved audio file: {save_path}")
         
-        # Process the audio message (transcribe, PII detect, etc.)
-        message = process_audio_message(save_path, room_code, sender_name)
-        
-        # Add message to room and broadcast via SocketIO
-        chat = rooms[room_code]
-        chat["messages"].append(message)
-        chat["lastMessage"] = {
-            "id": message["id"],
-            "content": message["content"],
-            "type": "voice",
-            "timestamp": message["timestamp"],
-            "senderId": message["senderId"]
-        }
-        chat["updatedAt"] = datetime.now()
-        
-        # Broadcast to all users in the room
-        socketio.emit('new_message', message, room=room_code)
-        
-        print(f"📤 Broadcasted voice message to room {room_code}")
+        # Transcribe, detect PII, store and broadcast in the room's send order
+        message = post_voice_message(save_path, room_code, sender_name, lanes.reserve(room_code), deadline)
         
         return jsonify({
             "success": True,
@@ -352,6 +1012,8 @@ def upload_voice(room_code):
         # Clean up file if processing failed
         if os.path.exists(save_path):
             os.remove(save_path)
+        if isinstance(e, Overloaded):
+            raise
         
         print(f"❌ Voice upload failed: {e}")
         return jsonify({
@@ -376,45 +1038,41 @@ def get_transcription(room_code, message_id):
     if room_code not in rooms:
         return jsonify({"error": "Room not found"}), 404
     
-    chat = rooms[room_code]
-    message = next((msg for msg in chat["messages"] if msg["id"] == message_id), None)
+    message = find_message(room_code, message_id)
     
     if not message or message["type"] != "voice":
         return jsonify({"error": "Voice message not found"}), 404
     
     return jsonify({
         "messageId": message_id,
-        "transcription": message.get("transcription", {}),
-        "piiDetection": message.get("piiDetection", {}),
+        "transcription": redacted_transcription(message),
+        "piiDetection": redacted_pii_detection(message),
         "timestamp": message.get("timestamp"),
         "duration": message.get("duration", 0)
     }), 200
 
 @app.route('/voice/<room_code>/history', methods=['GET'])
 def get_voice_history(room_code):
-    """Get all voice messages in a room with metadata"""
+    """Get a page of voice messages in a room with metadata"""
     if room_code not in rooms:
         return jsonify({"error": "Room not found"}), 404
-    
-    chat = rooms[room_code]
-    voice_messages = [
-        {
-            "id": msg["id"],
-            "senderId": msg["senderId"], 
-            "timestamp": msg["timestamp"],
-            "duration": msg.get("duration", 0),
-            "audioUrl": msg["audioUrl"],
-            "transcription": msg.get("piiDetection", {}).get("redacted", ""),
-            "hasRedactions": msg.get("piiDetection", {}).get("hasRedactions", False),
-            "detectedFields": msg.get("piiDetection", {}).get("detectedFields", [])
-        }
-        for msg in chat["messages"] if msg["type"] == "voice"
-    ]
-    
+
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = min(VOICE_HISTORY_MAX_PAGE_SIZE, max(1, int(request.args.get('limit', VOICE_HISTORY_PAGE_SIZE))))
+    except ValueError:
+        return jsonify({"error": "'offset' and 'limit' must be integers"}), 400
+
+    history = get_voice_history_view(room_code)
+    voice_messages = history[offset:offset + limit]
+
     return jsonify({
         "roomCode": room_code,
         "voiceMessages": voice_messages,
-        "totalCount": len(voice_messages)
+        "totalCount": len(history),
+        "offset": offset,
+        "limit": limit,
+        "hasMore": offset + len(voice_messages) < len(history)
     }), 200
 
 @app.route('/session', methods=['POST'])
@@ -425,25 +1083,18 @@ def set_session():
     if not name or not room:
         return jsonify({"error": "'name' and 'room' are required"}), 400
     
-    # Create or update user
-    user_id = str(uuid.uuid4())
-    user = {
-        "id": user_id,
-        "name": name,
-        "email": f"{name}@example.com",  # Placeholder
-        "avatar": None,
-        "isOnline": True,
-        "lastSeen": datetime.now()
-    }
-    users[user_id] = user
-    
+    # Reuse the session's user when the name is unchanged instead of minting a new one
+    user = presence.session_user(name, session.get('user_id'))
+    user_id = user["id"]
+
     session['name'] = name
     session['room'] = room
     session['user_id'] = user_id
-    
-    # Add user to room participants if not already there
-    if room in rooms and name not in rooms[room]["participants"]:
-        rooms[room]["participants"].append(name)
+
+    # Add user to room participants (a no-op if already there)
+    if room in rooms:
+        presence.join(room, user_id, name)
+    record_event("joined", room=room, name=name, user=user)
     
     return jsonify({"ok": True}), 200
 
@@ -451,57 +1102,138 @@ def set_session():
 def health():
     return jsonify({"ok": True}), 200
 
-@socketio.on('connect')
-def handle_connect():
-    """Handle user connection to SocketIO"""
-    name = session.get('name')
-    room = session.get('room')
-    if not name or not room or room not in rooms:
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Operational counters for the running server"""
+    return jsonify({
+        "rooms": len(rooms),
+        "presence": presence.stats(),
+        "sweeper": sweeper.stats,
+        "offload": offloader.stats(),
+        "broadcast": batcher.stats,
+        "inference": {name: gate.stats() for name, gate in inference_gates.items()},
+        "lanes": lanes.stats()
+    }), 200
+
+def room_connected(room, user_id, name, batch=False):
+    """Count a connection on the room's owner and announce the user's first tab"""
+    if batch:
+        batcher.subscribe(room)
+    if not presence.connect(room, user_id):
         return
     
-    join_room(room)
-    print(f"👤 {name} connected to room {room}")
-    
-    # Update user online status
-    user_id = session.get('user_id')
-    if user_id and user_id in users:
-        users[user_id]["isOnline"] = True
-        users[user_id]["lastSeen"] = datetime.now()
-    
     # Notify room of user joining
-    socketio.emit('user_joined', {
+    broadcast('user_joined', {
         "message": f"{name} joined the room",
         "userId": name,
         "timestamp": datetime.now().isoformat()
-    }, room=room)
+    }, room)
 
-@socketio.on('message')
-def handle_message(data):
-    """Handle text messages with PII detection"""
-    room = session.get('room')
-    name = session.get('name')
-    
-    if room not in rooms:
+def room_disconnected(room, user_id, name, batch=False):
+    """Release a connection on the room's owner and clean up after the last tab"""
+    if batch:
+        batcher.unsubscribe(room)
+    # Other tabs of the same user keep them in the room
+    if room not in rooms or not presence.disconnect(room, user_id):
         return
     
-    message_text = (data or {}).get('message')
-    if not message_text:
-        return
+    # Remove user from participants
+    presence.leave(room, user_id)
+    record_event("left", room=room, name=name, user_id=user_id, at=datetime.now())
     
+    # Delete room if no participants left
+    if not rooms[room]["participants"]:
+        print(f"🗑️ Deleting empty room {room}")
+        delete_room(room)
+    else:
+        # Notify remaining users
+        broadcast('user_left', {
+            "message": f"{name} left the room",
+            "userId": name,
+            "timestamp": datetime.now().isoformat()
+        }, room)
+
+def stamp_message(chat, message):
+    """
+    Timestamp a message as it is stored.
+
+    Stamping in storage order, never earlier than the room's last message,
+    keeps each room's messages sorted by ``timestampMs`` for catch-up.
+    """
+    now = datetime.now()
+    last = chat["lastMessage"]
+    if last is not None:
+        now = max(now, datetime.fromisoformat(last["timestamp"]))
+    message["timestamp"] = now.isoformat()
+    message["timestampMs"] = int(now.timestamp() * 1000)
+
+def publish_message(room_code, message):
+    """Timestamp, store and broadcast a processed message; run on the room's lane"""
+    chat = rooms.get(room_code)
+    if chat is None:
+        return  # deleted while the message was being processed
+    stamp_message(chat, message)
+    append_message(room_code, message)
+    broadcast('new_message', to_wire_message(message), room_code)
+
+def publish_in_order(room_code, ticket, prepare, *args):
+    """
+    Prepare a message on the calling thread, then publish it in the room's order.
+
+    Preparation (model inference) waits in its admission queue instead of on a
+    lane worker, while ``ticket`` keeps the message's place in line. The place
+    is given up if preparation fails or returns None. Returns the message and
+    the Future of its publication, or (None, None).
+    """
+    message = None
+    try:
+        message = prepare(*args)
+    finally:
+        if message is None:
+            lanes.skip(ticket)
+    if message is None:
+        return None, None
+    return message, lanes.fill(ticket, publish_message, room_code, message)
+
+def post_voice_message(audio_path, room_code, sender_name, ticket, deadline=None):
+    """Process an uploaded voice message, store it and broadcast it"""
+    message, published = publish_in_order(room_code, ticket, process_audio_message,
+                                          audio_path, room_code, sender_name, deadline)
+    published.result()
+    print(f"📤 Broadcasted voice message to room {room_code}")
+    return message
+
+def post_text_message(room, name, message_text, ticket, sid=None, cancelled=None, deadline=None):
+    """Run PII detection on a text message, then store and broadcast it in the room's order"""
+    message, _ = publish_in_order(room, ticket, process_text_message, room, name, message_text, sid, cancelled, deadline)
+    if message is not None:
+        print(f"📤 Queued text message for room {room}")
+
+def process_text_message(room, name, message_text, sid=None, cancelled=None, deadline=None):
+    """Build a text message with PII redacted; None if it was rejected"""
+    if room not in rooms:
+        return None  # deleted before the message was processed
     print(f"💬 Text message from {name} in {room}: {message_text}")
     
     # Process text through PII detection
-    pii_result = process_text_with_pii(message_text)
+    try:
+        pii_result = process_text_with_pii(message_text, INTERACTIVE, cancelled, deadline)
+    except Cancelled:
+        print(f"🚫 Dropped text message from {name}: sender disconnected before it was processed")
+        return None
+    except Overloaded as e:
+        # Only the sender hears about it; the message was not stored
+        if sid:
+            socketio.emit('message_error', overload_error(e), to=sid)
+        return None
     
     # Create enhanced message
-    message = {
+    return {
         "id": create_message_id(),
         "chatId": room,
         "senderId": name,
         "content": pii_result["redactedContent"],
         "type": "text",
-        "timestamp": datetime.now().isoformat(),
-        "timestampMs": int(datetime.now().timestamp() * 1000),
         "transcription": {
             "original": message_text,
             "redacted": pii_result["redactedContent"],
@@ -513,22 +1245,131 @@ def handle_message(data):
             "detectionDetails": pii_result["detectionDetails"]
         }
     }
+
+def send_missed_messages(room, sid, cursor):
+    """Push the messages a reconnecting client missed as one frame; run on the room's lane"""
+    if room not in rooms:
+        return
+    start = messages_after(room, cursor.get("lastSeenMessageId"), cursor.get("lastSeenTimestampMs"))
+    if start is None:
+        return  # unknown cursor, the client refetches /messages
+    messages = room_messages(room)
+    page = messages[start:start + RECONNECT_CATCHUP_LIMIT]
+    socketio.emit('missed_messages', {
+        "messages": [to_wire_message(message) for message in page],
+        "totalMissed": len(messages) - start,
+        "hasMore": start + len(page) < len(messages)
+    }, to=sid)
+    print(f"📬 Sent {len(page)} missed messages to a reconnecting client in {room}")
+
+def submit_catchup(room, sid, cursor):
+    """Queue a reconnect catch-up behind the room's in-flight messages"""
+    try:
+        # Queued so the catch-up frame precedes newer broadcasts
+        lanes.submit(room, send_missed_messages, room, sid, cursor)
+    except Overloaded as e:
+        print(f"🚦 Skipped catch-up in {room}, the client refetches /messages: {e}")
+
+def overload_error(e):
+    """message_error payload for a message that was rejected unprocessed"""
+    return {"error": str(e), "model": e.model, "retryAfter": e.retry_after}
+
+def catchup_cursor(auth):
+    """Reconnect cursor from the connect auth payload, if the client sent one"""
+    cursor = {}
+    if auth.get('lastSeenMessageId'):
+        cursor["lastSeenMessageId"] = str(auth['lastSeenMessageId'])
+    try:
+        if auth.get('lastSeenTimestampMs') is not None:
+            cursor["lastSeenTimestampMs"] = int(auth['lastSeenTimestampMs'])
+    except (TypeError, ValueError):
+        pass
+    return cursor
+
+def socket_gone(sid):
+    """Cancellation check for work requested by a socket connected to this worker"""
+    return lambda: not socketio.server.manager.is_connected(sid, '/')
+
+def forward_to_owner(room, action, payload):
+    """Forward a socket event to the worker that owns ``room``; None if it cannot be reached"""
+    try:
+        return router.forward(room, action, payload)
+    except requests.RequestException as e:
+        print(f"❌ Could not forward {action} for room {room} to its owner: {e}")
+        return None
+
+def socket_room(room):
+    """Socket.IO room this connection listens on for ``room``'s broadcasts"""
+    return batch_room(room) if session.get('batch') else room
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    """Handle user connection to SocketIO"""
+    name = session.get('name')
+    room = session.get('room')
+    if not name or not room:
+        return
+    user_id = session.get('user_id')
+    if router.is_local(room) and room not in rooms:
+        return
     
-    # Add to room and broadcast
-    chat = rooms[room]
-    chat["messages"].append(message)
-    chat["lastMessage"] = {
-        "id": message["id"],
-        "content": message["content"],
-        "type": "text",
-        "timestamp": message["timestamp"],
-        "senderId": message["senderId"]
-    }
-    chat["updatedAt"] = datetime.now()
+    # Opting into batching is per connection; the socket's session is its own copy
+    auth = auth if isinstance(auth, dict) else {}
+    session['batch'] = BROADCAST_BATCH_MS > 0 and bool(auth.get('batch'))
+    cursor = catchup_cursor(auth)
+    
+    # The socket joins the room on whichever worker holds its connection; the
+    # message queue delivers the owning worker's broadcasts here
+    join_room(socket_room(room))
+    print(f"👤 {name} connected to room {room}")
+    
+    if router.is_local(room):
+        room_connected(room, user_id, name, session['batch'])
+        if cursor:
+            submit_catchup(room, request.sid, cursor)
+    else:
+        response = forward_to_owner(room, 'connect', {
+            "room": room, "user_id": user_id, "name": name, "sid": request.sid, "cursor": cursor,
+            "batch": session['batch']
+        })
+        if response is None or response.status_code != 200:
+            leave_room(socket_room(room))
+            if response is None:
+                raise ConnectionRefusedError({"error": "Room is temporarily unavailable", "retryAfter": 1})
+            return False
+
+@socketio.on('message')
+def handle_message(data):
+    """Handle text messages with PII detection"""
+    room = session.get('room')
+    name = session.get('name')
+    
+    message_text = (data or {}).get('message')
+    if not room or not message_text:
+        return
+    
+    if not router.is_local(room):
+        payload = {"room": room, "name": name, "message": message_text, "sid": request.sid}
+        response = forward_to_owner(room, 'message', payload)
+        # The message was not stored, so only the sender hears about it
+        if response is None:
+            socketio.emit('message_error', {"error": "Room is temporarily unavailable", "retryAfter": 1}, to=request.sid)
+        elif response.status_code == 503:
+            socketio.emit('message_error', response.json(), to=request.sid)
+        return
     
-    # Broadcast to all users in room
-    socketio.emit('new_message', message, room=room)
-    print(f"📤 Broadcasted text message to room {room}")
+    if room not in rooms:
+        return
+    
+    deadline = inference_deadline(INTERACTIVE)
+    try:
+        ticket = lanes.reserve(room)
+    except Overloaded as e:
+        print(f"🚦 Rejected message from {name}: {e}")
+        socketio.emit('message_error', overload_error(e), to=request.sid)
+        return
+    # PII detection waits in its admission queue on this handler's thread, not on a lane
+    post_text_message(room, name, message_text, ticket, request.sid, socket_gone(request.sid), deadline)
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -539,29 +1380,15 @@ def handle_disconnect():
     
     print(f"👤 {name} disconnected from room {room}")
     
-    # Update user offline status
-    if user_id and user_id in users:
-        users[user_id]["isOnline"] = False
-        users[user_id]["lastSeen"] = datetime.now()
+    leave_room(socket_room(room))
     
-    if room in rooms:
-        # Remove user from participants
-        if name in rooms[room]["participants"]:
-            rooms[room]["participants"].remove(name)
-        
-        # Delete room if no participants left
-        if len(rooms[room]["participants"]) == 0:
-            print(f"🗑️ Deleting empty room {room}")
-            del rooms[room]
-        else:
-            # Notify remaining users
-            socketio.emit('user_left', {
-                "message": f"{name} left the room",
-                "userId": name,
-                "timestamp": datetime.now().isoformat()
-            }, room=room)
+    if room and not router.is_local(room):
+        forward_to_owner(room, 'disconnect', {
+            "room": room, "user_id": user_id, "name": name, "batch": session.get('batch', False)
+        })
+        return
     
-    leave_room(room)
+    room_disconnected(room, user_id, name, session.get('batch', False))
 
 @app.route('/api/process_voice', methods=['POST'])
 def process_voice_api():
@@ -570,21 +1397,12 @@ def process_voice_api():
     # Auto-create the room if it doesn't exist
     if room_code not in rooms:
         print(f"ℹ️ Auto-creating room: {room_code}")
-        chat = {
-            "id": room_code,
-            "name": None,
-            "participants": [],
-            "messages": [],
-            "lastMessage": None,
-            "createdAt": datetime.now(),
-            "updatedAt": datetime.now(),
-            "isGroup": False
-        }
-        rooms[room_code] = chat
-    return api_test_audio_file()
+        create_room(room_code)
+    # The frontend's voice messages come through here, so they keep voice priority
+    return api_test_audio_file(priority=VOICE)
 
 @app.route('/api/test_audio_file', methods=['POST'])
-def api_test_audio_file():
+def api_test_audio_file(priority=BULK):
     if 'audio' not in request.files:
         print("❌ No 'audio' file part in request")
         return jsonify({"error": "No 'audio' file part"}), 400
@@ -613,7 +1431,7 @@ def api_test_audio_file():
 
     # If the uploaded file is a webm, convert it to wav
     if ext == ".webm":
-        wav_path = convert_to_wav(temp_path)
+        wav_path = offloader.run(convert_to_wav, temp_path)
         if wav_path and os.path.exists(wav_path):
             temp_path = wav_path
             ext = ".wav"
@@ -623,17 +1441,15 @@ def api_test_audio_file():
 
     try:
         print("⏱️ Getting audio duration...")
-        duration = float(get_audio_duration(temp_path))
+        duration = float(offloader.run(get_audio_duration, temp_path))
         print(f"⏱️ Duration: {duration}")
 
-        print("🧠 Loading T2S model...")
-        t2s_model = get_t2s_model()
         print("🗣️ Transcribing audio...")
-        transcription = t2s_model.transcribe_audio(temp_path)
+        transcription = run_stt(temp_path, priority)
         print(f"📝 Transcribed text: {transcription}")
 
         print("🔎 Running PII detection...")
-        pii_result = process_text_with_pii(transcription)
+        pii_result = process_text_with_pii(transcription, priority)
         print(f"🛡️ Redacted text: {pii_result['redactedContent']}")  # <-- Add this line
 
         result = {
@@ -651,6 +1467,8 @@ def api_test_audio_file():
         print("✅ Finished processing audio file.")
         return jsonify(result), 200
 
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"❌ Exception in /api/test_audio_file: {e}")
         return jsonify({"error": str(e)}), 500
@@ -715,8 +1533,6 @@ def api_process_text():
                 "senderId": sender_name,
                 "content": pii_result["redactedContent"],
                 "type": "text",
-                "timestamp": datetime.now().isoformat(),
-                "timestampMs": int(datetime.now().timestamp() * 1000),
                 "transcription": {
                     "original": text_input,
                     "redacted": pii_result["redactedContent"],
@@ -729,20 +1545,8 @@ def api_process_text():
                 }
             }
             
-            # Add to room
-            chat = rooms[room_code]
-            chat["messages"].append(message)
-            chat["lastMessage"] = {
-                "id": message["id"],
-                "content": message["content"],
-                "type": "text",
-                "timestamp": message["timestamp"],
-                "senderId": message["senderId"]
-            }
-            chat["updatedAt"] = datetime.now()
-            
-            # Broadcast to room if desired
-            socketio.emit('new_message', message, room=room_code)
+            # Add to room and broadcast, in order with the room's other messages
+            lanes.run(room_code, publish_message, room_code, message)
             
             result["message"] = {
                 "id": message["id"],
@@ -753,6 +1557,8 @@ def api_process_text():
         print("✅ Text processing completed successfully")
         return jsonify(result), 200
         
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"❌ Exception in /api/process_text: {e}")
         return jsonify({
@@ -760,5 +1566,109 @@ def api_process_text():
             "details": str(e)
         }), 500
     
+def ndjson_items(stream):
+    """Parse an NDJSON request body line by line without buffering it"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield {"error": "Invalid JSON line"}
+
+def bulk_windows(items):
+    """Group (index, item) pairs into windows of PII_BULK_WINDOW"""
+    window = []
+    for index, item in enumerate(items):
+        window.append((index, item))
+        if len(window) >= PII_BULK_WINDOW:
+            yield window
+            window = []
+    if window:
+        yield window
+
+def bulk_item_text(item):
+    """Text of one bulk input item (a string or {"text", "id"}), or None"""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict) and "error" not in item and isinstance(item.get("text"), str):
+        return item["text"]
+    return None
+
+def run_bulk_window(window):
+    """Detect PII for one window and return its NDJSON lines in input order"""
+    texts = [bulk_item_text(item) for _, item in window]
+    valid = [text for text in texts if text is not None]
+    outputs = iter([])
+    failure = None
+    if valid:
+        # Bulk work queues behind chat and voice; if the client disconnects the
+        # stream is closed and later windows are never started
+        try:
+            with inference_gates["pii"].admit(BULK, inference_deadline(BULK)):
+                outputs = iter(offloader.run(run_pii_model_batch, valid))
+        except Overloaded:
+            raise
+        except Exception as e:
+            # A model error fails this window's items, not the rest of the stream
+            print(f"❌ Bulk PII detection failed for items {window[0][0]}-{window[-1][0]}: {e}")
+            failure = f"PII detection failed: {e}"
+    
+    lines = []
+    for (index, item), text in zip(window, texts):
+        line = {"index": index}
+        if isinstance(item, dict) and "id" in item:
+            line["id"] = item["id"]
+        if text is None:
+            line["error"] = item.get("error", "Missing 'text'") if isinstance(item, dict) else "Missing 'text'"
+        elif failure:
+            line["error"] = failure
+        else:
+            results, redacted_content = next(outputs)
+            line.update(build_pii_result(text, results, redacted_content))
+        lines.append(json.dumps(line) + "\n")
+    return "".join(lines)
+
+@app.route('/api/process_text/batch', methods=['POST'])
+def api_process_text_batch():
+    """
+    Bulk PII detection over a JSON array or NDJSON body of texts
+    Each item is a string or {"text", "id"}; results stream back as NDJSON in input order
+    """
+    if request.mimetype == 'application/x-ndjson':
+        items = ndjson_items(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a JSON array or an application/x-ndjson body"}), 400
+        items = iter(data)
+    
+    # The first window runs before the response starts, so an overloaded model
+    # still gets a proper 503 instead of a truncated stream
+    windows = bulk_windows(items)
+    first_window = next(windows, [])
+    first = run_bulk_window(first_window)
+    
+    def generate():
+        yield first
+        # Index of the first item not answered yet
+        resume_from = first_window[-1][0] + 1 if first_window else 0
+        try:
+            for window in windows:
+                yield run_bulk_window(window)
+                resume_from = window[-1][0] + 1
+        except Overloaded as e:
+            yield json.dumps({"error": str(e), "retryAfter": e.retry_after, "resumeFrom": resume_from}) + "\n"
+        except Exception as e:
+            # Never end the stream silently: the client learns where output stopped
+            print(f"❌ Bulk PII stream failed: {e}")
+            yield json.dumps({"error": f"Batch processing failed: {e}", "resumeFrom": resume_from}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
 if __name__ == "__main__":
-    socketio.run(app, debug=True)
\ No newline at end of file
+    init_event_log()
+    start_sweeper()
+    start_broadcaster()
+    socketio.run(app, debug=True, use_reloader=False)
\ No newline at end of file
@@ -0,0 +1,117 @@
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class IdleSweeper:
+    """
+    Background garbage collector for abandoned rooms, users and audio uploads.
+
+    Each tick examines at most ``batch_size`` items, resuming from where the
+    previous tick stopped, so a server with millions of entries never stalls
+    on a single sweep. Key lists are re-snapshotted once a full pass completes.
+    Users are expired through ``evict_users(limit)``, which is expected to
+    evict from the least recently seen end and return how many it removed.
+    """
+
+    def __init__(self, rooms, evict_users, delete_room, upload_folder,
+                 room_ttl, upload_grace, batch_size=500,
+                 protected_dirs=('test_uploads',)):
+        self.rooms = rooms
+        self.evict_users = evict_users
+        self.delete_room = delete_room
+        self.upload_folder = upload_folder
+        self.room_ttl = timedelta(seconds=room_ttl)
+        self.upload_grace = upload_grace
+        self.batch_size = batch_size
+        self.protected_dirs = set(protected_dirs)
+        self.pending = []  # (phase, key) work items left in the current pass
+        self.lock = threading.Lock()
+        self.stats = {
+            "ticks": 0,
+            "passes": 0,
+            "roomsEvicted": 0,
+            "usersEvicted": 0,
+            "audioFilesRemoved": 0,
+            "bytesReclaimed": 0,
+            "lastSweepAt": None,
+            "lastReclaimed": {}
+        }
+
+    def _start_pass(self):
+        self.pending = [("room", room_code) for room_code in list(self.rooms)]
+        if os.path.isdir(self.upload_folder):
+            self.pending += [("upload", name) for name in os.listdir(self.upload_folder)]
+        self.pending.reverse()  # pop() from the end walks the pass in order
+        self.stats["passes"] += 1
+
+    def tick(self):
+        """Examine up to ``batch_size`` items and return what was reclaimed"""
+        with self.lock:
+            if not self.pending:
+                self._start_pass()
+            reclaimed = {"rooms": 0, "users": 0, "audioFiles": 0, "bytes": 0}
+            now = datetime.now()
+            reclaimed["users"] = self.evict_users(self.batch_size)
+            for _ in range(min(self.batch_size, len(self.pending))):
+                phase, key = self.pending.pop()
+                if phase == "room":
+                    self._sweep_room(key, now, reclaimed)
+                else:
+                    self._sweep_upload(key, reclaimed)
+
+            self.stats["ticks"] += 1
+            self.stats["roomsEvicted"] += reclaimed["rooms"]
+            self.stats["usersEvicted"] += reclaimed["users"]
+            self.stats["audioFilesRemoved"] += reclaimed["audioFiles"]
+            self.stats["bytesReclaimed"] += reclaimed["bytes"]
+            self.stats["lastSweepAt"] = now.isoformat()
+            self.stats["lastReclaimed"] = reclaimed
+            return reclaimed
+
+    def _sweep_room(self, room_code, now, reclaimed):
+        chat = self.rooms.get(room_code)
+        if chat is None or chat["participants"] or now - chat["updatedAt"] < self.room_ttl:
+            return
+        self.delete_room(room_code)
+        reclaimed["rooms"] += 1
+        self._remove_upload_dir(room_code, reclaimed)
+
+    def _sweep_upload(self, name, reclaimed):
+        path = os.path.join(self.upload_folder, name)
+        if not os.path.isdir(path):
+            return
+        if name in self.protected_dirs:
+            # Scratch directories only lose files that outlived the grace period
+            cutoff = time.time() - self.upload_grace
+            for entry in os.scandir(path):
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    reclaimed["bytes"] += entry.stat().st_size
+                    reclaimed["audioFiles"] += 1
+                    os.remove(entry.path)
+        elif name not in self.rooms and time.time() - os.path.getmtime(path) >= self.upload_grace:
+            self._remove_upload_dir(name, reclaimed)
+
+    def _remove_upload_dir(self, room_code, reclaimed):
+        path = os.path.join(self.upload_folder, room_code)
+        if not os.path.isdir(path):
+            return
+        for entry in os.scandir(path):
+            if entry.is_file():
+                reclaimed["bytes"] += entry.stat().st_size
+                reclaimed["audioFiles"] += 1
+        shutil.rmtree(path, ignore_errors=True)
+
+    def run(self, interval, sleep=time.sleep):
+        """Sweep forever, one bounded tick every ``interval`` seconds"""
+        while True:
+            sleep(interval)
+            try:
+                reclaimed = self.tick()
+                if any(reclaimed.values()):
+                    print(f"🧹 Sweeper reclaimed {reclaimed['rooms']} rooms, {reclaimed['users']} users, "
+                          f"{reclaimed['audioFiles']} audio files ({reclaimed['bytes']} bytes)")
+            except Exception as e:
+                print(f"❌ Sweeper tick failed: {e}")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark spoken-number conversion on long transcripts, against the
+previous three-pass regex implementation
+"""
+
+import os
+import sys
+import time
+import random
+import importlib.util
+
+spec = importlib.util.spec_from_file_location("number_conversion", os.path.join(os.path.dirname(os.path.abspath(__file__)), "util", "number_conversion.py"))
+number_conversion = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(number_conversion)
+WORD_TO_DIGIT = number_conversion.WORD_TO_DIGIT
+convert_spoken_numbers_to_digits = number_conversion.convert_spoken_numbers_to_digits
+
+import re
+
+# Previous implementation, kept for comparison
+def legacy_convert(text):
+    """
+    Convert sequences of spoken numbers to digits to preserve sensitive information like:
+    - Credit card numbers: "one two three four" -> "1234"
+    - Phone numbers: "five five five one two three" -> "555123"
+    - SSN: "one two three four five six seven eight nine" -> "123456789"
+    """
+    
+    # Pattern to match sequences of spoken digit words
+    # This matches 3+ consecutive spoken numbers (to avoid converting normal speech)
+    number_words = '|'.join(WORD_TO_DIGIT.keys())
+    pattern = rf'\b(?:(?:{number_words})\s*(?:dash|hyphen|-|\.|\s)*)+\b'
+    
+    def replace_number_sequence(match):
+        sequence = match.group()
+        # Extract just the number words, preserving separators
+        words = re.findall(rf'\b({number_words})\b', sequence, re.IGNORECASE)
+        
+        # Only convert if we have 3+ consecutive numbers (likely sensitive data)
+        if len(words) >= 3:
+            # Convert words to digits
+            digits = ''.join(WORD_TO_DIGIT.get(word.lower(), word) for word in words)
+            
+            # Preserve original formatting structure
+            if 'dash' in sequence.lower() or '-' in sequence:
+                # For sequences like "one two three dash four five six"
+                # Try to maintain dash structure for credit cards, SSN etc
+                if len(digits) == 4:  # Likely credit card group
+                    return digits
+                elif len(digits) == 9:  # Likely SSN
+                    return f"{digits[:3]}-{digits[3:5]}-{digits[5:]}"
+                elif len(digits) >= 6:  # Likely phone or credit card
+                    # Insert dashes every 4 digits for credit cards
+                    formatted = '-'.join([digits[i:i+4] for i in range(0, len(digits), 4)])
+                    return formatted
+                else:
+                    return digits
+            else:
+                return digits
+        else:
+            # Keep original text for short sequences (normal speech)
+            return sequence
+    
+    # Apply the conversion
+    result = re.sub(pattern, replace_number_sequence, text, flags=re.IGNORECASE)
+    
+    # Additional patterns for common formats
+    # Handle "credit card number is one two three four dash five six seven eight"
+    credit_card_pattern = r'\bcredit card number is\s+([a-z\s\-]+)'
+    def convert_cc_numbers(match):
+        cc_text = match.group(1)
+        words = re.findall(rf'\b({number_words})\b', cc_text, re.IGNORECASE)
+        if len(words) >= 8:  # Minimum for partial credit card
+            digits = ''.join(WORD_TO_DIGIT.get(word.lower(), word) for word in words)
+            # Format as credit card groups
+            formatted = '-'.join([digits[i:i+4] for i in range(0, len(digits), 4)])
+            return f"credit card number is {formatted}"
+        return match.group()
+    
+    result = re.sub(credit_card_pattern, convert_cc_numbers, result, flags=re.IGNORECASE)
+    
+    # Handle "phone number is five five five dash one two three dash four five six seven"
+    phone_pattern = r'\b(?:phone|number|call)\s+(?:is\s+|me\s+at\s+)?([a-z\s\-()]+)'
+    def convert_phone_numbers(match):
+        phone_text = match.group(1)
+        words = re.findall(rf'\b({number_words})\b', phone_text, re.IGNORECASE)
+        if len(words) >= 7:  # Minimum for phone number
+            digits = ''.join(WORD_TO_DIGIT.get(word.lower(), word) for word in words)
+            if len(digits) == 10:  # US phone number
+                return match.group().replace(phone_text, f"({digits[:3]}) {digits[3:6]}-{digits[6:]}")
+            elif len(digits) >= 7:
+                return match.group().replace(phone_text, f"{digits[:3]}-{digits[3:]}")
+        return match.group()
+    
+    result = re.sub(phone_pattern, convert_phone_numbers, result, flags=re.IGNORECASE)
+    
+    return result
+
+
+PHRASES = [
+    "so anyway I was telling them about the trip",
+    "my credit card number is {card}",
+    "you can call me at {phone}",
+    "I have one apple and two oranges",
+    "the verification code is {code}",
+    "my social security number is {ssn}",
+    "we should meet at the usual place tomorrow",
+]
+
+
+def spoken(digits, dash_every=None):
+    words = [list(WORD_TO_DIGIT)[int(d)] for d in digits]
+    if dash_every:
+        groups = [' '.join(words[i:i + dash_every]) for i in range(0, len(words), dash_every)]
+        return ' dash '.join(groups)
+    return ' '.join(words)
+
+
+def build_transcript(sentences, seed=7):
+    """A long voice transcript with numbers read out every few sentences"""
+    rng = random.Random(seed)
+    digits = lambda n: ''.join(rng.choice('0123456789') for _ in range(n))
+    parts = []
+    for _ in range(sentences):
+        parts.append(rng.choice(PHRASES).format(
+            card=spoken(digits(16), 4), phone=spoken(digits(10)), code=spoken(digits(6)),
+            ssn=spoken(digits(3)) + ' dash ' + spoken(digits(2)) + ' dash ' + spoken(digits(4))
+        ))
+    return ' and '.join(parts)
+
+
+def timed(fn, text, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    transcript = build_transcript(sentences)
+    before = timed(legacy_convert, transcript)
+    after = timed(convert_spoken_numbers_to_digits, transcript)
+    print(f"Transcript: {len(transcript):,} characters, {sentences} sentences")
+    print(f"Before: {before * 1000:.1f}ms  After: {after * 1000:.1f}ms  ({before / after:.1f}x)")
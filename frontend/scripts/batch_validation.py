@@ -0,0 +1,52 @@
+import re
+from typing import List
+
+import numpy as np
+
+CARD_DIGITS_MAX = 19
+NON_DIGIT_RE = re.compile(r'\D')
+
+
+def _digit_matrix(rows: List[str], width: int) -> np.ndarray:
+    """Stack equal-width ASCII digit strings into an (n, width) integer array."""
+    buffer = ''.join(rows).encode('ascii')
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(rows), width).astype(np.int16) - ord('0')
+
+
+def luhn_valid_batch(candidates: List[str]) -> np.ndarray:
+    """
+    Luhn-check many card candidates at once.
+
+    Candidates are stripped to their digits, which must be ASCII. Digit
+    strings are reversed and zero-padded to a common width, since leading
+    zeros do not change a Luhn sum, and checked as one array operation.
+    """
+    digits = [NON_DIGIT_RE.sub('', candidate) for candidate in candidates]
+    lengths = np.fromiter((len(d) for d in digits), dtype=np.int16, count=len(digits))
+    rows = [d[::-1][:CARD_DIGITS_MAX].ljust(CARD_DIGITS_MAX, '0') for d in digits]
+    matrix = _digit_matrix(rows, CARD_DIGITS_MAX)
+
+    doubled = matrix[:, 1::2] * 2
+    matrix[:, 1::2] = np.where(doubled > 9, doubled - 9, doubled)
+    checksum_ok = matrix.sum(axis=1) % 10 == 0
+    return checksum_ok & (lengths >= 13) & (lengths <= CARD_DIGITS_MAX)
+
+
+def ipv4_valid_batch(candidates: List[str]) -> np.ndarray:
+    """
+    Check many IPv4 candidates at once: four dot-separated ASCII octets,
+    each at most three digits and in 0-255.
+    """
+    valid = np.zeros(len(candidates), dtype=bool)
+    rows = []
+    indices = []
+    for i, candidate in enumerate(candidates):
+        parts = candidate.split('.')
+        if len(parts) == 4 and all(0 < len(part) <= 3 and part.isdigit() for part in parts):
+            rows.append(''.join(part.rjust(3, '0') for part in parts))
+            indices.append(i)
+    if rows:
+        octets = _digit_matrix(rows, 12).reshape(len(rows), 4, 3)
+        values = octets[:, :, 0] * 100 + octets[:, :, 1] * 10 + octets[:, :, 2]
+        valid[indices] = (values <= 255).all(axis=1)
+    return valid
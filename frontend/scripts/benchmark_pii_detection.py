@@ -0,0 +1,132 @@
+import re
+import sys
+import time
+import random
+from typing import Callable, List
+
+from enhanced_pii_detection import EnhancedPIIDetector
+
+# Everyday chat lines; most real messages carry no PII at all
+CHAT_LINES = [
+    "hey are you coming tonight?",
+    "lol that was hilarious",
+    "running late, be there soon",
+    "did you see the new video?",
+    "can we move the meeting to tomorrow",
+    "sounds good to me!",
+    "what time works for you",
+    "i'll send the notes after lunch",
+    "omg yes, let's do it",
+    "thanks for the help earlier :)",
+    "brb grabbing coffee",
+    "who's bringing snacks",
+]
+
+# Lines with numbers, addresses and contact details, some of them PII
+PII_LINES = [
+    "call me at 555-123-4567 when you land",
+    "my email is jane.doe@example.com",
+    "ssn for the form is 123-45-6789",
+    "card ending 4532-1234-5678-9012 was charged",
+    "ship it to 42 Wallaby Way, Sydney",
+    "the box is at 10.0.0.12 now",
+    "born 03/14/1992, same as my cousin",
+    "reach me on (555) 987-6543 after 5",
+    "meet at 7:30 near gate 12",
+    "it only cost 20 bucks",
+    "international: +44 20 7946 0958",
+]
+
+
+def build_corpus(size: int, pii_ratio: float = 0.2, seed: int = 7) -> List[str]:
+    """Build a reproducible chat corpus with roughly ``pii_ratio`` PII-bearing messages"""
+    rng = random.Random(seed)
+    return [
+        rng.choice(PII_LINES) if rng.random() < pii_ratio else rng.choice(CHAT_LINES)
+        for _ in range(size)
+    ]
+
+
+def legacy_scan(detector: EnhancedPIIDetector, text: str) -> list:
+    """The original per-message loop: every raw pattern string, on every message"""
+    return [
+        (pattern_type, match)
+        for pattern_type in detector.patterns.types
+        for pattern in pattern_type.patterns
+        for match in re.finditer(pattern.pattern, text, re.IGNORECASE)
+    ]
+
+
+def messages_per_second(fn: Callable[[str], object], corpus: List[str], repeat: int = 3) -> float:
+    """Best throughput of ``repeat`` passes over the corpus"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in corpus:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+def run_benchmark(size: int = 20000) -> None:
+    corpus = build_corpus(size)
+    detector = EnhancedPIIDetector()
+
+    # The staged engine must find exactly what the legacy loop finds
+    for message in set(corpus):
+        legacy = [(t.pii_type, m.span()) for t, m in legacy_scan(detector, message)]
+        staged = [(t.pii_type, m.span()) for t, m in detector._scan(message, detector.patterns)]
+        assert legacy == staged, message
+
+    before = messages_per_second(lambda text: legacy_scan(detector, text), corpus)
+    after = messages_per_second(lambda text: list(detector._scan(text, detector.patterns)), corpus)
+    print(f"Corpus: {size} messages, {sum(1 for m in corpus if m in PII_LINES)} with numbers or contact details")
+    print(f"Pattern scan  before: {before:>10,.0f} msg/s")
+    print(f"Pattern scan  after:  {after:>10,.0f} msg/s  ({after / before:.1f}x)")
+
+    full = messages_per_second(detector.detect_pii, corpus)
+    print(f"detect_pii end to end: {full:>9,.0f} msg/s")
+
+
+def build_digit_paste(rows: int, seed: int = 7) -> str:
+    """An order export pasted into chat: card-like numbers and IPs on every row"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(rows):
+        card = ''.join(rng.choice('0123456789') for _ in range(16))
+        ip = '.'.join(str(rng.randint(0, 300)) for _ in range(4))
+        lines.append(f"order {rng.randint(1000, 9999)} card {card} from {ip}")
+    return '\n'.join(lines)
+
+
+def run_validation_benchmark(rows: int = 2000) -> None:
+    detector = EnhancedPIIDetector()
+    paste = build_digit_paste(rows)
+    matches = list(detector._scan(paste, detector.patterns))
+    candidates = [(t.pii_type, m.group()) for t, m in matches if t.pii_type in ('credit_card', 'ip_address')]
+
+    def scalar():
+        return [
+            detector._validate_credit_card(v) if t == 'credit_card' else detector._validate_ip_address(v)
+            for t, v in candidates
+        ]
+
+    vectorized = [v for v in detector._validate_candidates(matches) if v is not None]
+    assert vectorized == scalar()
+
+    repeat = 5
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scalar()
+    before = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        detector._validate_candidates(matches)
+    after = (time.perf_counter() - start) / repeat
+    print(f"Validation of {len(candidates)} card/IP candidates  before: {before * 1000:.1f}ms  "
+          f"after: {after * 1000:.1f}ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+    run_validation_benchmark()
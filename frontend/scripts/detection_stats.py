@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable
+
+# Sliding windows reported by default: last minute, five minutes and hour
+DEFAULT_WINDOWS = (60, 300, 3600)
+# Each window is kept as this many buckets, so it slides in 1/60 steps
+BUCKETS_PER_WINDOW = 60
+
+
+class _Window:
+    """Message counts over the last ``seconds``, kept as coarse time buckets."""
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+        self.bucket_size = max(1, seconds // BUCKETS_PER_WINDOW)
+        self.buckets = deque()  # [bucket_index, messages, messages_with_pii, redactions]
+        self.totals = [0, 0, 0]
+
+    def _expire(self, now: float) -> None:
+        oldest = (now - self.seconds) // self.bucket_size
+        while self.buckets and self.buckets[0][0] <= oldest:
+            _, *counts = self.buckets.popleft()
+            self.totals = [total - count for total, count in zip(self.totals, counts)]
+
+    def add(self, now: float, redactions: int) -> None:
+        self._expire(now)
+        index = now // self.bucket_size
+        if not self.buckets or self.buckets[-1][0] != index:
+            self.buckets.append([index, 0, 0, 0])
+        counts = (1, 1 if redactions else 0, redactions)
+        bucket = self.buckets[-1]
+        for i, count in enumerate(counts):
+            bucket[i + 1] += count
+            self.totals[i] += count
+
+    def read(self, now: float) -> Dict:
+        self._expire(now)
+        messages, with_pii, redactions = self.totals
+        return {
+            'messages': messages,
+            'messages_with_pii': with_pii,
+            'total_redactions': redactions,
+            'redaction_rate': with_pii / messages if messages else 0
+        }
+
+
+class DetectionStats:
+    """
+    Running detection statistics with bounded memory.
+
+    Lifetime totals are plain counters, the most recent events are kept in a
+    fixed-size ring buffer, and sliding time windows are bucketed, so reading
+    the statistics costs the same however many messages have been seen.
+    A detector may be shared across threads, so updates and reads are locked.
+    """
+
+    def __init__(self, recent: int = 1000, windows: Iterable[int] = DEFAULT_WINDOWS,
+                 clock: Callable[[], float] = time.time):
+        self.recent = deque(maxlen=recent)
+        self.clock = clock
+        self.windows = {seconds: _Window(seconds) for seconds in windows}
+        self.total_messages = 0
+        self.messages_with_pii = 0
+        self.total_redactions = 0
+        self.confidence_sum = 0.0
+        self.pii_type_counts = {}
+        self.lock = threading.Lock()
+
+    def record(self, event: Dict, confidence_sum: float) -> None:
+        """Count one detection event; ``confidence_sum`` covers all its redactions."""
+        redactions = event['redaction_count']
+        with self.lock:
+            self.recent.append(event)
+            self.total_messages += 1
+            self.total_redactions += redactions
+            self.confidence_sum += confidence_sum
+            if redactions:
+                self.messages_with_pii += 1
+            for pii_type in event['pii_types']:
+                self.pii_type_counts[pii_type] = self.pii_type_counts.get(pii_type, 0) + 1
+
+            now = self.clock()
+            for window in self.windows.values():
+                window.add(now, redactions)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return self._snapshot(self.clock())
+
+    def _snapshot(self, now: float) -> Dict:
+        total = self.total_messages
+        return {
+            'total_messages': total,
+            'messages_with_pii': self.messages_with_pii,
+            'redaction_rate': self.messages_with_pii / total if total else 0,
+            'total_redactions': self.total_redactions,
+            'pii_type_distribution': dict(self.pii_type_counts),
+            'avg_redactions_per_message': self.total_redactions / total if total else 0,
+            'avg_confidence': self.confidence_sum / self.total_redactions if self.total_redactions else 0,
+            'windows': {f'{seconds}s': window.read(now) for seconds, window in self.windows.items()}
+        }
@@ -1,122 +1,158 @@
 import re
 import json
 import hashlib
+from bisect import bisect_left, bisect_right
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+from batch_validation import ipv4_valid_batch, luhn_valid_batch
+from detection_stats import DetectionStats
+from pattern_registry import PatternRegistry, PatternSnapshot, PatternType, default_registry
+from pii_redaction import Span, build_redaction
+
+# Cheap per-message features used to skip patterns that cannot possibly match
+DIGIT_RE = re.compile(r'\d')
+TOKEN_RE = re.compile(r'\S+')
+# This detector's table in the pattern registry
+REGISTRY_TABLE = 'enhanced'
+# Below this many card/IP candidates the scalar validators are faster than NumPy
+VECTORIZE_MIN_CANDIDATES = 32
+
 class EnhancedPIIDetector:
     """
     Production-grade PII detection system with advanced pattern matching,
     confidence scoring, and comprehensive logging.
     """
     
-    def __init__(self):
-        # Enhanced PII patterns with confidence weights
-        self.patterns = {
-            'phone_number': {
-                'patterns': [
-                    r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # US phone numbers
-                    r'\b$$\d{3}$$\s?\d{3}[-.]?\d{4}\b',  # (123) 456-7890
-                    r'\b\+\d{1,3}[-.\s]?\d{1,14}\b',  # International format
-                    r'\b\d{3}\s\d{3}\s\d{4}\b'  # Spaced format
-                ],
-                'weight': 0.9
-            },
-            'email': {
-                'patterns': [
-                    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                    r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}\b'
-                ],
-                'weight': 0.95
-            },
-            'ssn': {
-                'patterns': [
-                    r'\b\d{3}[-.]?\d{2}[-.]?\d{4}\b',
-                    r'\b\d{3}\s\d{2}\s\d{4}\b'
-                ],
-                'weight': 0.98
-            },
-            'credit_card': {
-                'patterns': [
-                    r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b',
-                    r'\b\d{13,19}\b'
-                ],
-                'weight': 0.85
-            },
-            'address': {
-                'patterns': [
-                    r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Court|Ct|Place|Pl|Way|Circle|Cir)\b',
-                    r'\b\d+\s+[A-Za-z\s]+(?:St\.|Ave\.|Rd\.|Blvd\.|Ln\.|Dr\.|Ct\.|Pl\.)\b'
-                ],
-                'weight': 0.8
-            },
-            'ip_address': {
-                'patterns': [
-                    r'\b(?:\d{1,3}\.){3}\d{1,3}\b',  # IPv4
-                    r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b'  # IPv6
-                ],
-                'weight': 0.9
-            },
-            'date_of_birth': {
-                'patterns': [
-                    r'\b(?:0[1-9]|1[0-2])[-/.](?:0[1-9]|[12]\d|3[01])[-/.](?:19|20)\d{2}\b',
-                    r'\b(?:0[1-9]|[12]\d|3[01])[-/.](?:0[1-9]|1[0-2])[-/.](?:19|20)\d{2}\b',
-                    r'\b(?:19|20)\d{2}[-/.](?:0[1-9]|1[0-2])[-/.](?:0[1-9]|[12]\d|3[01])\b'
-                ],
-                'weight': 0.85
-            }
-        }
+    def __init__(self, context_window: int = 8, recent_events: int = 1000,
+                 registry: Optional[PatternRegistry] = None):
+        # Context keywords only count within this many tokens of a match
+        self.context_window = context_window
         
-        # Context-based confidence adjustments
-        self.context_modifiers = {
-            'phone_number': {
-                'positive': ['call', 'phone', 'number', 'contact', 'reach'],
-                'negative': ['price', 'cost', 'amount', 'total', 'sum']
-            },
-            'address': {
-                'positive': ['live', 'address', 'street', 'home', 'mail', 'send'],
-                'negative': ['website', 'url', 'link']
-            }
-        }
+        # Pattern tables come precompiled from the registry (pii_patterns.json),
+        # listed in priority order for overlapping matches of equal confidence
+        self.registry = registry or default_registry()
         
-        self.detection_log = []
+        # Running totals plus a ring buffer of the most recent detection events
+        self.stats = DetectionStats(recent=recent_events)
+        self.detection_log = self.stats.recent
+    
+    @property
+    def patterns(self) -> PatternSnapshot:
+        """The active, immutable pattern snapshot."""
+        return self.registry.snapshot(REGISTRY_TABLE)
+    
+    def _scan(self, text: str, patterns: PatternSnapshot):
+        """
+        Yield (pattern_type, match) for every pattern match in text.
+
+        Per-message features are computed once, and types whose required
+        features are all absent are skipped without scanning: most chat
+        messages contain no digits, '@' or ':' and cost a single pass.
+        """
+        present = {feature: feature in text for feature in patterns.literal_triggers}
+        present['digit'] = DIGIT_RE.search(text) is not None
+        for pattern_type in patterns.types:
+            if pattern_type.requires and not any(present[feature] for feature in pattern_type.requires):
+                continue
+            for pattern in pattern_type.patterns:
+                for match in pattern.finditer(text):
+                    yield pattern_type, match
     
     def detect_pii(self, text: str, message_id: str = None) -> Dict:
         """
         Advanced PII detection with confidence scoring and context analysis.
         """
-        redacted_text = text
-        detected_fields = []
-        redactions_made = []
-        total_confidence = 0
+        return self.detect_pii_batch([text], [message_id])[0]
+    
+    def detect_pii_batch(self, texts: List[str], message_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Detect PII in several messages, validating all of their card and IP
+        candidates together. Results match calling detect_pii on each message.
+        """
+        # One snapshot for the whole batch, even if a reload lands meanwhile
+        patterns = self.patterns
+        message_ids = message_ids or [None] * len(texts)
+        scanned = [list(self._scan(text, patterns)) for text in texts]
+        validity = self._validate_candidates([found for matches in scanned for found in matches])
+        
+        results = []
+        offset = 0
+        for text, message_id, matches in zip(texts, message_ids, scanned):
+            results.append(self._detect(
+                text, message_id, patterns, matches, validity[offset:offset + len(matches)]
+            ))
+            offset += len(matches)
+        return results
+    
+    def _validate_candidates(self, matches: List[Tuple]) -> List[Optional[bool]]:
+        """
+        Card and IP validity for each scanned match, None for other types.
+
+        Large candidate sets (digit-heavy pastes, batches) are checked as
+        NumPy array operations; non-ASCII digits keep the scalar path.
+        """
+        validity: List[Optional[bool]] = [None] * len(matches)
+        batches = {'credit_card': [], 'ip_address': []}
+        for i, (pattern_type, _) in enumerate(matches):
+            if pattern_type.pii_type in batches:
+                batches[pattern_type.pii_type].append(i)
         
-        for pii_type, config in self.patterns.items():
-            patterns = config['patterns']
-            base_weight = config['weight']
+        checks = {
+            'credit_card': (self._validate_credit_card, luhn_valid_batch),
+            'ip_address': (self._validate_ip_address, ipv4_valid_batch)
+        }
+        for pii_type, indices in batches.items():
+            scalar, vectorized = checks[pii_type]
+            values = [matches[i][1].group() for i in indices]
+            if len(indices) < VECTORIZE_MIN_CANDIDATES:
+                for i, value in zip(indices, values):
+                    validity[i] = scalar(value)
+                continue
+            ascii_pairs = [(i, value) for i, value in zip(indices, values) if value.isascii()]
+            results = vectorized([value for _, value in ascii_pairs])
+            for (i, _), valid in zip(ascii_pairs, results.tolist()):
+                validity[i] = valid
+            for i, value in zip(indices, values):
+                if validity[i] is None:
+                    validity[i] = scalar(value)
+        return validity
+    
+    def _detect(self, text: str, message_id: Optional[str], patterns: PatternSnapshot,
+                matches: List[Tuple], validity: List[Optional[bool]]) -> Dict:
+        """Score, redact and log one message from its scanned matches."""
+        candidates = []
+        context = None
+        for (pattern_type, match), valid in zip(matches, validity):
+            context_words = frozenset()
+            if pattern_type.positive or pattern_type.negative:
+                if context is None:
+                    context = self._index_context(text, patterns)
+                context_words = self._context_near(context, match.start(), match.end())
+            confidence = self._calculate_confidence(pattern_type, match.group(), context_words, valid)
             
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    original_value = match.group()
-                    confidence = self._calculate_confidence(
-                        pii_type, original_value, text, base_weight
-                    )
-                    
-                    # Only redact if confidence exceeds threshold
-                    if confidence > 0.7:
-                        detected_fields.append(pii_type)
-                        redacted_value = self._get_redaction_text(pii_type)
-                        redacted_text = redacted_text.replace(original_value, redacted_value)
-                        
-                        redaction_info = {
-                            'type': pii_type,
-                            'original': original_value,
-                            'position': match.span(),
-                            'confidence': confidence,
-                            'hash': hashlib.sha256(original_value.encode()).hexdigest()[:8]
-                        }
-                        redactions_made.append(redaction_info)
-                        total_confidence += confidence
+            # Only redact if confidence exceeds threshold
+            if confidence > 0.7:
+                candidates.append(Span(
+                    match.start(), match.end(), pattern_type.pii_type,
+                    pattern_type.redaction, confidence, pattern_type.priority
+                ))
+        
+        # Overlapping matches are resolved here, so each region is redacted once
+        redacted_text, applied, offset_map = build_redaction(text, candidates)
+        detected_fields = [span.pii_type for span in applied]
+        redactions_made = []
+        total_confidence = 0
+        for span in applied:
+            original_value = text[span.start:span.end]
+            redactions_made.append({
+                'type': span.pii_type,
+                'original': original_value,
+                'position': (span.start, span.end),
+                'confidence': span.confidence,
+                'hash': hashlib.sha256(original_value.encode()).hexdigest()[:8]
+            })
+            total_confidence += span.confidence
         
         # Log detection event
         detection_event = {
@@ -126,9 +162,10 @@ class EnhancedPIIDetector:
             'redacted_length': len(redacted_text),
             'pii_types': list(set(detected_fields)),
             'redaction_count': len(redactions_made),
+            'pattern_version': patterns.version,
             'avg_confidence': total_confidence / len(redactions_made) if redactions_made else 0
         }
-        self.detection_log.append(detection_event)
+        self.stats.record(detection_event, total_confidence)
         
         return {
             'has_redactions': len(detected_fields) > 0,
@@ -136,33 +173,63 @@ class EnhancedPIIDetector:
             'detected_fields': list(set(detected_fields)),
             'original_content': text,
             'redactions': redactions_made,
+            'offset_map': offset_map,
+            'pattern_version': patterns.version,
             'detection_metadata': detection_event
         }
     
-    def _calculate_confidence(self, pii_type: str, match: str, context: str, base_weight: float) -> float:
-        """Calculate confidence score based on pattern match and context."""
-        confidence = base_weight
+    def _index_context(self, text: str, patterns: PatternSnapshot) -> Tuple[List[int], List[int], List[str]]:
+        """
+        Find every context keyword in the message in one automaton pass.
+
+        Returns the token start offsets plus the keyword hits sorted by the
+        index of the token they fall in, so spans can look up their window.
+        """
+        lowered = text.lower()
+        token_starts = [token.start() for token in TOKEN_RE.finditer(lowered)]
+        hits = sorted(
+            (bisect_right(token_starts, start) - 1, keyword)
+            for start, keyword in patterns.context_automaton.find_all(lowered)
+        )
+        return token_starts, [token for token, _ in hits], [keyword for _, keyword in hits]
+    
+    def _context_near(self, context: Tuple[List[int], List[int], List[str]], start: int, end: int) -> frozenset:
+        """Context keywords within context_window tokens of text[start:end]."""
+        token_starts, hit_tokens, keywords = context
+        first = max(0, bisect_right(token_starts, start) - 1)
+        last = max(first, bisect_right(token_starts, end - 1) - 1)
+        lo = bisect_left(hit_tokens, first - self.context_window)
+        hi = bisect_right(hit_tokens, last + self.context_window)
+        return frozenset(keywords[lo:hi])
+    
+    def _calculate_confidence(self, pattern_type: PatternType, match: str,
+                              context_words: frozenset = frozenset(), valid: Optional[bool] = None) -> float:
+        """
+        Calculate confidence score based on pattern match and nearby context keywords.
+        ``valid`` is a precomputed card/IP validity; it is checked here when None.
+        """
+        pii_type = pattern_type.pii_type
+        confidence = pattern_type.weight
         
-        # Apply context modifiers
-        if pii_type in self.context_modifiers:
-            modifiers = self.context_modifiers[pii_type]
-            context_lower = context.lower()
-            
-            # Boost confidence for positive context
-            for positive_word in modifiers.get('positive', []):
-                if positive_word in context_lower:
-                    confidence = min(0.98, confidence + 0.05)
-            
-            # Reduce confidence for negative context
-            for negative_word in modifiers.get('negative', []):
-                if negative_word in context_lower:
-                    confidence = max(0.3, confidence - 0.2)
+        # Boost confidence for positive context
+        for positive_word in pattern_type.positive:
+            if positive_word in context_words:
+                confidence = min(0.98, confidence + 0.05)
+        
+        # Reduce confidence for negative context
+        for negative_word in pattern_type.negative:
+            if negative_word in context_words:
+                confidence = max(0.3, confidence - 0.2)
         
         # Special validation for specific PII types
         if pii_type == 'credit_card':
-            confidence *= 0.9 if self._validate_credit_card(match) else 0.5
+            if valid is None:
+                valid = self._validate_credit_card(match)
+            confidence *= 0.9 if valid else 0.5
         elif pii_type == 'ip_address':
-            confidence *= 0.9 if self._validate_ip_address(match) else 0.4
+            if valid is None:
+                valid = self._validate_ip_address(match)
+            confidence *= 0.9 if valid else 0.4
         
         return confidence
     
@@ -197,43 +264,9 @@ class EnhancedPIIDetector:
         except ValueError:
             return False
     
-    def _get_redaction_text(self, pii_type: str) -> str:
-        """Get appropriate redaction text for PII type."""
-        redaction_map = {
-            'phone_number': '[PHONE REDACTED]',
-            'email': '[EMAIL REDACTED]',
-            'ssn': '[SSN REDACTED]',
-            'credit_card': '[CARD REDACTED]',
-            'address': '[ADDRESS REDACTED]',
-            'ip_address': '[IP REDACTED]',
-            'date_of_birth': '[DOB REDACTED]'
-        }
-        return redaction_map.get(pii_type, '[REDACTED]')
-    
     def get_detection_statistics(self) -> Dict:
-        """Get comprehensive detection statistics."""
-        if not self.detection_log:
-            return {'total_messages': 0, 'messages_with_pii': 0}
-        
-        total_messages = len(self.detection_log)
-        messages_with_pii = sum(1 for log in self.detection_log if log['redaction_count'] > 0)
-        
-        pii_type_counts = {}
-        total_redactions = 0
-        
-        for log in self.detection_log:
-            total_redactions += log['redaction_count']
-            for pii_type in log['pii_types']:
-                pii_type_counts[pii_type] = pii_type_counts.get(pii_type, 0) + 1
-        
-        return {
-            'total_messages': total_messages,
-            'messages_with_pii': messages_with_pii,
-            'redaction_rate': messages_with_pii / total_messages if total_messages > 0 else 0,
-            'total_redactions': total_redactions,
-            'pii_type_distribution': pii_type_counts,
-            'avg_redactions_per_message': total_redactions / total_messages if total_messages > 0 else 0
-        }
+        """Get comprehensive detection statistics, including recent time windows."""
+        return self.stats.snapshot()
 
 # Example usage and comprehensive testing
 if __name__ == "__main__":
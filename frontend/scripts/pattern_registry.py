@@ -0,0 +1,176 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Pattern, Tuple
+
+from keyword_automaton import KeywordAutomaton
+
+DEFAULT_PATTERNS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pii_patterns.json')
+
+
+class PatternType(NamedTuple):
+    """One PII type, validated and compiled."""
+    pii_type: str
+    patterns: Tuple[Pattern, ...]
+    weight: float
+    requires: Tuple[str, ...]  # run only if the message has one of these ('digit' or a literal); empty = always
+    redaction: str
+    priority: int  # position in the table; lower wins overlapping matches of equal confidence
+    positive: Tuple[str, ...]
+    negative: Tuple[str, ...]
+
+
+class PatternSnapshot(NamedTuple):
+    """An immutable, versioned set of compiled pattern types for one detector."""
+    version: str
+    types: Tuple[PatternType, ...]
+    by_type: Mapping[str, PatternType]
+    literal_triggers: Tuple[str, ...]
+    context_automaton: KeywordAutomaton
+
+
+def _string_list(entry: Dict, key: str, where: str) -> Tuple[str, ...]:
+    values = entry.get(key, [])
+    if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+        raise ValueError(f"{where}: '{key}' must be a list of non-empty strings")
+    return tuple(values)
+
+
+def compile_table(table: Dict, version: str) -> PatternSnapshot:
+    """Validate one detector's pattern table and compile it into a snapshot."""
+    if not isinstance(table, dict) or not table:
+        raise ValueError("pattern table must be a non-empty object")
+
+    types = []
+    for priority, (pii_type, entry) in enumerate(table.items()):
+        where = f"'{pii_type}'"
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: entry must be an object")
+        sources = _string_list(entry, 'patterns', where)
+        if not sources:
+            raise ValueError(f"{where}: at least one pattern is required")
+        try:
+            compiled = tuple(re.compile(source, re.IGNORECASE) for source in sources)
+        except re.error as e:
+            raise ValueError(f"{where}: invalid pattern: {e}") from e
+
+        weight = entry.get('weight', 1.0)
+        if not isinstance(weight, (int, float)) or not 0 < weight <= 1:
+            raise ValueError(f"{where}: 'weight' must be in (0, 1]")
+        requires = _string_list(entry, 'requires', where)
+        if any(feature != 'digit' and len(feature) != 1 for feature in requires):
+            raise ValueError(f"{where}: 'requires' entries must be 'digit' or a single character")
+        redaction = entry.get('redaction', '[REDACTED]')
+        if not isinstance(redaction, str):
+            raise ValueError(f"{where}: 'redaction' must be a string")
+        context = entry.get('context', {})
+        if not isinstance(context, dict):
+            raise ValueError(f"{where}: 'context' must be an object")
+
+        types.append(PatternType(
+            pii_type, compiled, float(weight), requires, redaction, priority,
+            tuple(word.lower() for word in _string_list(context, 'positive', where)),
+            tuple(word.lower() for word in _string_list(context, 'negative', where))
+        ))
+
+    return PatternSnapshot(
+        version=version,
+        types=tuple(types),
+        by_type=MappingProxyType({t.pii_type: t for t in types}),
+        literal_triggers=tuple(sorted({f for t in types for f in t.requires if f != 'digit'})),
+        context_automaton=KeywordAutomaton(word for t in types for word in t.positive + t.negative)
+    )
+
+
+class PatternRegistry:
+    """
+    Pattern tables loaded from a JSON config file.
+
+    Every load validates and compiles the file into a new PatternSnapshot per
+    detector, then swaps it in with a single reference assignment, so readers
+    never lock and never compile. ``watch`` polls the file and reloads it on
+    change; a broken edit is reported and the previous snapshot stays active.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATTERNS_PATH, poll_interval: float = 2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._snapshots: Mapping[str, PatternSnapshot] = MappingProxyType({})
+        self._mtime = None
+        self._watcher: Optional[threading.Thread] = None
+        self.reload(strict=True)
+
+    def snapshot(self, detector: str) -> PatternSnapshot:
+        """The active snapshot for a detector's table."""
+        return self._snapshots[detector]
+
+    def reload(self, strict: bool = False) -> bool:
+        """
+        Load the config file if it changed; returns True when a new version
+        was swapped in. With ``strict`` an invalid file raises ValueError.
+        """
+        mtime = None
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._mtime:
+                return False
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            config = json.loads(raw)
+            version = f"{config.get('version', 0)}+{hashlib.sha256(raw).hexdigest()[:8]}"
+            tables = config.get('detectors')
+            if not isinstance(tables, dict) or not tables:
+                raise ValueError("'detectors' must map detector names to pattern tables")
+            snapshots = {}
+            for name, table in tables.items():
+                try:
+                    snapshots[name] = compile_table(table, version)
+                except ValueError as e:
+                    raise ValueError(f"{name}: {e}") from e
+        except (OSError, ValueError) as e:
+            if strict:
+                raise ValueError(f"Invalid PII pattern config {self.path}: {e}") from e
+            # Remember the broken file so it is reported once, not on every poll
+            self._mtime = mtime
+            print(f"❌ Keeping pattern version {self.version()}, reload failed: {e}")
+            return False
+
+        self._mtime = mtime
+        self._snapshots = MappingProxyType(snapshots)
+        return True
+
+    def version(self) -> Optional[str]:
+        snapshots = self._snapshots
+        return next(iter(snapshots.values())).version if snapshots else None
+
+    def watch(self) -> None:
+        """Start reloading the config file in the background when it changes."""
+        if self._watcher is not None:
+            return
+
+        def poll():
+            while True:
+                time.sleep(self.poll_interval)
+                if self.reload():
+                    print(f"🔄 Loaded PII pattern version {self.version()}")
+
+        self._watcher = threading.Thread(target=poll, name='pattern-registry', daemon=True)
+        self._watcher.start()
+
+
+_default_registry: Optional[PatternRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> PatternRegistry:
+    """The shared registry over DEFAULT_PATTERNS_PATH, loaded and watched from first use."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = PatternRegistry()
+            _default_registry.watch()
+        return _default_registry
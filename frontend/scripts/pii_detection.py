@@ -1,6 +1,7 @@
-import re
-import json
-from typing import Dict, List, Tuple
+from typing import Dict, Optional
+
+from pattern_registry import PatternRegistry, PatternSnapshot, default_registry
+from pii_redaction import Span, build_redaction
 
 class PIIDetector:
     """
@@ -8,30 +9,15 @@ class PIIDetector:
     Detects and redacts various types of personally identifiable information.
     """
     
-    def __init__(self):
-        # Define PII patterns
-        self.patterns = {
-            'phone_number': [
-                r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # US phone numbers
-                r'\b$$\d{3}$$\s?\d{3}[-.]?\d{4}\b',  # (123) 456-7890
-                r'\b\+\d{1,3}[-.\s]?\d{1,14}\b'  # International format
-            ],
-            'email': [
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            ],
-            'ssn': [
-                r'\b\d{3}[-.]?\d{2}[-.]?\d{4}\b'  # Social Security Number
-            ],
-            'credit_card': [
-                r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b'  # Credit card numbers
-            ],
-            'address': [
-                r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Court|Ct|Place|Pl)\b'
-            ],
-            'ip_address': [
-                r'\b(?:\d{1,3}\.){3}\d{1,3}\b'  # IPv4 addresses
-            ]
-        }
+    def __init__(self, registry: Optional[PatternRegistry] = None):
+        # PII patterns come precompiled from the registry (pii_patterns.json),
+        # in priority order for overlapping matches
+        self.registry = registry or default_registry()
+    
+    @property
+    def patterns(self) -> PatternSnapshot:
+        """The active, immutable pattern snapshot."""
+        return self.registry.snapshot('basic')
     
     def detect_pii(self, text: str) -> Dict:
         """
@@ -41,32 +27,34 @@ class PIIDetector:
             text (str): Input text to scan for PII
             
         Returns:
-            Dict: Contains redacted text, detected fields, and original content
+            Dict: Contains redacted text, detected fields, original content and
+            an original-to-redacted offset map
         """
-        redacted_text = text
-        detected_fields = []
-        redactions_made = []
+        patterns = self.patterns
+        candidates = []
+        for pattern_type in patterns.types:
+            for pattern in pattern_type.patterns:
+                for match in pattern.finditer(text):
+                    candidates.append(Span(
+                        match.start(), match.end(), pattern_type.pii_type,
+                        pattern_type.redaction, priority=pattern_type.priority
+                    ))
         
-        for pii_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    detected_fields.append(pii_type)
-                    original_value = match.group()
-                    redacted_value = f"[REDACTED]"
-                    redacted_text = redacted_text.replace(original_value, redacted_value)
-                    redactions_made.append({
-                        'type': pii_type,
-                        'original': original_value,
-                        'position': match.span()
-                    })
+        redacted_text, applied, offset_map = build_redaction(text, candidates)
+        detected_fields = [span.pii_type for span in applied]
+        redactions_made = [
+            {'type': span.pii_type, 'original': text[span.start:span.end], 'position': (span.start, span.end)}
+            for span in applied
+        ]
         
         return {
             'has_redactions': len(detected_fields) > 0,
             'redacted_content': redacted_text,
             'detected_fields': list(set(detected_fields)),
             'original_content': text,
-            'redactions': redactions_made
+            'redactions': redactions_made,
+            'offset_map': offset_map,
+            'pattern_version': patterns.version
         }
     
     def process_voice_transcript(self, transcript: str) -> Dict:
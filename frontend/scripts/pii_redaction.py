@@ -0,0 +1,122 @@
+from bisect import bisect_left, bisect_right
+from typing import List, NamedTuple, Sequence, Tuple
+
+# (original_start, original_end, redacted_start, redacted_end) for each redacted span
+OffsetMap = List[Tuple[int, int, int, int]]
+
+
+class Span(NamedTuple):
+    """A candidate redaction over text[start:end]."""
+    start: int
+    end: int
+    pii_type: str
+    replacement: str
+    confidence: float = 1.0
+    priority: int = 0  # lower wins when confidences tie
+
+
+def select_disjoint(bounds: Sequence[Tuple[int, int]], order: Sequence[int]) -> List[int]:
+    """
+    Greedily accept intervals in preference order, skipping any that overlap
+    one already accepted; returns the accepted indices in text order.
+
+    ``bounds`` holds (start, end) per interval and ``order`` its indices, most
+    preferred first. Accepted intervals are disjoint, so a candidate can only
+    overlap the accepted interval with the greatest start before its end. That
+    predecessor is found in a Fenwick tree over the distinct starts, making
+    the whole selection O(n log n).
+    """
+    starts = sorted({start for start, _ in bounds})
+    size = len(starts)
+    tree = [0] * (size + 1)  # counts of accepted starts
+    ends = [0] * size  # end of the accepted interval at each start
+    top = 1 << size.bit_length()
+
+    def predecessor(limit):
+        # Position of the greatest accepted start among starts[:limit], or -1
+        rank = 0
+        i = limit
+        while i:
+            rank += tree[i]
+            i -= i & -i
+        if not rank:
+            return -1
+        position = 0
+        step = top
+        while step:
+            if position + step <= size and tree[position + step] < rank:
+                position += step
+                rank -= tree[position]
+            step >>= 1
+        return position
+
+    accepted = []
+    for index in order:
+        start, end = bounds[index]
+        if start >= end:
+            continue
+        before = predecessor(bisect_left(starts, end))
+        if before >= 0 and ends[before] > start:
+            continue
+        position = bisect_left(starts, start)
+        ends[position] = end
+        i = position + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+        accepted.append(index)
+    accepted.sort(key=lambda index: bounds[index][0])
+    return accepted
+
+
+def resolve_overlaps(spans: List[Span]) -> List[Span]:
+    """
+    Pick a non-overlapping subset of spans, ordered by position.
+
+    Spans are accepted greedily by highest confidence, then lowest priority,
+    then longest; a span overlapping an already accepted one is dropped. This
+    also collapses the duplicates produced when several patterns of one type
+    match the same text.
+    """
+    order = sorted(range(len(spans)), key=lambda i: (
+        -spans[i].confidence, spans[i].priority, spans[i].start - spans[i].end, spans[i].start
+    ))
+    return [spans[i] for i in select_disjoint([(span.start, span.end) for span in spans], order)]
+
+
+def build_redaction(text: str, spans: List[Span]) -> Tuple[str, List[Span], OffsetMap]:
+    """
+    Redact text in one left-to-right pass.
+
+    Returns the redacted text, the spans actually applied (after overlap
+    resolution) and an offset map from original to redacted positions.
+    """
+    applied = resolve_overlaps(spans)
+    pieces = []
+    offset_map: OffsetMap = []
+    cursor = 0
+    length = 0
+    for span in applied:
+        pieces.append(text[cursor:span.start])
+        length += span.start - cursor
+        pieces.append(span.replacement)
+        offset_map.append((span.start, span.end, length, length + len(span.replacement)))
+        length += len(span.replacement)
+        cursor = span.end
+    pieces.append(text[cursor:])
+    return ''.join(pieces), applied, offset_map
+
+
+def map_offset(offset_map: OffsetMap, position: int) -> int:
+    """
+    Translate a position in the original text to the redacted text.
+
+    Positions inside a redacted span map to the start of its replacement.
+    """
+    i = bisect_right(offset_map, (position, float('inf'))) - 1
+    if i < 0:
+        return position
+    start, end, redacted_start, redacted_end = offset_map[i]
+    if position < end:
+        return redacted_start
+    return redacted_end + (position - end)
@@ -0,0 +1,299 @@
+"""
+Redact an exported chat corpus offline.
+
+Streams JSONL, CSV or plain-text input, redacts it in chunks on a process
+pool and writes the output in input order. A checkpoint with the input and
+output byte offsets is written after every chunk, so an interrupted run
+continues where it stopped with --resume. Malformed JSONL lines are reported
+and left out of the output.
+
+    python redact_corpus.py chats.jsonl chats.redacted.jsonl --field content --tier both
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import importlib.util
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+PIIRANHA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'util', 'piiranha-model.py')
+TIERS = ('regex', 'model', 'both')
+
+# Every worker process loads its own copy of the PII model, so model tiers
+# default to this many workers instead of one per CPU
+MODEL_WORKERS = 1
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+
+# Per-process state, set up once by _init_worker
+_detector = None
+_model = None
+_typed = False
+
+
+def _init_worker(tier: str, typed: bool, threads: int) -> None:
+    global _detector, _model, _typed
+    _typed = typed
+    if tier in ('regex', 'both'):
+        from enhanced_pii_detection import EnhancedPIIDetector
+        _detector = EnhancedPIIDetector(recent_events=1)
+    if tier in ('model', 'both'):
+        import torch
+        # Share the CPUs between worker processes instead of each taking all of them
+        torch.set_num_threads(threads)
+        spec = importlib.util.spec_from_file_location("piiranha_model", PIIRANHA_PATH)
+        _model = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_model)
+
+
+def _redact_chunk(texts: List[Optional[str]]) -> List[Optional[str]]:
+    """Redact one chunk; None entries (records without text) pass through."""
+    indices = [i for i, text in enumerate(texts) if text]
+    redacted = list(texts)
+    batch = [texts[i] for i in indices]
+    if _detector is not None:
+        batch = [result['redacted_content'] for result in _detector.detect_pii_batch(batch)]
+    if _model is not None:
+        batch = [_model.redact_text(text, results, _typed) for text, results in zip(batch, _model.detect_batch(batch))]
+    for i, text in zip(indices, batch):
+        redacted[i] = text
+    return redacted
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.csv':
+        return 'csv'
+    return 'text'
+
+
+class CorpusReader:
+    """
+    Streams (record, text) pairs and tracks the byte offset after the last one.
+
+    Input is read as bytes line by line, so ``position()`` is an exact record
+    boundary that a resumed run can seek to.
+    """
+
+    def __init__(self, path: str, fmt: str, field: str, offset: int = 0):
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.path = path
+        self.fmt = fmt
+        self.field = field
+        self.offset = 0
+        self.skipped = 0
+        self.fieldnames = None
+        if fmt == 'csv':
+            self.fieldnames = next(csv.reader(self._lines()), None)
+            if self.fieldnames and field not in self.fieldnames:
+                raise ValueError(f"CSV input has no '{field}' column")
+        if offset:
+            self.file.seek(offset)
+            self.offset = offset
+
+    def _lines(self) -> Iterator[str]:
+        for line in self.file:
+            self.offset += len(line)
+            yield line.decode('utf-8')
+
+    def position(self) -> int:
+        return self.offset
+
+    def __iter__(self) -> Iterator[Tuple[object, Optional[str]]]:
+        if self.fmt == 'csv':
+            # csv pulls lines only as a row needs them, so the offset stays on row boundaries
+            for row in csv.DictReader(self._lines(), fieldnames=self.fieldnames):
+                yield row, row.get(self.field)
+        elif self.fmt == 'jsonl':
+            for line in self._lines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    self.skipped += 1
+                    print(f"\n⚠️ Skipping malformed JSON ending at byte {self.offset} of {self.path}: {e}",
+                          file=sys.stderr)
+                    continue
+                text = record.get(self.field) if isinstance(record, dict) else None
+                yield record, text if isinstance(text, str) else None
+        else:
+            for line in self._lines():
+                yield None, line.rstrip('\r\n')
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class CorpusWriter:
+    """Writes redacted records in the input's format."""
+
+    def __init__(self, path: str, fmt: str, field: str, fieldnames: Optional[List[str]], append: bool):
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8', newline='' if fmt == 'csv' else None)
+        self.fmt = fmt
+        self.field = field
+        self.csv = None
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(self.file, fieldnames=fieldnames)
+            if not append:
+                self.csv.writeheader()
+
+    def write(self, record: object, text: Optional[str]) -> None:
+        if self.fmt == 'csv':
+            if text is not None:
+                record[self.field] = text
+            self.csv.writerow(record)
+        elif self.fmt == 'jsonl':
+            if text is not None:
+                record[self.field] = text
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            self.file.write(text + '\n')
+
+    def commit(self) -> int:
+        """Flush to disk and return the output size, for the checkpoint."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def load_checkpoint(path: str, input_path: str) -> dict:
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('input') != os.path.abspath(input_path):
+        raise ValueError(f"Checkpoint {path} belongs to {checkpoint.get('input')}")
+    if 'input_offset' not in checkpoint:
+        raise ValueError(f"Checkpoint {path} has no input offset; rerun without --resume")
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    # Write then rename, so a crash never leaves a half-written checkpoint
+    temp = path + '.tmp'
+    with open(temp, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(temp, path)
+
+
+def report_progress(done: int, reader: CorpusReader, started: float, start_position: int) -> None:
+    elapsed = time.perf_counter() - started
+    position = reader.position()
+    rate = done / elapsed if elapsed else 0
+    eta = ''
+    if position > start_position and reader.size:
+        remaining = elapsed * (reader.size - position) / (position - start_position)
+        eta = f", {position / reader.size:.1%} of input, ETA {remaining / 60:.1f} min"
+    print(f"\r{done:,} records, {rate:,.0f} records/s{eta}   ", end='', file=sys.stderr, flush=True)
+
+
+def chunked(reader: CorpusReader, size: int) -> Iterator[Tuple[list, int]]:
+    """Chunks of records with the input offset right after each chunk."""
+    chunk = []
+    for record in reader:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk, reader.position()
+            chunk = []
+    if chunk:
+        yield chunk, reader.position()
+
+
+def redact_corpus(input_path: str, output_path: str, fmt: str = 'auto', field: str = 'content',
+                  tier: str = 'regex', workers: int = 0, chunk_size: int = 500,
+                  checkpoint_path: Optional[str] = None, resume: bool = False, typed: bool = False) -> int:
+    """Redact input_path into output_path; returns the number of records written."""
+    fmt = detect_format(input_path) if fmt == 'auto' else fmt
+    checkpoint_path = checkpoint_path or output_path + '.checkpoint'
+    cpus = os.cpu_count() or 1
+    workers = workers or (cpus if tier == 'regex' else MODEL_WORKERS)
+
+    checkpoint = {'input': os.path.abspath(input_path), 'records': 0, 'input_offset': 0, 'output_bytes': 0}
+    if resume and os.path.exists(checkpoint_path):
+        checkpoint = load_checkpoint(checkpoint_path, input_path)
+        # Drop anything written after the last checkpoint
+        with open(output_path, 'r+b') as f:
+            f.truncate(checkpoint['output_bytes'])
+    skip = checkpoint['records']
+
+    reader = CorpusReader(input_path, fmt, field, offset=checkpoint['input_offset'])
+    start_position = reader.position()
+    writer = CorpusWriter(output_path, fmt, field, reader.fieldnames, append=skip > 0)
+    if skip:
+        print(f"Resuming after {skip:,} records", file=sys.stderr)
+
+    done = skip
+    started = last_report = time.perf_counter()
+    pending = deque()
+
+    def write_next():
+        nonlocal done, last_report
+        chunk, offset, future = pending.popleft()
+        for (record, _), text in zip(chunk, future.result()):
+            writer.write(record, text)
+        done += len(chunk)
+        checkpoint.update(records=done, input_offset=offset, output_bytes=writer.commit())
+        save_checkpoint(checkpoint_path, checkpoint)
+        if time.perf_counter() - last_report >= PROGRESS_INTERVAL or not pending:
+            report_progress(done - skip, reader, started, start_position)
+            last_report = time.perf_counter()
+
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(tier, typed, max(1, cpus // workers))) as pool:
+            for chunk, offset in chunked(reader, chunk_size):
+                pending.append((chunk, offset, pool.submit(_redact_chunk, [text for _, text in chunk])))
+                # Bounded read-ahead; chunks are written strictly in input order
+                while len(pending) >= workers * 2:
+                    write_next()
+            while pending:
+                write_next()
+    finally:
+        writer.close()
+        reader.close()
+    print(file=sys.stderr)
+    if reader.skipped:
+        print(f"⚠️ Skipped {reader.skipped:,} malformed records", file=sys.stderr)
+    # A finished run needs no checkpoint
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return done
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Redact PII from an exported chat corpus.")
+    parser.add_argument('input', help="JSONL, CSV or plain-text file")
+    parser.add_argument('output', help="where to write the redacted corpus")
+    parser.add_argument('--format', choices=('auto', 'jsonl', 'csv', 'text'), default='auto',
+                        help="input format (default: from the file extension)")
+    parser.add_argument('--field', default='content', help="JSONL key or CSV column to redact (default: content)")
+    parser.add_argument('--tier', choices=TIERS, default='regex',
+                        help="regex detector, PII model, or both (regex first)")
+    parser.add_argument('--typed', action='store_true',
+                        help="model tier: typed placeholders such as [EMAIL] instead of [REDACTED]")
+    parser.add_argument('--workers', type=int, default=0,
+                        help=f"worker processes (default: CPU count for regex, {MODEL_WORKERS} for model tiers)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="records per worker task")
+    parser.add_argument('--checkpoint', help="checkpoint file (default: OUTPUT.checkpoint)")
+    parser.add_argument('--resume', action='store_true', help="continue from the checkpoint of an interrupted run")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = redact_corpus(args.input, args.output, args.format, args.field, args.tier, args.workers,
+                          args.chunk_size, args.checkpoint, args.resume, args.typed)
+    print(f"Redacted {count:,} records in {time.perf_counter() - started:.1f}s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,7 +34,25 @@ def main():
         ('simple', 'Direct backend function tests (no server required)'),
         ('audio_file', 'Test any audio file with transcription and PII detection'),
         ('audio_enhanced', 'Audio messaging with PII detection (requires server)'),
-        ('socketio', 'Real-time SocketIO messaging tests (requires server)')
+        ('socketio', 'Real-time SocketIO messaging tests (requires server)'),
+        ('search', 'Server-side message search index (no server required)'),
+        ('event_log', 'Event log snapshot and crash recovery (no server required)'),
+        ('cluster', 'Multi-worker room routing and message queue fan-out (no server required)'),
+        ('broadcast', 'Batched room broadcasts for opted-in clients (no server required)'),
+        ('admission', 'Inference queue bounds and overload rejection (no server required)'),
+        ('lanes', 'Per-room message ordering with cross-room parallelism (no server required)'),
+        ('catchup', 'Missed-message catch-up on reconnect (no server required)'),
+        ('pii_ensemble', 'Merged model and rule-based PII spans (no server required)'),
+        ('entity_redaction', 'Single-pass redaction of PII model results (no model required)'),
+        ('detection_stats', 'Thread-safe PII detection statistics (no server required)'),
+        ('pattern_registry', 'Hot-reloadable PII pattern registry (no server required)'),
+        ('offload', 'Offloaded blocking work and the production entry point (no server required)'),
+        ('pii_redaction', 'Span-based redaction and offset mapping (no server required)'),
+        ('redact_corpus', 'Offline corpus redaction round-trip and resume (no server required)'),
+        ('token_windows', 'Long-text windowing for the PII model (no model required)'),
+        ('keyword_automaton', 'Context keyword matching and window boundaries (no server required)'),
+        ('sweeper', 'Idle room and orphaned upload garbage collection (no server required)'),
+        ('presence', 'User presence, multi-tab connections and eviction (no server required)')
     ]
     
     print("Available tests:")
@@ -10,10 +10,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'util'))
 # Import the function directly
 sys.path.append('util')
 import importlib.util
-spec = importlib.util.spec_from_file_location("t2s_model", "util/t2s-model.py")
-t2s_model = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(t2s_model)
-convert_spoken_numbers_to_digits = t2s_model.convert_spoken_numbers_to_digits
+spec = importlib.util.spec_from_file_location("number_conversion", "util/number_conversion.py")
+number_conversion = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(number_conversion)
+convert_spoken_numbers_to_digits = number_conversion.convert_spoken_numbers_to_digits
 
 def test_number_conversion():
     """Test various number conversion scenarios"""
@@ -0,0 +1,200 @@
+import sys
+import os
+import json
+import threading
+import time
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for inference admission control (no HTTP server required)
+def test_gate_bounds():
+    """Test that a gate runs, queues and then rejects in order"""
+    print("🚦 Admission Gate Testing")
+    print("=" * 40)
+
+    from inference import AdmissionGate, Overloaded
+
+    gate = AdmissionGate("test", concurrency=1, max_queue=1)
+    release = threading.Event()
+    order = []
+
+    def hold(label):
+        with gate.admit():
+            order.append(label)
+            release.wait()
+
+    running = threading.Thread(target=hold, args=("first",))
+    running.start()
+    time.sleep(0.05)
+    queued = threading.Thread(target=hold, args=("second",))
+    queued.start()
+    time.sleep(0.05)
+
+    try:
+        with gate.admit():
+            pass
+        rejected = False
+    except Overloaded as e:
+        rejected = True
+        print(f"   Rejected with Retry-After {e.retry_after}s, stats {gate.stats()}")
+    assert rejected
+    assert gate.stats()["running"] == 1 and gate.stats()["queued"] == 1
+
+    release.set()
+    running.join()
+    queued.join()
+    assert order == ["first", "second"]
+    stats = gate.stats()
+    assert stats["admitted"] == 2 and stats["rejected"] == 1 and stats["running"] == 0
+    print("   ✅ PASS")
+    return True
+
+def test_overloaded_endpoint():
+    """Test that a full PII queue fails fast with 503 and Retry-After"""
+    print("\n⛔ Overloaded Endpoint Testing")
+    print("=" * 40)
+
+    import server
+    from inference import AdmissionGate
+
+    gate = server.inference_gates["pii"] = AdmissionGate("pii", concurrency=1, max_queue=0)
+    client = server.app.test_client()
+    with gate.admit():
+        start = time.perf_counter()
+        response = client.post('/detect_pii', json={"text": "call me at 555-123-4567"})
+        took = time.perf_counter() - start
+    print(f"   Status {response.status_code}, Retry-After {response.headers.get('Retry-After')}, {took * 1000:.1f}ms")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.get_json()["model"] == "pii"
+    assert client.get('/metrics').get_json()["inference"]["pii"]["rejected"] == 1
+    print("   ✅ PASS")
+    return True
+
+def test_bulk_endpoint_admission():
+    """Test bulk request validation and that a full queue rejects before streaming"""
+    print("\n📦 Bulk Endpoint Admission Testing")
+    print("=" * 40)
+
+    import server
+    from inference import AdmissionGate
+
+    client = server.app.test_client()
+    assert client.post('/api/process_text/batch', json={"text": "one"}).status_code == 400
+
+    # Items without text are answered in place without touching the model
+    response = client.post('/api/process_text/batch', json=[{"id": "a"}, 42])
+    lines = [line for line in response.get_data(as_text=True).splitlines() if line]
+    print(f"   Invalid items: {lines}")
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line)["index"] for line in lines] == [0, 1]
+    assert json.loads(lines[0])["id"] == "a" and "error" in json.loads(lines[0])
+
+    gate = server.inference_gates["pii"] = AdmissionGate("pii", concurrency=1, max_queue=0)
+    with gate.admit():
+        response = client.post('/api/process_text/batch', data='"call me"\n"later"\n',
+                               content_type='application/x-ndjson')
+    print(f"   Overloaded bulk request: {response.status_code}, Retry-After {response.headers.get('Retry-After')}")
+    assert response.status_code == 503 and response.headers.get("Retry-After")
+    server.inference_gates["pii"] = AdmissionGate("pii", concurrency=1, max_queue=4)
+
+    # A model error fails only its own window's items, and the stream carries on
+    batch_model, window_size = server.run_pii_model_batch, server.PII_BULK_WINDOW
+    def flaky_model(texts):
+        if "boom" in texts:
+            raise RuntimeError("model crashed")
+        return [([], text) for text in texts]
+    server.run_pii_model_batch, server.PII_BULK_WINDOW = flaky_model, 2
+    try:
+        # Later windows run while the body streams, so read it before restoring the model
+        response = client.post('/api/process_text/batch', json=["a", "b", "boom", "c", "d", "e"])
+        body = response.get_data(as_text=True)
+    finally:
+        server.run_pii_model_batch, server.PII_BULK_WINDOW = batch_model, window_size
+    lines = [json.loads(line) for line in body.splitlines() if line]
+    print(f"   Failed window: {[line.get('error') for line in lines]}")
+    assert response.status_code == 200 and [line["index"] for line in lines] == list(range(6))
+    assert [("error" in line) for line in lines] == [False, False, True, True, False, False]
+    assert lines[4]["redactedContent"] == "d"
+    print("   ✅ PASS")
+    return True
+
+def test_priority_scheduling():
+    """Test priority order, displacement, reserved slots, deadlines and cancellation"""
+    print("\n🏁 Priority Scheduling Testing")
+    print("=" * 40)
+
+    from inference import AdmissionGate, Overloaded, DeadlineExceeded, Cancelled, INTERACTIVE, VOICE, BULK
+
+    gate = AdmissionGate("test", concurrency=1, max_queue=2)
+    release = threading.Event()
+    order = []
+    errors = {}
+
+    def request(label, priority, **kwargs):
+        try:
+            with gate.admit(priority, **kwargs):
+                order.append(label)
+                release.wait()
+        except Overloaded as e:
+            errors[label] = type(e).__name__
+
+    def start(label, priority, **kwargs):
+        thread = threading.Thread(target=request, args=(label, priority), kwargs=kwargs)
+        thread.start()
+        time.sleep(0.05)
+        return thread
+
+    threads = [start("running", BULK), start("bulk", BULK), start("voice", VOICE)]
+    # The queue is full: chat text displaces the newest, least urgent waiter
+    threads.append(start("text", INTERACTIVE))
+    assert errors == {"bulk": "Overloaded"}
+    release.set()
+    for thread in threads:
+        thread.join()
+    print(f"   Served in order {order}, rejected {errors}")
+    assert order == ["running", "text", "voice"]
+
+    # Deadlines and cancellation only apply while queued
+    release.clear()
+    order.clear()
+    errors.clear()
+    gone = threading.Event()
+    threads = [
+        start("running", INTERACTIVE),
+        start("late", VOICE, deadline=time.monotonic() + 0.1),
+        start("abandoned", INTERACTIVE, cancelled=gone.is_set)
+    ]
+    gone.set()
+    time.sleep(0.4)
+    release.set()
+    for thread in threads:
+        thread.join()
+    print(f"   Gave up: {errors}")
+    assert errors == {"late": "DeadlineExceeded", "abandoned": "Cancelled"}
+    assert gate.stats()["expired"] == 1 and gate.stats()["cancelled"] == 1
+    assert gate.stats()["running"] == 0 and gate.stats()["queued"] == 0
+
+    # A reserved slot is only ever used by chat text
+    reserved = AdmissionGate("reserved", concurrency=2, max_queue=4, reserved=1)
+    release.clear()
+    gate = reserved
+    threads = [start("bulk1", BULK), start("bulk2", BULK)]
+    assert reserved.stats()["running"] == 1 and reserved.stats()["queued"] == 1
+    with reserved.admit(INTERACTIVE):
+        assert reserved.stats()["running"] == 2
+    release.set()
+    for thread in threads:
+        thread.join()
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_gate_bounds(), test_overloaded_endpoint(), test_bulk_endpoint_admission(),
+               test_priority_scheduling()]
+    print(f"\n📊 {sum(results)}/{len(results)} admission tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
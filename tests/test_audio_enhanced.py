@@ -147,7 +147,6 @@ def test_transcription_details():
         data = response.json()
         print(f"✅ Transcription details retrieved!")
         print(f"   Message ID: {data['messageId']}")
-        print(f"   Original: {data['transcription'].get('original', 'N/A')}")
         print(f"   Redacted: {data['transcription'].get('redacted', 'N/A')}")
         print(f"   PII Fields: {data['piiDetection'].get('detectedFields', [])}")
         return data
@@ -0,0 +1,153 @@
+import sys
+import os
+import json
+import time
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for broadcast coalescing (no HTTP server required)
+def test_batcher_ordering():
+    """Test that buffered events flush in order, on size and on demand"""
+    print("📦 Broadcast Batcher Testing")
+    print("=" * 40)
+
+    from broadcast import BroadcastBatcher
+
+    sent = []
+    def emit_batch(room, events):
+        # Emitting never blocks other broadcasts from buffering
+        assert not batcher.lock.locked()
+        sent.append((room, events))
+    batcher = BroadcastBatcher(emit_batch, interval=1, max_batch=3)
+    batcher.subscribe("ROOM01")
+    batcher.subscribe("ROOM02")
+    batcher.add("ROOM03", "new_message", {"n": 0})
+    for i in range(4):
+        batcher.add("ROOM01", "new_message", {"n": i})
+    batcher.add("ROOM02", "user_joined", {"n": 0})
+
+    # The size cap flushed the first three immediately
+    assert sent == [("ROOM01", [{"event": "new_message", "data": {"n": i}} for i in range(3)])]
+    batcher.flush_all()
+    assert [room for room, _ in sent] == ["ROOM01", "ROOM01", "ROOM02"]
+    assert sent[1][1] == [{"event": "new_message", "data": {"n": 3}}]
+    assert batcher.stats == {"events": 5, "batches": 3, "sizeFlushes": 1}
+
+    # Rooms without batched subscribers buffer nothing
+    batcher.unsubscribe("ROOM02")
+    batcher.add("ROOM02", "user_left", {"n": 1})
+    batcher.flush_all()
+    assert len(sent) == 3 and not batcher.buffers and batcher.subscribers == {"ROOM01": 1}
+    print("   ✅ PASS")
+    return True
+
+def test_batched_clients():
+    """Test that opted-in clients get events_batch while others get single events"""
+    print("\n📡 Batched Socket.IO Delivery Testing")
+    print("=" * 40)
+
+    import server
+
+    room = server.create_room("BATCH1")["id"]
+    clients = {}
+    for name, auth in (("plain", None), ("batched", {"batch": True})):
+        http = server.app.test_client()
+        http.post('/session', json={"name": name, "room": room})
+        clients[name] = server.socketio.test_client(server.app, flask_test_client=http, auth=auth)
+    server.batcher.flush_all()
+    for client in clients.values():
+        client.get_received()
+
+    for i in range(5):
+        server.broadcast('new_message', {"n": i}, room)
+    server.batcher.flush_all()
+
+    plain = clients["plain"].get_received()
+    batched = clients["batched"].get_received()
+    print(f"   Plain client got {len(plain)} frames, batched client got {len(batched)}")
+    assert [packet["args"][0]["n"] for packet in plain] == list(range(5))
+    assert [packet["name"] for packet in batched] == ["events_batch"]
+    assert [event["data"]["n"] for event in batched[0]["args"][0]] == list(range(5))
+
+    # Once the batched client leaves, the room stops buffering
+    events = server.batcher.stats["events"]
+    clients["batched"].disconnect()
+    server.broadcast('new_message', {"n": 5}, room)
+    assert server.batcher.stats["events"] == events and room not in server.batcher.subscribers
+    clients["plain"].disconnect()
+
+    # Batched clients on other workers are counted by the owner through /cluster
+    room = server.create_room("BATCH2")["id"]
+    http = server.app.test_client()
+    for action in ("connect", "disconnect"):
+        body = json.dumps({"room": room, "user_id": "u2", "name": "remote", "sid": "s2", "batch": True}).encode()
+        stamp = str(int(time.time() * 1000))
+        headers = {"X-Cluster-Timestamp": stamp,
+                   "X-Cluster-Signature": server.router.sign("POST", f"/cluster/{action}", body, stamp)}
+        response = http.post(f"/cluster/{action}", data=body, content_type="application/json", headers=headers)
+        assert response.status_code == 200
+        # The same signed request is not accepted twice
+        replayed = http.post(f"/cluster/{action}", data=body, content_type="application/json", headers=headers)
+        assert replayed.status_code == 403
+        if action == "connect":
+            assert server.batcher.subscribers[room] == 1
+    assert room not in server.batcher.subscribers
+    print("   ✅ PASS")
+    return True
+
+def test_wire_payload():
+    """Test that broadcasts carry the slim schema and details come on demand"""
+    print("\n✂️ Wire Payload Testing")
+    print("=" * 40)
+
+    import server
+
+    room = server.create_room("WIRE01")["id"]
+    http = server.app.test_client()
+    http.post('/session', json={"name": "alice", "room": room})
+    client = server.socketio.test_client(server.app, flask_test_client=http)
+    client.get_received()
+    events = server.batcher.stats["events"]
+
+    message = {
+        "id": "msg_wire", "chatId": room, "senderId": "alice", "type": "voice",
+        "content": "call me at [PHONE]", "timestamp": "2025-08-30T10:30:15", "timestampMs": 1,
+        "duration": 2.5, "audioUrl": f"/voice/{room}/a.wav", "audioPath": "/srv/uploads/a.wav",
+        "transcription": {"original": "call me at 555-123-4567", "redacted": "call me at [PHONE]", "hasRedactions": True},
+        "piiDetection": {"hasRedactions": True, "detectedFields": ["PHONE"], "detectionDetails": [
+            {"type": "PHONE", "original": "555-123-4567", "confidence": 0.97, "position": [11, 23]}
+        ]}
+    }
+    server.append_message(room, message)
+    server.broadcast('new_message', server.to_wire_message(message), room)
+
+    wire = client.get_received()[0]["args"][0]
+    print(f"   Wire fields: {sorted(wire)}")
+    assert "555-123-4567" not in str(wire) and "audioPath" not in wire and "transcription" not in wire
+    assert wire["isRedacted"] and wire["redactedFields"] == ["PHONE"]
+    assert server.batcher.stats["events"] == events, "no client opted into batching"
+
+    details = http.get(f"/messages/{room}/msg_wire").get_json()
+    assert details["transcription"]["redacted"] == "call me at [PHONE]"
+    assert details["piiDetection"]["detectionDetails"] == [{"type": "PHONE", "confidence": 0.97, "position": [11, 23]}]
+    assert "555-123-4567" not in str(details)
+    assert http.get(f"/messages/{room}/missing").status_code == 404
+
+    # The transcription endpoint filters the same way
+    transcription = http.get(f"/voice/{room}/msg_wire/transcription").get_json()
+    assert transcription["transcription"] == details["transcription"]
+    assert transcription["piiDetection"] == details["piiDetection"]
+    assert "555-123-4567" not in str(transcription)
+
+    client.disconnect()
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_batcher_ordering(), test_batched_clients(), test_wire_payload()]
+    print(f"\n📊 {sum(results)}/{len(results)} broadcast tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
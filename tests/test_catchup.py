@@ -0,0 +1,110 @@
+import sys
+import os
+import time
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for reconnect catch-up (no HTTP server required)
+def make_message(room_code, index):
+    return {
+        "id": f"msg_{index}",
+        "chatId": room_code,
+        "senderId": "tester",
+        "content": f"message number {index}",
+        "type": "text",
+        "timestamp": "2025-08-30T10:30:15",
+        "timestampMs": 1000 + index
+    }
+
+def connect(server, room, name, auth):
+    http = server.app.test_client()
+    http.post('/session', json={"name": name, "room": room})
+    client = server.socketio.test_client(server.app, flask_test_client=http, auth=auth)
+    # The catch-up frame is sent from the room's lane
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        frames = [packet for packet in client.get_received() if packet["name"] == "missed_messages"]
+        if frames:
+            return client, frames[0]["args"][0]
+        time.sleep(0.01)
+    return client, None
+
+def test_reconnect_catchup():
+    """Test that reconnecting clients receive only what they missed"""
+    print("📬 Reconnect Catch-up Testing")
+    print("=" * 40)
+
+    import server
+
+    server.RECONNECT_CATCHUP_LIMIT = 50
+    room = server.create_room("CATCH1")["id"]
+    for i in range(120):
+        server.append_message(room, make_message(room, i))
+
+    # Cursor by message id
+    client, frame = connect(server, room, "alice", {"lastSeenMessageId": "msg_109"})
+    print(f"   By id: {len(frame['messages'])} messages, totalMissed {frame['totalMissed']}")
+    assert [m["id"] for m in frame["messages"]] == [f"msg_{i}" for i in range(110, 120)]
+    assert frame["totalMissed"] == 10 and not frame["hasMore"]
+    assert "transcription" not in frame["messages"][0]
+
+    # Cursor by timestamp, capped and paged through /messages
+    other, frame = connect(server, room, "bob", {"lastSeenTimestampMs": 1000 + 9})
+    print(f"   By timestamp: {len(frame['messages'])} messages, totalMissed {frame['totalMissed']}")
+    assert frame["messages"][0]["id"] == "msg_10" and len(frame["messages"]) == 50
+    assert frame["totalMissed"] == 110 and frame["hasMore"]
+    http = server.app.test_client()
+    page = http.get(f"/messages/{room}?after={frame['messages'][-1]['id']}&limit=50").get_json()
+    assert [m["id"] for m in page] == [f"msg_{i}" for i in range(60, 110)]
+    assert http.get(f"/messages/{room}?after=unknown").status_code == 404
+
+    # No cursor means no catch-up frame
+    http.post('/session', json={"name": "carol", "room": room})
+    plain = server.socketio.test_client(server.app, flask_test_client=http)
+    time.sleep(0.1)
+    received = [packet["name"] for packet in plain.get_received()]
+    assert "missed_messages" not in received
+
+    for c in (client, other, plain):
+        c.disconnect()
+    print("   ✅ PASS")
+    return True
+
+def test_stamped_in_storage_order():
+    """Test that messages published out of creation order are not skipped"""
+    print("\n🕒 Storage-order Timestamps Testing")
+    print("=" * 40)
+
+    from datetime import datetime, timedelta
+    import server
+
+    room = server.create_room("CATCH2")["id"]
+    # The last stored message is stamped ahead of the clock, e.g. after a clock step back
+    ahead = datetime.now() + timedelta(seconds=5)
+    early = make_message(room, 0)
+    early.update(timestamp=ahead.isoformat(), timestampMs=int(ahead.timestamp() * 1000))
+    server.append_message(room, early)
+
+    # Processed first, published second: the stamp follows the publish
+    first, second = make_message(room, 1), make_message(room, 2)
+    for message in (first, second):
+        del message["timestamp"], message["timestampMs"]
+    server.publish_message(room, second)
+    server.publish_message(room, first)
+
+    stamps = [m["timestampMs"] for m in server.room_messages(room)]
+    print(f"   Stored stamps: {stamps}")
+    assert stamps == sorted(stamps)
+    position = server.messages_after(room, timestamp_ms=early["timestampMs"] - 1)
+    assert [m["id"] for m in server.room_messages(room)[position:]] == ["msg_0", "msg_2", "msg_1"]
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_reconnect_catchup(), test_stamped_in_storage_order()]
+    print(f"\n📊 {sum(results)}/{len(results)} catch-up tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,174 @@
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to path so we can import the cluster helpers
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for multi-worker routing and fan-out (no HTTP server required)
+def test_room_ownership():
+    """Test that every room has exactly one owner and ownership is stable"""
+    print("🗺️ Room Ownership Testing")
+    print("=" * 40)
+
+    from cluster import RoomRouter
+
+    urls = ["http://w0:5000", "http://w1:5000", "http://w2:5000"]
+    routers = [RoomRouter(urls, i, "secret") for i in range(len(urls))]
+    rooms = [f"ROOM{i:02d}" for i in range(300)]
+
+    owned = [sum(router.is_local(room) for room in rooms) for router in routers]
+    print(f"   Rooms per worker: {owned}")
+    assert sum(owned) == len(rooms)
+    assert all(count > 50 for count in owned)
+
+    # Removing a worker only moves the rooms it owned
+    shrunk = RoomRouter(urls[:2], 0, "secret")
+    moved = [room for room in rooms if shrunk.owner_url(room) != routers[0].owner_url(room)]
+    assert all(routers[0].owner(room) == 2 for room in moved)
+
+    body = b'{"room": "ROOM01"}'
+    stamp = str(int(time.time() * 1000))
+    signature = routers[0].sign("POST", "/cluster/message", body, stamp)
+    assert not RoomRouter(urls, 0, "other").verify("POST", "/cluster/message", body, stamp, signature)
+    assert not routers[1].verify("POST", "/cluster/connect", body, stamp, signature)
+    assert routers[1].verify("POST", "/cluster/message", body, stamp, signature)
+    # A captured request cannot be replayed, neither as-is nor later with a fresh signature
+    assert not routers[1].verify("POST", "/cluster/message", body, stamp, signature)
+    stale = str(int((time.time() - 60) * 1000))
+    assert not routers[1].verify("POST", "/cluster/message", body, stale,
+                                 routers[0].sign("POST", "/cluster/message", body, stale))
+    assert RoomRouter([], 0, "secret").is_local("ANY")
+    print("   ✅ PASS")
+    return True
+
+def test_loopback_fanout():
+    """Test that a message published by one worker reaches every subscriber"""
+    print("\n📡 Message Queue Fan-out Testing")
+    print("=" * 40)
+
+    from cluster import LoopbackManager, create_client_manager
+
+    assert create_client_manager(None) == {}
+    assert create_client_manager("redis://localhost:6379/0")["message_queue"] == "redis://localhost:6379/0"
+
+    workers = [LoopbackManager(channel="test-fanout") for _ in range(2)]
+    publisher = LoopbackManager(channel="test-fanout", write_only=True)
+    publisher._publish({"method": "emit", "event": "new_message", "data": {"content": "hello"}, "room": "ROOM01"})
+
+    received = [next(worker._listen()) for worker in workers]
+    print(f"   Workers received: {received}")
+    assert all('"new_message"' in message for message in received)
+    assert publisher.inbox.empty()
+    print("   ✅ PASS")
+    return True
+
+def test_unreachable_owner():
+    """Test that socket events for a room whose owner is down fail with an error, not an exception"""
+    print("\n🔌 Unreachable Owner Testing")
+    print("=" * 40)
+
+    import server
+    from cluster import RoomRouter
+
+    # Worker 0 listens nowhere; this process plays worker 1
+    urls = ["http://127.0.0.1:9", "http://127.0.0.1:10"]
+    clustered = RoomRouter(urls, 1, "secret", timeout=1)
+    remote = next(f"DOWN{i:02d}" for i in range(100) if clustered.owner(f"DOWN{i:02d}") == 0)
+    local_router = server.router
+
+    # Connecting to a room owned by the unreachable worker is refused
+    server.router = clustered
+    http = server.app.test_client()
+    with http.session_transaction() as sess:
+        sess.update(name="alice", room=remote, user_id="u1")
+    refused = server.socketio.test_client(server.app, flask_test_client=http)
+    assert not refused.is_connected()
+
+    # A message sent while the owner is down comes back as message_error
+    server.router = local_router
+    server.create_room(remote)
+    client = server.socketio.test_client(server.app, flask_test_client=http)
+    assert client.is_connected()
+    client.get_received()
+    server.router = clustered
+    client.emit('message', {"message": "hello"})
+    errors = [packet for packet in client.get_received() if packet["name"] == "message_error"]
+    print(f"   Errors: {[packet['args'][0] for packet in errors]}")
+    assert len(errors) == 1 and errors[0]["args"][0]["retryAfter"] == 1
+    client.disconnect()
+    server.router = local_router
+    print("   ✅ PASS")
+    return True
+
+class EchoOwner(BaseHTTPRequestHandler):
+    """Stand-in owning worker that echoes what it was sent"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        reply = json.dumps({"method": self.command, "path": self.path, "body": body.decode(),
+                            "cookie": self.headers.get('Cookie'),
+                            "forwardedFor": self.headers.get('X-Forwarded-For')}).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.send_header('Set-Cookie', 'session=owner; Path=/')
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+def test_proxy_to_owner():
+    """Test that HTTP requests for remote rooms are proxied, not redirected"""
+    print("\n🔀 Owner Proxy Testing")
+    print("=" * 40)
+
+    import server
+    from cluster import RoomRouter
+
+    owner = ThreadingHTTPServer(("127.0.0.1", 0), EchoOwner)
+    threading.Thread(target=owner.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{owner.server_port}", "http://127.0.0.1:10"]
+    clustered = RoomRouter(urls, 1, "secret", timeout=1, proxy_timeout=5)
+    remote = next(f"PROXY{i:02d}" for i in range(100) if clustered.owner(f"PROXY{i:02d}") == 0)
+    local_router = server.router
+    server.router = clustered
+    try:
+        http = server.app.test_client()
+        http.set_cookie("session", "client")
+        response = http.post("/session?x=1", json={"name": "alice", "room": remote})
+        echoed = response.get_json()
+        print(f"   Owner saw: {echoed['method']} {echoed['path']}, status {response.status_code}")
+        assert response.status_code == 201 and echoed["path"] == "/session?x=1"
+        assert json.loads(echoed["body"]) == {"name": "alice", "room": remote}
+        assert echoed["cookie"] == "session=client" and echoed["forwardedFor"]
+        assert response.headers["Set-Cookie"].startswith("session=owner")
+        # The router never keeps one client's cookies for the next
+        assert not list(clustered.proxy_session.cookies)
+
+        server.CLUSTER_REDIRECTS = True
+        response = http.post("/session", json={"name": "alice", "room": remote})
+        assert response.status_code == 307 and response.headers["Location"].startswith(urls[0])
+        server.CLUSTER_REDIRECTS = False
+
+        owner.shutdown()
+        owner.server_close()
+        response = http.post("/session", json={"name": "alice", "room": remote})
+        assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    finally:
+        server.CLUSTER_REDIRECTS = False
+        server.router = local_router
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_room_ownership(), test_loopback_fanout(), test_unreachable_owner(), test_proxy_to_owner()]
+    print(f"\n📊 {sum(results)}/{len(results)} cluster tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
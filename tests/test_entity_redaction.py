@@ -0,0 +1,88 @@
+import sys
+import os
+
+# Add the util directory to path; redaction has no model dependencies
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'util'))
+
+# Direct tests for redacting PII model results (no model required)
+def entity(group, start, end, score=0.9):
+    return {"entity_group": group, "start": start, "end": end, "score": score}
+
+def test_placeholders():
+    """Test that entities become one placeholder each, typed on request"""
+    print("🏷️ Placeholder Testing")
+    print("=" * 40)
+
+    from entity_redaction import redact_entities
+
+    text = "mail jane@example.com or call 555-123-4567 today"
+    results = [entity("TELEPHONENUM", 30, 42), entity("EMAIL", 5, 21)]
+    redacted, offset_map = redact_entities(text, results)
+    print(f"   Plain: {redacted}")
+    assert redacted == "mail [REDACTED] or call [REDACTED] today"
+    assert offset_map == [(5, 21, 5, 15), (30, 42, 24, 34)]
+
+    redacted, offset_map = redact_entities(text, results, typed=True)
+    print(f"   Typed: {redacted}")
+    assert redacted == "mail [EMAIL] or call [PHONE] today"
+    assert offset_map == [(5, 21, 5, 12), (30, 42, 21, 28)]
+    assert redact_entities("id A1", [entity("IDCARDNUM", 3, 5)], typed=True)[0] == "id [IDCARDNUM]"
+    print("   ✅ PASS")
+    return True
+
+def test_adjacent_and_overlapping():
+    """Test that touching and overlapping entities collapse into one placeholder"""
+    print("\n🧩 Adjacent/Overlapping Entity Testing")
+    print("=" * 40)
+
+    from entity_redaction import redact_entities
+
+    # Subword pieces of one name touch each other
+    text = "I am HarryPotter."
+    pieces = [entity("GIVENNAME", 5, 10), entity("GIVENNAME", 10, 16)]
+    assert redact_entities(text, pieces) == ("I am [REDACTED].", [(5, 16, 5, 15)])
+    assert redact_entities(text, pieces, typed=True)[0] == "I am [NAME]."
+
+    # Touching entities of different kinds keep separate typed placeholders
+    touching = [entity("GIVENNAME", 5, 10), entity("TELEPHONENUM", 10, 16)]
+    assert redact_entities(text, touching)[0] == "I am [REDACTED]."
+    assert redact_entities(text, touching, typed=True)[0] == "I am [NAME][PHONE]."
+
+    # Overlaps take the type of the most confident entity, in any input order
+    overlapping = [entity("TELEPHONENUM", 8, 16, 0.95), entity("SOCIALNUM", 5, 12, 0.7), entity("EMAIL", 5, 7, 0.5)]
+    redacted, offset_map = redact_entities(text, overlapping, typed=True)
+    print(f"   Overlapping: {redacted} {offset_map}")
+    assert (redacted, offset_map) == ("I am [PHONE].", [(5, 16, 5, 12)])
+    print("   ✅ PASS")
+    return True
+
+def test_dense_document():
+    """Test that an entity on every word is redacted in text order with exact offsets"""
+    print("\n📄 Dense Document Testing")
+    print("=" * 40)
+
+    from entity_redaction import redact_entities
+
+    words = [f"w{i}" for i in range(20000)]
+    text = " ".join(words)
+    results, position = [], 0
+    for word in words:
+        results.append(entity("USERNAME", position, position + len(word)))
+        position += len(word) + 1
+    redacted, offset_map = redact_entities(text, list(reversed(results)))
+    assert redacted == " ".join(["[REDACTED]"] * len(words))
+    assert len(offset_map) == len(words)
+    for start, end, redacted_start, redacted_end in offset_map:
+        assert redacted[redacted_start:redacted_end] == "[REDACTED]"
+    print(f"   {len(words)} entities redacted")
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    tests = [test_placeholders, test_adjacent_and_overlapping, test_dense_document]
+    passed = sum(1 for test in tests if test())
+    print(f"\n📊 {passed}/{len(tests)} entity redaction tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,89 @@
+import sys
+import os
+import random
+from types import SimpleNamespace
+
+# Add the PII scripts directory to path so we can import the detectors
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'scripts'))
+
+# Direct tests for context keyword matching (no server required)
+def occurrences(keywords, text):
+    """Brute-force reference for KeywordAutomaton.find_all"""
+    return sorted((i, keyword) for keyword in set(keywords) if keyword
+                  for i in range(len(text) - len(keyword) + 1) if text.startswith(keyword, i))
+
+def test_overlapping_keywords():
+    """Test keywords that overlap, nest and share prefixes or suffixes"""
+    print("🔤 Overlapping Keyword Testing")
+    print("=" * 40)
+
+    from keyword_automaton import KeywordAutomaton
+
+    automaton = KeywordAutomaton(["he", "she", "his", "hers"])
+    hits = sorted(automaton.find_all("ushers"))
+    print(f"   'ushers': {hits}")
+    assert hits == [(1, "she"), (2, "he"), (2, "hers")]
+
+    keywords = ["phone", "telephone", "tel", "cell", "cellphone", ""]
+    text = "my cellphone and telephone"
+    assert sorted(KeywordAutomaton(keywords).find_all(text)) == occurrences(keywords, text)
+    assert KeywordAutomaton(["aa"]).find_all("aaaa") == [(0, "aa"), (1, "aa"), (2, "aa")]
+    assert KeywordAutomaton([]).find_all("anything") == []
+
+    rng = random.Random(43)
+    for _ in range(2000):
+        keywords = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+        assert sorted(KeywordAutomaton(keywords).find_all(text)) == occurrences(keywords, text), (keywords, text)
+    print("   2000 random cases match")
+    print("   ✅ PASS")
+    return True
+
+def test_context_window_boundary():
+    """Test context keywords exactly at and just past the window edge"""
+    print("\n📐 Context Window Boundary Testing")
+    print("=" * 40)
+
+    from enhanced_pii_detection import EnhancedPIIDetector
+    from keyword_automaton import KeywordAutomaton
+
+    patterns = SimpleNamespace(context_automaton=KeywordAutomaton(["phone", "call", "example"]))
+    # Tokens: phone(0) a(1) b(2) 555-1234(3) c(4) d(5) call(6)
+    text = "Phone a b 555-1234 c d CALL"
+    start = text.index("555")
+    end = start + len("555-1234")
+
+    detector = EnhancedPIIDetector(context_window=2)
+    context = detector._index_context(text, patterns)
+    assert detector._context_near(context, start, end) == frozenset()
+
+    detector.context_window = 3
+    assert detector._context_near(context, start, end) == frozenset({"phone", "call"})
+
+    # A keyword inside a longer token counts at that token's position
+    text = "telephone: a b 555-1234"
+    context = detector._index_context(text, patterns)
+    start = text.index("555")
+    detector.context_window = 2
+    assert detector._context_near(context, start, start + 8) == frozenset()
+    detector.context_window = 3
+    assert detector._context_near(context, start, start + 8) == frozenset({"phone"})
+
+    # A match spanning several tokens measures the window from both ends
+    text = "call a 555 123 4567 b example"
+    context = detector._index_context(text, patterns)
+    start, end = text.index("555"), text.index("4567") + 4
+    detector.context_window = 2
+    assert detector._context_near(context, start, end) == frozenset({"call", "example"})
+    detector.context_window = 1
+    assert detector._context_near(context, start, end) == frozenset()
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_overlapping_keywords(), test_context_window_boundary()]
+    print(f"\n📊 {sum(results)}/{len(results)} keyword automaton tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,235 @@
+import sys
+import os
+import time
+import threading
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for per-room ordered processing (no HTTP server required)
+def test_room_order():
+    """Test that tasks keep send order within a room despite uneven durations"""
+    print("🛣️ Room Lane Ordering Testing")
+    print("=" * 40)
+
+    from lanes import RoomLanes
+
+    lanes = RoomLanes(workers=8)
+    committed = {"ROOM01": [], "ROOM02": []}
+
+    def process(room_code, index, duration):
+        time.sleep(duration)
+        committed[room_code].append(index)
+
+    futures = []
+    for i in range(20):
+        for room_code in committed:
+            # Earlier messages are slower, so unordered processing would reverse them
+            futures.append(lanes.submit(room_code, process, room_code, i, (20 - i) * 0.002))
+    for future in futures:
+        future.result()
+
+    print(f"   Committed order: {committed['ROOM01'][:8]}...")
+    assert all(order == list(range(20)) for order in committed.values())
+    stats = lanes.stats()
+    assert stats["completed"] == 40 and stats["activeRooms"] == 0 and stats["queued"] == 0
+    print("   ✅ PASS")
+    return True
+
+def test_cross_room_parallelism():
+    """Test that a slow task in one room does not block another room"""
+    print("\n🔀 Cross-Room Parallelism Testing")
+    print("=" * 40)
+
+    from lanes import RoomLanes
+
+    lanes = RoomLanes(workers=2)
+    release = threading.Event()
+    slow = lanes.submit("VOICE1", release.wait, 5)
+    queued_behind = lanes.submit("VOICE1", lambda: "second")
+
+    start = time.perf_counter()
+    assert lanes.run("TEXT01", lambda: "fast") == "fast"
+    took = time.perf_counter() - start
+    print(f"   Other room's task finished in {took * 1000:.1f}ms while VOICE1 was busy")
+    assert took < 1 and not queued_behind.done()
+    assert lanes.stats()["busy"] == 1 and lanes.stats()["queued"] == 1
+
+    release.set()
+    assert slow.result() and queued_behind.result() == "second"
+    print(f"   Lane stats: {lanes.stats()}")
+    print("   ✅ PASS")
+    return True
+
+def test_backlog_limit():
+    """Test that a room's backlog is capped and other rooms stay unaffected"""
+    print("\n🚧 Room Backlog Limit Testing")
+    print("=" * 40)
+
+    from lanes import RoomLanes, Backlogged
+    from inference import Overloaded
+
+    lanes = RoomLanes(workers=2, backlog_limit=3)
+    release = threading.Event()
+    running = lanes.submit("BUSY01", release.wait, 5)
+    waiting = [lanes.submit("BUSY01", lambda i=i: i) for i in range(3)]
+    try:
+        lanes.submit("BUSY01", lambda: "shed")
+        assert False, "a full backlog must reject"
+    except Backlogged as e:
+        print(f"   Rejected: {e}")
+        assert isinstance(e, Overloaded) and e.retry_after == 1
+    assert lanes.run("QUIET1", lambda: "ok") == "ok"
+
+    release.set()
+    assert running.result() and [future.result() for future in waiting] == [0, 1, 2]
+    assert lanes.stats()["rejected"] == 1
+    print("   ✅ PASS")
+    return True
+
+def test_busy_room_upload():
+    """Test that uploads and messages to a room with a full backlog are rejected"""
+    print("\n📼 Busy Room Upload Testing")
+    print("=" * 40)
+
+    import io
+    import server
+
+    room = server.create_room("LANE01")["id"]
+    release = threading.Event()
+    server.lanes.submit(room, release.wait, 5)
+    for _ in range(server.lanes.backlog_limit):
+        server.lanes.submit(room, lambda: None)
+
+    http = server.app.test_client()
+    response = http.post(f"/voice/{room}", data={"audio": (io.BytesIO(b"RIFF"), "clip.wav")},
+                         content_type="multipart/form-data")
+    print(f"   Upload status: {response.status_code}, Retry-After {response.headers.get('Retry-After')}")
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    room_dir = os.path.join(server.app.config['UPLOAD_FOLDER'], room)
+    assert not os.listdir(room_dir)
+
+    # Socket messages to the busy room come back to the sender as message_error
+    http.post('/session', json={"name": "alice", "room": room})
+    client = server.socketio.test_client(server.app, flask_test_client=http)
+    client.get_received()
+    client.emit('message', {"message": "hello"})
+    errors = [packet["args"][0] for packet in client.get_received() if packet["name"] == "message_error"]
+    assert len(errors) == 1 and errors[0]["retryAfter"] == 1
+    release.set()
+    client.disconnect()
+    os.rmdir(room_dir)
+    print("   ✅ PASS")
+    return True
+
+def test_reserved_places():
+    """Test that reserved places keep room order without holding a worker, and the total backlog cap"""
+    print("\n🎟️ Reserved Place Testing")
+    print("=" * 40)
+
+    from lanes import RoomLanes, Saturated
+
+    lanes = RoomLanes(workers=1, backlog_limit=10, total_backlog_limit=3)
+    order = []
+    first = lanes.reserve("ROOM01")
+    behind = lanes.submit("ROOM01", order.append, "second")
+
+    # The only worker stays free for other rooms while ROOM01 waits on its ticket
+    assert lanes.run("ROOM02", lambda: "free") == "free"
+    assert not behind.done() and lanes.stats()["busy"] == 0
+
+    lanes.submit("ROOM03", lambda: None).result()
+    lanes.reserve("ROOM04")
+    try:
+        lanes.reserve("ROOM05")
+        assert False, "the total backlog must be capped"
+    except Saturated as e:
+        print(f"   Rejected: {e}")
+    assert lanes.stats()["queued"] == 3
+
+    lanes.fill(first, order.append, "first").result()
+    behind.result()
+    assert order == ["first", "second"]
+
+    # A skipped place lets the room move on
+    skipped = lanes.reserve("ROOM06")
+    after = lanes.submit("ROOM06", lambda: "after")
+    lanes.skip(skipped)
+    assert after.result() == "after"
+    print("   ✅ PASS")
+    return True
+
+def test_deadline_from_arrival():
+    """Test that messages wait for the PII model off-lane, within a deadline taken on arrival"""
+    print("\n⏱️ Deadline From Arrival Testing")
+    print("=" * 40)
+
+    import server
+    from inference import INTERACTIVE
+
+    room = server.create_room("LANE02")["id"]
+    http = server.app.test_client()
+    http.post('/session', json={"name": "alice", "room": room})
+    client = server.socketio.test_client(server.app, flask_test_client=http)
+    client.get_received()
+
+    def received(name):
+        packets = []
+        for _ in range(100):
+            packets += [packet["args"][0] for packet in client.get_received() if packet["name"] == name]
+            if packets:
+                return packets
+            time.sleep(0.02)
+        return packets
+
+    gate = server.inference_gates["pii"]
+    release = threading.Event()
+    def hold():
+        with gate.admit(INTERACTIVE):
+            release.wait(5)
+    holders = [threading.Thread(target=hold) for _ in range(gate.concurrency)]
+    for holder in holders:
+        holder.start()
+    while gate.stats()["running"] < gate.concurrency:
+        time.sleep(0.01)
+
+    deadlines = dict(server.INFERENCE_DEADLINES)
+    run_pii_model = server.run_pii_model
+    server.INFERENCE_DEADLINES[INTERACTIVE] = 0.2
+    server.run_pii_model = lambda text: ([], text)
+    expired = gate.stats()["expired"]
+    try:
+        # The model is busy: the message waits in the gate, not on a lane worker
+        sender = threading.Thread(target=client.emit, args=('message', {"message": "hello"}))
+        sender.start()
+        time.sleep(0.1)
+        assert server.lanes.stats()["busy"] == 0
+        errors = received('message_error')
+        sender.join()
+        print(f"   Errors: {errors}")
+        assert len(errors) == 1 and "deadline" in errors[0]["error"]
+        assert gate.stats()["expired"] == expired + 1
+
+        # The rejected message gave up its place, so the next one goes through
+        release.set()
+        for holder in holders:
+            holder.join()
+        client.emit('message', {"message": "again"})
+        messages = received('new_message')
+        assert [message["content"] for message in messages] == ["again"]
+    finally:
+        release.set()
+        server.INFERENCE_DEADLINES.update(deadlines)
+        server.run_pii_model = run_pii_model
+    client.disconnect()
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_room_order(), test_cross_room_parallelism(), test_backlog_limit(), test_busy_room_upload(),
+               test_reserved_places(), test_deadline_from_arrival()]
+    print(f"\n📊 {sum(results)}/{len(results)} lane tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
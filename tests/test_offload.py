@@ -0,0 +1,108 @@
+import sys
+import os
+import time
+import tempfile
+import threading
+import subprocess
+
+# Add the backend directory to path so we can import the server functions
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.append(BACKEND_DIR)
+
+# Direct tests for offloaded blocking work and the production entry point (no server required)
+def test_offloader_pool():
+    """Test that offloaded calls run on a bounded pool and report their outcome"""
+    print("🏋️ Offloader Pool Testing")
+    print("=" * 40)
+
+    from offload import Offloader
+
+    offloader = Offloader('threading', max_workers=2)
+    lock = threading.Lock()
+    running = [0, 0]  # now, peak
+
+    def work(duration):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(duration)
+        with lock:
+            running[0] -= 1
+        return threading.current_thread().name
+
+    callers = [threading.Thread(target=offloader.run, args=(work, 0.05)) for _ in range(6)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    assert offloader.run(work, 0).startswith('offload')
+    print(f"   Peak concurrency {running[1]} with 2 workers")
+    assert running[1] == 2
+
+    try:
+        offloader.run(lambda: 1 / 0)
+        assert False, "exceptions must reach the caller"
+    except ZeroDivisionError:
+        pass
+    stats = offloader.stats()
+    assert stats["completed"] == 8 and stats["failed"] == 1 and stats["queued"] == 0 and stats["running"] == 0
+    print("   ✅ PASS")
+    return True
+
+def test_snapshot_packing_offloaded():
+    """Test that snapshot packing goes through the event log's offload hook"""
+    print("\n💾 Offloaded Snapshot Packing Testing")
+    print("=" * 40)
+
+    from event_log import EventLog
+
+    calls = []
+
+    def offload(fn, *args):
+        calls.append(fn.__name__)
+        return fn(*args)
+
+    log = EventLog(tempfile.mkdtemp(prefix="offload_test_"), offload=offload)
+    log.recover()
+    log.open()
+    log.append("room_created", {"room": "ROOM01"})
+    assert log.snapshot(lambda: {"rooms": {}, "users": {}, "messages": {"ROOM01": {"count": 1, "packed": [{"id": "m"}]}}})
+    while log.snapshot_in_progress:
+        time.sleep(0.01)
+    log.close()
+    state, _ = EventLog(log.directory).recover()
+    print(f"   Offloaded: {calls}")
+    assert calls == ["_pack_state"] and isinstance(state["messages"]["ROOM01"]["packed"], bytes)
+    print("   ✅ PASS")
+    return True
+
+def test_serve_entry_point():
+    """Test that the production entry point picks a cooperative server and refuses the development one"""
+    print("\n🚀 Production Entry Point Testing")
+    print("=" * 40)
+
+    def serve(*args, **overrides):
+        env = {key: value for key, value in os.environ.items() if key != 'ASYNC_MODE'}
+        env.update(overrides, EVENT_LOG_DIR=tempfile.mkdtemp(prefix="serve_test_"))
+        return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env,
+                              capture_output=True, text=True, timeout=120)
+
+    result = serve('serve.py', ASYNC_MODE='threading')
+    print(f"   Exit {result.returncode}: {result.stderr.strip()[:80]}...")
+    assert result.returncode != 0 and "ASYNC_MODE=eventlet or gevent" in result.stderr
+
+    # requirements.txt installs eventlet, so serve.py picks it without ASYNC_MODE
+    result = serve('-c', 'import serve; print("MODE", serve.socketio.async_mode)')
+    mode = result.stdout.split("MODE")[-1].strip()
+    print(f"   Default async mode: {mode}")
+    assert result.returncode == 0 and mode in ('eventlet', 'gevent'), result.stderr
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_offloader_pool(), test_snapshot_packing_offloaded(), test_serve_entry_point()]
+    print(f"\n📊 {sum(results)}/{len(results)} offload tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
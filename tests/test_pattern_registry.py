@@ -0,0 +1,132 @@
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+
+# Add the PII scripts directory to path so we can import the detectors
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'scripts'))
+
+# Direct tests for the hot-reloadable PII pattern registry (no server required)
+def write_config(path, redaction, pattern=r"\b\d{3}-\d{3}-\d{4}\b", version=1):
+    config = {"version": version, "detectors": {"basic": {
+        "phone_number": {"patterns": [pattern], "redaction": redaction, "requires": ["digit"]}
+    }}}
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    # Make every rewrite visible to the mtime check, however fast it follows the last
+    stamp = time.time() + write_config.bumps
+    write_config.bumps += 1
+    os.utime(path, (stamp, stamp))
+
+write_config.bumps = 0
+
+def test_strict_rejection():
+    """Test that an invalid table is rejected at startup and ignored on reload"""
+    print("🚫 Invalid Pattern Table Testing")
+    print("=" * 40)
+
+    from pattern_registry import PatternRegistry
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "patterns.json")
+        write_config(path, "[PHONE]", pattern="(unclosed")
+        try:
+            PatternRegistry(path)
+            assert False, "an invalid pattern must be rejected in strict mode"
+        except ValueError as e:
+            print(f"   Rejected: {e}")
+            assert "phone_number" in str(e)
+
+        write_config(path, "[PHONE]")
+        registry = PatternRegistry(path)
+        version = registry.version()
+        write_config(path, "[PHONE]", pattern="(unclosed", version=2)
+        assert registry.reload() is False
+        assert registry.version() == version
+        assert registry.snapshot("basic").by_type["phone_number"].redaction == "[PHONE]"
+    print("   ✅ PASS")
+    return True
+
+def test_atomic_swap():
+    """Test that readers always see one whole version while reloads swap tables"""
+    print("\n🔄 Atomic Snapshot Swap Testing")
+    print("=" * 40)
+
+    from pattern_registry import PatternRegistry
+    from pii_detection import PIIDetector
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "patterns.json")
+        write_config(path, "[ONE]")
+        registry = PatternRegistry(path)
+        detector = PIIDetector(registry)
+        before = registry.snapshot("basic")
+        first = detector.detect_pii("call 555-123-4567")
+
+        redactions = {registry.version(): "[ONE]"}
+        results = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                results.append(detector.detect_pii("call 555-123-4567"))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(20):
+            redaction = "[TWO]" if i % 2 == 0 else "[ONE]"
+            write_config(path, redaction, version=i + 2)
+            assert registry.reload()
+            redactions[registry.version()] = redaction
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        print(f"   {len(redactions)} versions, {len(results)} detections during reloads")
+        assert before.by_type["phone_number"].redaction == "[ONE]"
+        for result in results:
+            assert result["redacted_content"] == f"call {redactions[result['pattern_version']]}"
+        last = detector.detect_pii("call 555-123-4567")
+        assert last["pattern_version"] != first["pattern_version"]
+        assert last["pattern_version"] == registry.version()
+    print("   ✅ PASS")
+    return True
+
+def test_watch_reload():
+    """Test that the watcher picks up edits and the shared registry is watched"""
+    print("\n👀 Pattern File Watch Testing")
+    print("=" * 40)
+
+    from pattern_registry import PatternRegistry, default_registry
+    from pii_detection import PIIDetector
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "patterns.json")
+        write_config(path, "[ONE]")
+        registry = PatternRegistry(path, poll_interval=0.05)
+        registry.watch()
+        detector = PIIDetector(registry)
+        version = detector.detect_pii("call 555-123-4567")["pattern_version"]
+
+        write_config(path, "[TWO]", version=2)
+        deadline = time.time() + 5
+        while registry.version() == version and time.time() < deadline:
+            time.sleep(0.01)
+        result = detector.detect_pii("call 555-123-4567")
+        print(f"   Version {version} -> {result['pattern_version']}: {result['redacted_content']}")
+        assert result["pattern_version"] != version and result["redacted_content"] == "call [TWO]"
+
+    assert default_registry()._watcher is not None
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_strict_rejection(), test_atomic_swap(), test_watch_reload()]
+    print(f"\n📊 {sum(results)}/{len(results)} pattern registry tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,105 @@
+import sys
+import os
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for merging model and rule-based PII spans (no server required)
+def span(pii_type, start, end, confidence, source):
+    return {"type": pii_type, "start": start, "end": end, "confidence": confidence, "source": source}
+
+def test_same_type_agreement():
+    """Test that overlapping spans of one type merge and reinforce each other"""
+    print("🤝 Same-type Agreement Testing")
+    print("=" * 40)
+
+    from pii_ensemble import merge_spans
+
+    merged = merge_spans(
+        [span("TELEPHONENUM", 10, 22, 0.8, "model")],
+        [span("TELEPHONENUM", 8, 20, 0.75, "rules")]
+    )
+    print(f"   Merged: {merged}")
+    assert len(merged) == 1
+    assert (merged[0]["start"], merged[0]["end"]) == (8, 22)
+    assert abs(merged[0]["confidence"] - (1 - 0.2 * 0.25)) < 1e-9
+    assert merged[0]["sources"] == ["model", "rules"]
+
+    # Two spans from one source do not count as independent evidence
+    merged = merge_spans([span("EMAIL", 0, 5, 0.6, "model"), span("EMAIL", 4, 9, 0.7, "model")])
+    assert len(merged) == 1 and merged[0]["confidence"] == 0.7 and merged[0]["sources"] == ["model"]
+    print("   ✅ PASS")
+    return True
+
+def test_cross_type_conflicts():
+    """Test that overlapping spans of different types keep only the best one"""
+    print("\n⚖️ Cross-type Conflict Testing")
+    print("=" * 40)
+
+    from pii_ensemble import merge_spans
+
+    # Higher confidence wins
+    merged = merge_spans([span("TELEPHONENUM", 0, 12, 0.9, "model")], [span("SOCIALNUM", 0, 11, 0.8, "rules")])
+    assert [m["type"] for m in merged] == ["TELEPHONENUM"]
+
+    # Equal confidence: type priority decides
+    merged = merge_spans([span("TELEPHONENUM", 0, 12, 0.9, "model")], [span("CREDITCARDNUMBER", 2, 14, 0.9, "rules")])
+    assert [m["type"] for m in merged] == ["CREDITCARDNUMBER"]
+
+    # A chain of overlaps keeps non-overlapping winners in text order
+    merged = merge_spans([
+        span("GIVENNAME", 0, 5, 0.95, "model"),
+        span("SURNAME", 3, 10, 0.7, "model"),
+        span("CITY", 9, 15, 0.9, "model"),
+        span("EMAIL", 20, 30, 0.99, "model")
+    ])
+    print(f"   Kept: {[(m['type'], m['start'], m['end']) for m in merged]}")
+    assert [m["type"] for m in merged] == ["GIVENNAME", "CITY", "EMAIL"]
+    print("   ✅ PASS")
+    return True
+
+def test_confidence_floor():
+    """Test that weak and empty spans are dropped before merging"""
+    print("\n🧹 Confidence Floor Testing")
+    print("=" * 40)
+
+    from pii_ensemble import merge_spans
+
+    merged = merge_spans([
+        span("GIVENNAME", 0, 4, 0.55, "model"),
+        span("EMAIL", 10, 20, 0.55, "model"),
+        span("ZIPCODE", 30, 35, 0.3, "model"),
+        span("EMAIL", 40, 40, 0.99, "model")
+    ])
+    assert [m["type"] for m in merged] == ["EMAIL"]
+    print("   ✅ PASS")
+    return True
+
+def test_rule_detector_results():
+    """Test that rule-based results map onto the model's entity groups"""
+    print("\n📏 Rule-based Result Testing")
+    print("=" * 40)
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'scripts'))
+    from enhanced_pii_detection import EnhancedPIIDetector
+    from pii_ensemble import merge_spans, model_spans, rule_spans, to_results
+
+    text = "call me at 555-123-4567 or email jane.doe@example.com"
+    detection = EnhancedPIIDetector().detect_pii(text)
+    model = [{"entity_group": "TELEPHONENUM", "start": 11, "end": 23, "score": 0.93}]
+    results = to_results(merge_spans(model_spans(model), rule_spans(detection)))
+    print(f"   Results: {[(r['entity_group'], text[r['start']:r['end']], r['sources']) for r in results]}")
+    assert [r["entity_group"] for r in results] == ["TELEPHONENUM", "EMAIL"]
+    assert results[0]["sources"] == ["model", "rules"] and results[1]["sources"] == ["rules"]
+    assert text[results[1]["start"]:results[1]["end"]] == "jane.doe@example.com"
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    tests = [test_same_type_agreement, test_cross_type_conflicts, test_confidence_floor, test_rule_detector_results]
+    passed = sum(1 for test in tests if test())
+    print(f"\n📊 {passed}/{len(tests)} PII ensemble tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,102 @@
+import sys
+import os
+import random
+
+# Add the PII scripts directory to path so we can import the detectors
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'scripts'))
+
+# Direct tests for span-based redaction (no server required)
+def test_overlapping_spans():
+    """Test nested, adjacent and equal-confidence spans"""
+    print("🧩 Overlapping Span Testing")
+    print("=" * 40)
+
+    from pii_redaction import Span, build_redaction
+
+    text = "card 4532-1234-5678-9012 ok"
+    # Nested: the whole card beats the phone-like run inside it
+    spans = [Span(5, 24, "credit_card", "[CARD]", 0.9), Span(10, 24, "phone_number", "[PHONE]", 0.8)]
+    redacted, applied, offset_map = build_redaction(text, spans)
+    print(f"   Nested: {redacted}")
+    assert redacted == "card [CARD] ok" and [span.pii_type for span in applied] == ["credit_card"]
+    assert offset_map == [(5, 24, 5, 11)]
+
+    # A more confident inner span wins over its container
+    spans = [Span(5, 24, "credit_card", "[CARD]", 0.7), Span(10, 24, "phone_number", "[PHONE]", 0.8)]
+    assert build_redaction(text, spans)[0] == "card 4532-[PHONE] ok"
+
+    # Adjacent spans do not overlap, so both apply
+    text = "ab12cd"
+    spans = [Span(2, 4, "digits", "[D]"), Span(0, 2, "letters", "[L]"), Span(4, 6, "letters", "[L]")]
+    redacted, applied, offset_map = build_redaction(text, spans)
+    assert redacted == "[L][D][L]" and offset_map == [(0, 2, 0, 3), (2, 4, 3, 6), (4, 6, 6, 9)]
+
+    # Equal confidence: lower priority first, then the longer span
+    text = "id 123-45-6789"
+    spans = [Span(3, 14, "phone_number", "[PHONE]", 0.9, priority=1), Span(3, 14, "ssn", "[SSN]", 0.9, priority=0)]
+    assert build_redaction(text, spans)[0] == "id [SSN]"
+    spans = [Span(3, 9, "ssn", "[A]", 0.9), Span(3, 14, "ssn", "[B]", 0.9), Span(7, 14, "ssn", "[C]", 0.9)]
+    assert build_redaction(text, spans)[0] == "id [B]"
+
+    # Empty spans are ignored
+    assert build_redaction(text, [Span(5, 5, "ssn", "[X]")])[0] == text
+    print("   ✅ PASS")
+    return True
+
+def test_offset_mapping():
+    """Test original-to-redacted position mapping around and inside replacements"""
+    print("\n🧭 Offset Mapping Testing")
+    print("=" * 40)
+
+    from pii_redaction import Span, build_redaction, map_offset
+
+    text = "mail jane@example.com or 555-123-4567 now"
+    redacted, _, offset_map = build_redaction(text, [
+        Span(5, 21, "email", "[EMAIL]"), Span(25, 37, "phone_number", "[PHONE]")
+    ])
+    print(f"   {redacted} {offset_map}")
+    assert map_offset(offset_map, 0) == 0
+    assert map_offset(offset_map, 5) == 5 and map_offset(offset_map, 12) == 5
+    assert redacted[map_offset(offset_map, 22):].startswith("or ")
+    assert redacted[map_offset(offset_map, 30):].startswith("[PHONE]")
+    assert redacted[map_offset(offset_map, 38):] == "now"
+    assert map_offset(offset_map, len(text)) == len(redacted)
+    assert map_offset([], 7) == 7
+    print("   ✅ PASS")
+    return True
+
+def test_select_disjoint():
+    """Test greedy interval selection against a brute-force reference"""
+    print("\n📐 Disjoint Interval Selection Testing")
+    print("=" * 40)
+
+    from pii_redaction import select_disjoint
+
+    def reference(bounds, order):
+        accepted = []
+        for index in order:
+            start, end = bounds[index]
+            if start < end and all(end <= bounds[other][0] or bounds[other][1] <= start for other in accepted):
+                accepted.append(index)
+        return sorted(accepted, key=lambda index: bounds[index][0])
+
+    rng = random.Random(7)
+    for _ in range(2000):
+        bounds = []
+        for _ in range(rng.randint(0, 25)):
+            start = rng.randint(0, 40)
+            bounds.append((start, start + rng.randint(-1, 8)))
+        order = list(range(len(bounds)))
+        rng.shuffle(order)
+        assert select_disjoint(bounds, order) == reference(bounds, order), (bounds, order)
+    print("   2000 random cases match")
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_overlapping_spans(), test_offset_mapping(), test_select_disjoint()]
+    print(f"\n📊 {sum(results)}/{len(results)} PII redaction tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
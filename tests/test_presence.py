@@ -0,0 +1,102 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for users, membership and connection counts (no server required)
+def make_registry(max_users=100, user_ttl=60):
+    from presence import PresenceRegistry
+
+    rooms = {"ROOM01": {"participants": {}}, "ROOM02": {"participants": {}}}
+    return PresenceRegistry(rooms, max_users=max_users, user_ttl=user_ttl), rooms
+
+def test_multi_tab_refcount():
+    """Test that a user stays present until their last tab disconnects"""
+    print("🗂️ Multi-Tab Connection Testing")
+    print("=" * 40)
+
+    presence, rooms = make_registry()
+    alice = presence.session_user("alice")
+    assert presence.session_user("alice", alice["id"]) is alice
+    presence.join("ROOM01", alice["id"], "alice")
+
+    # Two tabs in one room and one in another
+    assert presence.connect("ROOM01", alice["id"]) is True
+    assert presence.connect("ROOM01", alice["id"]) is False
+    assert presence.connect("ROOM02", alice["id"]) is True
+    assert alice["isOnline"]
+    assert presence.stats() == {"users": 1, "onlineUsers": 1, "connections": 3}
+
+    assert presence.disconnect("ROOM01", alice["id"]) is False
+    assert presence.disconnect("ROOM01", alice["id"]) is True
+    assert alice["isOnline"], "still connected to ROOM02"
+    assert presence.disconnect("ROOM01", alice["id"]) is False, "already fully disconnected"
+    assert presence.disconnect("ROOM02", alice["id"]) is True
+    assert not alice["isOnline"]
+    assert presence.stats() == {"users": 1, "onlineUsers": 0, "connections": 0}
+    assert presence.participants("ROOM01") == ["alice"]
+
+    presence.leave("ROOM01", alice["id"])
+    assert presence.participants("ROOM01") == [] and not presence.memberships
+    print("   ✅ PASS")
+    return True
+
+def test_lru_capacity():
+    """Test that capacity evicts the least recently seen unconnected users"""
+    print("\n📦 LRU Capacity Testing")
+    print("=" * 40)
+
+    presence, rooms = make_registry(max_users=3)
+    users = [presence.session_user(name) for name in ("u0", "u1", "u2")]
+    for user in users:
+        presence.join("ROOM01", user["id"], user["name"])
+    presence.connect("ROOM01", users[0]["id"])
+    # Seeing u1 again moves it to the most recent end
+    presence.session_user("u1", users[1]["id"])
+
+    presence.session_user("u3")
+    names = [user["name"] for user in presence.users.values()]
+    print(f"   Users after one insert: {names}")
+    assert names == ["u0", "u1", "u3"], "u2 is the oldest user without a connection"
+    assert users[2]["id"] not in rooms["ROOM01"]["participants"]
+    assert users[2]["id"] not in presence.memberships
+
+    presence.session_user("u4")
+    names = [user["name"] for user in presence.users.values()]
+    assert names == ["u0", "u3", "u4"], "connected u0 is spared"
+    print("   ✅ PASS")
+    return True
+
+def test_evict_expired():
+    """Test TTL eviction from the oldest end, sparing connected users"""
+    print("\n⌛ Expired User Eviction Testing")
+    print("=" * 40)
+
+    presence, rooms = make_registry(user_ttl=60)
+    users = [presence.session_user(f"u{i}") for i in range(5)]
+    for user in users:
+        presence.join("ROOM01", user["id"], user["name"])
+    presence.connect("ROOM01", users[1]["id"])
+
+    # Connecting refreshed u1, so it is now the most recently seen
+    later = datetime.now() + timedelta(seconds=120)
+    assert presence.evict_expired(2, now=later) == 2
+    assert [user["name"] for user in presence.users.values()] == ["u3", "u4", "u1"]
+    assert presence.evict_expired(10, now=later) == 2, "connected u1 is spared"
+    assert [user["name"] for user in presence.users.values()] == ["u1"]
+    assert list(rooms["ROOM01"]["participants"]) == [users[1]["id"]]
+
+    # Nothing is old enough yet
+    assert presence.evict_expired(10) == 0
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_multi_tab_refcount(), test_lru_capacity(), test_evict_expired()]
+    print(f"\n📊 {sum(results)}/{len(results)} presence tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,121 @@
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Add the PII scripts directory to path so we can import the detectors
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'scripts'))
+
+# Direct tests for offline corpus redaction (no server required)
+LINES = [
+    "call me at 555-123-4567 tonight",
+    "my email is jane.doe@example.com",
+    "see you at noon",
+    "ssn 123-45-6789, line two\nof the same message"
+]
+
+def write_jsonl(path, count, malformed=()):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            if i in malformed:
+                f.write('{"id": %d, "content": "broken\n' % i)
+            else:
+                f.write(json.dumps({"id": i, "content": LINES[i % len(LINES)], "meta": "é"}) + "\n")
+
+def test_round_trip():
+    """Test that JSONL and CSV records come back in order with only the text redacted"""
+    print("🔁 Corpus Round-trip Testing")
+    print("=" * 40)
+
+    from redact_corpus import redact_corpus
+    from enhanced_pii_detection import EnhancedPIIDetector
+
+    detector = EnhancedPIIDetector()
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "chats.jsonl")
+        target = os.path.join(directory, "chats.redacted.jsonl")
+        write_jsonl(source, 40, malformed={7, 21})
+        count = redact_corpus(source, target, workers=2, chunk_size=5)
+        with open(target, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        print(f"   JSONL: {count} records written, 2 malformed lines skipped")
+        assert count == 38 and [record["id"] for record in records] == [i for i in range(40) if i not in (7, 21)]
+        for record in records:
+            expected = detector.detect_pii(LINES[record["id"] % len(LINES)])["redacted_content"]
+            assert record["content"] == expected and record["meta"] == "é"
+        assert "555-123-4567" not in open(target, encoding='utf-8').read()
+        assert not os.path.exists(target + ".checkpoint")
+
+        source = os.path.join(directory, "chats.csv")
+        target = os.path.join(directory, "chats.redacted.csv")
+        with open(source, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "content"])
+            writer.writerows([i, LINES[i % len(LINES)]] for i in range(12))
+        assert redact_corpus(source, target, workers=1, chunk_size=5) == 12
+        with open(target, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert [row["id"] for row in rows] == [str(i) for i in range(12)]
+        assert rows[3]["content"].endswith("of the same message") and "123-45-6789" not in rows[3]["content"]
+    print("   ✅ PASS")
+    return True
+
+def test_resume():
+    """Test that a run interrupted mid-way resumes from its byte offset to identical output"""
+    print("\n⏯️ Corpus Resume Testing")
+    print("=" * 40)
+
+    import redact_corpus as corpus
+
+    for fmt in ("jsonl", "csv"):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, f"chats.{fmt}")
+            if fmt == "jsonl":
+                write_jsonl(source, 60, malformed={13})
+            else:
+                with open(source, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["id", "content"])
+                    writer.writerows([i, LINES[i % len(LINES)]] for i in range(60))
+            clean = os.path.join(directory, f"clean.{fmt}")
+            corpus.redact_corpus(source, clean, workers=1, chunk_size=7)
+
+            # Interrupt the writer part-way through a chunk
+            target = os.path.join(directory, f"resumed.{fmt}")
+            write = corpus.CorpusWriter.write
+            written = [0]
+
+            def failing_write(self, record, text):
+                written[0] += 1
+                if written[0] == 25:
+                    raise KeyboardInterrupt
+                write(self, record, text)
+
+            corpus.CorpusWriter.write = failing_write
+            try:
+                corpus.redact_corpus(source, target, workers=1, chunk_size=7)
+                assert False, "the run should have been interrupted"
+            except KeyboardInterrupt:
+                pass
+            finally:
+                corpus.CorpusWriter.write = write
+
+            checkpoint = corpus.load_checkpoint(target + ".checkpoint", source)
+            print(f"   {fmt}: interrupted after {checkpoint['records']} records at byte {checkpoint['input_offset']}")
+            assert checkpoint["records"] == 21 and 0 < checkpoint["input_offset"] < os.path.getsize(source)
+
+            corpus.redact_corpus(source, target, workers=1, chunk_size=7, resume=True)
+            with open(clean, 'rb') as f, open(target, 'rb') as g:
+                assert f.read() == g.read()
+            assert not os.path.exists(target + ".checkpoint")
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_round_trip(), test_resume()]
+    print(f"\n📊 {sum(results)}/{len(results)} corpus redaction tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,189 @@
+import sys
+import os
+import time
+import threading
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for the server-side search index (no HTTP server required)
+def make_message(index, content):
+    return {
+        "id": f"msg_{index}",
+        "chatId": "SEARCH",
+        "senderId": "tester",
+        "content": content,
+        "type": "text",
+        "timestamp": f"2025-08-30T10:{index // 60:02d}:{index % 60:02d}",
+        "timestampMs": index
+    }
+
+def test_search_index():
+    """Test prefix matching, recency ranking and pagination"""
+    print("🔎 Search Index Testing")
+    print("=" * 40)
+
+    from search_index import RoomSearchIndex
+
+    index = RoomSearchIndex()
+    contents = [
+        "Meeting at the office tomorrow",
+        "Call me at [REDACTED] about the meeting",
+        "Lunch menu is ready",
+        "The meeting moved to Friday",
+    ]
+    for position, content in enumerate(contents):
+        index.add(position, content)
+
+    positions, total = index.search("meet")
+    print(f"   'meet' -> {positions} (total {total})")
+    assert positions == [3, 1, 0] and total == 3
+
+    positions, total = index.search("meeting fri")
+    print(f"   'meeting fri' -> {positions}")
+    assert positions == [3] and total == 1
+
+    positions, total = index.search("redacted")
+    print(f"   'redacted' -> {positions}")
+    assert positions == [] and total == 0
+
+    positions, total = index.search("meet", offset=1, limit=1)
+    print(f"   'meet' page 2 -> {positions}")
+    assert positions == [1] and total == 3
+
+    # Terms added after a query are merged into the vocabulary by the next one
+    index.add(4, "Meetup on Monday")
+    positions, total = index.search("meet")
+    assert positions == [4, 3, 1, 0] and total == 4
+    assert index.vocabulary == sorted(index.postings) and not index.new_terms
+
+    print("   ✅ PASS")
+    return True
+
+def test_search_endpoint():
+    """Test the /search endpoint against a room with many messages"""
+    print("\n🌐 Search Endpoint Testing")
+    print("=" * 40)
+
+    import server
+
+    room_code = "SEARCH"
+    server.create_room(room_code)
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf"]
+    for i in range(100000):
+        content = f"{words[i % 7]} {words[(i * 3) % 7]} update {i}"
+        server.append_message(room_code, make_message(i, content))
+    # Original (unredacted) text is never indexed
+    message = make_message(100000, "my email is [REDACTED]")
+    message["transcription"] = {"original": "my email is secret@example.com"}
+    server.append_message(room_code, message)
+
+    client = server.app.test_client()
+    start = time.perf_counter()
+    response = client.get(f"/search/{room_code}?q=cha&limit=5")
+    first_ms = (time.perf_counter() - start) * 1000
+    data = response.get_json()
+    print(f"   First query: {first_ms:.1f} ms, total {data['totalCount']}")
+    assert response.status_code == 200
+    assert data["results"][0]["id"] == "msg_99998"
+    assert data["hasMore"]
+
+    start = time.perf_counter()
+    response = client.get(f"/search/{room_code}?q=golf%20upd&offset=5&limit=5")
+    print(f"   Warm query: {(time.perf_counter() - start) * 1000:.1f} ms")
+    data = response.get_json()
+    assert len(data["results"]) == 5
+
+    # New messages are indexed on append
+    server.append_message(room_code, make_message(100001, "zulu arrived"))
+    data = client.get(f"/search/{room_code}?q=zul").get_json()
+    assert data["totalCount"] == 1
+
+    data = client.get(f"/search/{room_code}?q=secret").get_json()
+    assert data["totalCount"] == 0
+
+    assert client.get("/search/NOPE?q=x").status_code == 404
+    assert client.get(f"/search/{room_code}").status_code == 400
+
+    server.delete_room(room_code)
+    print("   ✅ PASS")
+    return True
+
+def test_append_during_build():
+    """Test that appends do not wait for an index build, and the build still sees them"""
+    print("\n🏁 Append During Build Testing")
+    print("=" * 40)
+
+    import server
+
+    # New rooms start with views that appends keep current
+    room_code = server.create_room("RACENW")["id"]
+    server.append_message(room_code, make_message(0, "fresh words"))
+    assert server.search_indexes[room_code].search("fresh")[1] == 1
+    server.delete_room(room_code)
+
+    builders = {
+        "search": ("add_search_content", server.search_indexes,
+                   lambda room_code: server.get_search_index(room_code).search("late")[1] == 1),
+        "positions": ("add_message_position", server.message_positions,
+                      lambda room_code: "msg_late" in server.get_message_positions(room_code)),
+        "voice": ("add_voice_summary", server.voice_histories,
+                  lambda room_code: [m["id"] for m in server.get_voice_history_view(room_code)] == ["msg_0", "msg_late"]),
+    }
+    for name, (adder, views, check) in builders.items():
+        room_code = server.create_room(f"RACE{name[:2].upper()}")["id"]
+        message = dict(make_message(0, "early voice note"), type="voice", audioUrl="/voice/a.wav")
+        server.append_message(room_code, message)
+        # As after a restart: the view is built on first use
+        views.pop(room_code)
+
+        started, appended = threading.Event(), threading.Event()
+        add = getattr(server, adder)
+        def slow_add(view, position, message):
+            if position == 0:
+                started.set()
+                appended.wait(5)
+            add(view, position, message)
+        setattr(server, adder, slow_add)
+        try:
+            builder = threading.Thread(target=check, args=(room_code,))
+            builder.start()
+            assert started.wait(5)
+            late = dict(make_message(1, "late voice note"), id="msg_late", type="voice", audioUrl="/voice/b.wav")
+            start = time.perf_counter()
+            server.append_message(room_code, late)
+            waited = time.perf_counter() - start
+            appended.set()
+            builder.join()
+        finally:
+            setattr(server, adder, add)
+
+        print(f"   {name}: append took {waited * 1000:.1f} ms, {'indexed' if check(room_code) else 'missed'}")
+        assert waited < 1, "append waited for the build"
+        assert check(room_code), f"{name} missed the late message"
+        server.delete_room(room_code)
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    tests = [
+        ("Search Index", test_search_index),
+        ("Search Endpoint", test_search_endpoint),
+        ("Append During Build", test_append_during_build)
+    ]
+    results = []
+    for test_name, test_func in tests:
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"❌ {test_name} test failed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n📊 TEST RESULTS SUMMARY")
+    print("=" * 30)
+    for test_name, passed in results:
+        print(f"   {test_name}: {'✅ PASS' if passed else '❌ FAIL'}")
+    return all(passed for _, passed in results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,130 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the backend directory to path so we can import the server functions
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Direct tests for idle room and upload garbage collection (no server required)
+def make_sweeper(rooms, upload_folder, batch_size=500, evicted_users=None):
+    from sweeper import IdleSweeper
+
+    deleted = []
+    def delete_room(room_code):
+        deleted.append(room_code)
+        del rooms[room_code]
+    def evict_users(limit):
+        if evicted_users is not None:
+            evicted_users.append(limit)
+        return 0
+    sweeper = IdleSweeper(rooms, evict_users, delete_room, upload_folder,
+                          room_ttl=60, upload_grace=30, batch_size=batch_size)
+    return sweeper, deleted
+
+def room(idle_seconds, participants=()):
+    return {"participants": list(participants), "updatedAt": datetime.now() - timedelta(seconds=idle_seconds)}
+
+def write_upload(upload_folder, directory, name, size=10, age=0):
+    path = os.path.join(upload_folder, directory)
+    os.makedirs(path, exist_ok=True)
+    file_path = os.path.join(path, name)
+    with open(file_path, "wb") as f:
+        f.write(b"x" * size)
+    if age:
+        past = time.time() - age
+        os.utime(file_path, (past, past))
+        os.utime(path, (past, past))
+    return file_path
+
+def test_bounded_ticks():
+    """Test that each tick examines at most batch_size items and resumes"""
+    print("🧹 Bounded Tick Testing")
+    print("=" * 40)
+
+    rooms = {f"ROOM{i:02d}": room(120) for i in range(25)}
+    evicted_users = []
+    sweeper, deleted = make_sweeper(rooms, os.path.join(tempfile.gettempdir(), "missing-uploads"),
+                                    batch_size=10, evicted_users=evicted_users)
+
+    counts = [sweeper.tick()["rooms"] for _ in range(3)]
+    print(f"   Rooms evicted per tick: {counts}")
+    assert counts == [10, 10, 5]
+    assert deleted == sorted(deleted) and len(set(deleted)) == 25 and not rooms
+    assert evicted_users == [10, 10, 10]
+    assert sweeper.stats["passes"] == 1 and sweeper.stats["ticks"] == 3
+    assert sweeper.stats["roomsEvicted"] == 25
+
+    # A new pass starts only once the previous one is finished
+    rooms["LATE01"] = room(120)
+    assert sweeper.tick()["rooms"] == 1 and sweeper.stats["passes"] == 2
+    print("   ✅ PASS")
+    return True
+
+def test_room_eviction():
+    """Test that idle empty rooms go and occupied or recent rooms stay"""
+    print("\n🚪 Idle Room Eviction Testing")
+    print("=" * 40)
+
+    upload_folder = tempfile.mkdtemp()
+    try:
+        rooms = {
+            "IDLE01": room(120),
+            "BUSY01": room(120, participants=["alice"]),
+            "FRESH1": room(5),
+        }
+        write_upload(upload_folder, "IDLE01", "a.webm", size=100)
+        write_upload(upload_folder, "IDLE01", "b.webm", size=50)
+        write_upload(upload_folder, "BUSY01", "c.webm", size=10)
+        sweeper, deleted = make_sweeper(rooms, upload_folder)
+
+        reclaimed = sweeper.tick()
+        print(f"   Reclaimed: {reclaimed}")
+        assert deleted == ["IDLE01"]
+        assert set(rooms) == {"BUSY01", "FRESH1"}
+        assert reclaimed["rooms"] == 1 and reclaimed["audioFiles"] == 2 and reclaimed["bytes"] == 150
+        assert not os.path.exists(os.path.join(upload_folder, "IDLE01"))
+        assert os.path.exists(os.path.join(upload_folder, "BUSY01", "c.webm"))
+    finally:
+        shutil.rmtree(upload_folder)
+    print("   ✅ PASS")
+    return True
+
+def test_orphan_uploads():
+    """Test that orphaned upload directories are removed after the grace period"""
+    print("\n🗑️ Orphan Upload Cleanup Testing")
+    print("=" * 40)
+
+    upload_folder = tempfile.mkdtemp()
+    try:
+        rooms = {"LIVE01": room(0)}
+        write_upload(upload_folder, "GONE01", "old.webm", size=20, age=120)
+        write_upload(upload_folder, "GONE02", "new.webm", size=20)
+        write_upload(upload_folder, "LIVE01", "live.webm", size=20, age=120)
+        old_scratch = write_upload(upload_folder, "test_uploads", "old.wav", size=7, age=120)
+        new_scratch = write_upload(upload_folder, "test_uploads", "new.wav", size=7)
+        # Recent writes refresh the scratch directory's own mtime
+        os.utime(os.path.join(upload_folder, "test_uploads"), None)
+        sweeper, _ = make_sweeper(rooms, upload_folder)
+
+        reclaimed = sweeper.tick()
+        print(f"   Reclaimed: {reclaimed}")
+        assert not os.path.exists(os.path.join(upload_folder, "GONE01"))
+        assert os.path.exists(os.path.join(upload_folder, "GONE02", "new.webm")), "inside the grace period"
+        assert os.path.exists(os.path.join(upload_folder, "LIVE01", "live.webm")), "room still exists"
+        assert not os.path.exists(old_scratch) and os.path.exists(new_scratch)
+        assert reclaimed["rooms"] == 0 and reclaimed["audioFiles"] == 2 and reclaimed["bytes"] == 27
+    finally:
+        shutil.rmtree(upload_folder)
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_bounded_ticks(), test_room_eviction(), test_orphan_uploads()]
+    print(f"\n📊 {sum(results)}/{len(results)} sweeper tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,119 @@
+import sys
+import os
+import re
+import random
+
+# Add the util directory to path; windowing has no model dependencies
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'util'))
+
+# Direct tests for splitting long texts into model windows (no model required)
+def tokenize(text):
+    """Whitespace tokens as (char_start, char_end) offsets"""
+    return [m.span() for m in re.finditer(r'\S+', text)]
+
+def fake_model(text):
+    """Stand-in for the pipeline: runs of numbers are phone numbers"""
+    return [{"entity_group": "TELEPHONENUM", "start": m.start(), "end": m.end(), "score": 0.9, "word": m.group()}
+            for m in re.finditer(r'\d+(?: \d+)*', text)]
+
+def detect(text, max_tokens, overlap):
+    from token_windows import window_spans, collect_entities, merge_entities
+    spans = window_spans(tokenize(text), len(text), max_tokens, overlap)
+    if spans is None:
+        return fake_model(text)
+    outputs = [fake_model(text[start:end]) for start, end, _, _ in spans]
+    return merge_entities(text, collect_entities(spans, outputs))
+
+def test_window_boundaries():
+    """Test entities that straddle a window boundary come out whole, once"""
+    print("🪟 Window Boundary Testing")
+    print("=" * 40)
+
+    from token_windows import window_spans
+
+    # Ten tokens per window, four shared: windows start at tokens 0, 6, 12
+    words = ["w"] * 18
+    text = " ".join(words)
+    spans = window_spans(tokenize(text), len(text), 10, 4)
+    assert [tokenize(text).index((s[0], s[0] + 1)) for s in spans] == [0, 6, 12]
+    assert spans[0][2] == 0 and spans[-1][3] == len(text)
+    assert all(a[3] == b[2] for a, b in zip(spans, spans[1:])), "cores must tile the text"
+    assert window_spans(tokenize(text), len(text), 18, 4) is None
+
+    # Tokens 7-8 cross the first core boundary; tokens 9-10 cross the first window's end
+    for first in (7, 9):
+        words = ["w"] * 18
+        words[first:first + 2] = ["555", "1234"]
+        text = " ".join(words)
+        found = detect(text, 10, 4)
+        print(f"   Tokens {first}-{first + 1}: {[e['word'] for e in found]}")
+        assert [e['word'] for e in found] == ["555 1234"]
+        assert found == fake_model(text)
+    print("   ✅ PASS")
+    return True
+
+def test_overlap_deduplication():
+    """Test windowed detection matches a single pass over the whole text"""
+    print("\n🔁 Overlap Deduplication Testing")
+    print("=" * 40)
+
+    rng = random.Random(39)
+    for _ in range(500):
+        words = []
+        while len(words) < rng.randint(20, 80):
+            words += [str(rng.randint(100, 999)) for _ in range(rng.randint(1, 3))]
+            words += ["w"] * rng.randint(1, 4)
+        text = " ".join(words)
+        expected = [(e['start'], e['end']) for e in fake_model(text)]
+        found = [(e['start'], e['end']) for e in detect(text, 10, 4)]
+        assert found == expected, text
+    print("   500 random texts match")
+    print("   ✅ PASS")
+    return True
+
+def test_merge_entities():
+    """Test touching same-type pieces merge and other types stay apart"""
+    print("\n🧵 Entity Merge Testing")
+    print("=" * 40)
+
+    from token_windows import merge_entities
+
+    text = "Jane Doe 555"
+    entities = [
+        {"entity_group": "SURNAME", "start": 5, "end": 8, "score": 0.7},
+        {"entity_group": "GIVENNAME", "start": 0, "end": 4, "score": 0.9},
+        {"entity_group": "TELEPHONENUM", "start": 9, "end": 11, "score": 0.6},
+        {"entity_group": "TELEPHONENUM", "start": 11, "end": 12, "score": 0.8},
+    ]
+    merged = merge_entities(text, entities)
+    assert [(e['entity_group'], e['word'], e['score']) for e in merged] == [
+        ("GIVENNAME", "Jane", 0.9), ("SURNAME", "Doe", 0.7), ("TELEPHONENUM", "555", 0.8)]
+    assert entities[2]['end'] == 11, "inputs must not be modified"
+    print("   ✅ PASS")
+    return True
+
+def test_token_count_planning():
+    """Test texts are windowed by token count, not character count"""
+    print("\n📏 Batch Planning Testing")
+    print("=" * 40)
+
+    from token_windows import plan_batches
+
+    # Text 1 has fewer characters than the limit but more tokens
+    texts = ["short", "日本語のテキスト", "", "a b c"]
+    token_counts = [1, 24, None, 3]
+    assert len(texts[1]) < 10 < token_counts[1]
+    long_texts, batches = plan_batches(token_counts, 10, 2)
+    assert long_texts == [1]
+    assert batches == [[0, 3]]
+    assert plan_batches([5, 1, 3, 2, 4], 10, 2) == ([], [[1, 3], [2, 4], [0]])
+    print("   ✅ PASS")
+    return True
+
+def run_all_tests():
+    results = [test_window_boundaries(), test_overlap_deduplication(), test_merge_entities(), test_token_count_planning()]
+    print(f"\n📊 {sum(results)}/{len(results)} token window tests passed")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
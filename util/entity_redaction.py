@@ -0,0 +1,66 @@
+REDACTED = '[REDACTED]'
+
+# Typed placeholders for the PII model's entity groups; others use [GROUP]
+PLACEHOLDERS = {
+    'TELEPHONENUM': '[PHONE]',
+    'EMAIL': '[EMAIL]',
+    'GIVENNAME': '[NAME]',
+    'SURNAME': '[NAME]',
+    'SOCIALNUM': '[SSN]',
+    'CREDITCARDNUMBER': '[CARD]',
+    'IPADDRESS': '[IP]',
+    'DATEOFBIRTH': '[DOB]',
+    'STREET': '[ADDRESS]',
+    'BUILDINGNUM': '[ADDRESS]',
+    'ZIPCODE': '[ADDRESS]',
+    'CITY': '[ADDRESS]'
+}
+
+
+def placeholder(entity_group, typed):
+    if not typed:
+        return REDACTED
+    return PLACEHOLDERS.get(entity_group, f'[{entity_group}]')
+
+
+def redact_entities(text, results, typed=False):
+    """
+    Replace entity spans with placeholders in one left-to-right pass.
+
+    Overlapping spans become one placeholder, named after the highest-scoring
+    entity in it. Touching spans are joined too when their placeholders are
+    the same, so "[REDACTED][REDACTED]" never appears. With ``typed`` the
+    placeholder names the kind of PII, e.g. "[EMAIL]" or "[PHONE]".
+
+    Returns the redacted text and an offset map of
+    (original_start, original_end, redacted_start, redacted_end) per
+    placeholder, in text order.
+    """
+    spans = sorted(
+        (r['start'], r['end'], r.get('score', 0.0), placeholder(r.get('entity_group'), typed))
+        for r in results if r['end'] > r['start']
+    )
+
+    merged = []  # [start, end, score, placeholder]
+    for start, end, score, label in spans:
+        last = merged[-1] if merged else None
+        if last and (start < last[1] or (start == last[1] and label == last[3])):
+            last[1] = max(last[1], end)
+            if score > last[2]:
+                last[2], last[3] = score, label
+        else:
+            merged.append([start, end, score, label])
+
+    pieces = []
+    offset_map = []
+    cursor = 0
+    length = 0
+    for start, end, _, label in merged:
+        pieces.append(text[cursor:start])
+        length += start - cursor
+        pieces.append(label)
+        offset_map.append((start, end, length, length + len(label)))
+        length += len(label)
+        cursor = end
+    pieces.append(text[cursor:])
+    return ''.join(pieces), offset_map
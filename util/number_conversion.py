@@ -0,0 +1,82 @@
+import re
+
+# Word to digit mapping for number conversion
+WORD_TO_DIGIT = {
+    'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
+    'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9'
+}
+
+NUMBER_WORDS = '|'.join(WORD_TO_DIGIT)
+
+# A spoken digit sequence: whole digit words joined only by whitespace, '-',
+# '.', "dash" or "hyphen". Matched against lowercased text.
+SEQUENCE_RE = re.compile(
+    rf'\b(?:{NUMBER_WORDS})\b(?:(?:[\s\-.]|\bdash\b|\bhyphen\b)+\b(?:{NUMBER_WORDS})\b)*'
+)
+# Cues right before a sequence that say what kind of number it is
+CARD_CUE_RE = re.compile(r'\bcredit\s+card\s+number\s+is\s+$')
+PHONE_CUE_RE = re.compile(r'\b(?:phone|number|call)\s+(?:is\s+|me\s+at\s+)?$')
+CUE_LOOKBACK = 64
+SEPARATORS = str.maketrans('-.', '  ')
+
+MIN_SEQUENCE = 3  # fewer spoken digits in a row is normal speech
+MIN_CREDIT_CARD = 8
+MIN_PHONE = 7
+
+
+def _cue(lowered, start):
+    """The kind of number announced by the words right before ``start``."""
+    lookback = max(0, start - CUE_LOOKBACK)
+    if CARD_CUE_RE.search(lowered, lookback, start):
+        return 'card'
+    if PHONE_CUE_RE.search(lowered, lookback, start):
+        return 'phone'
+    return None
+
+
+def _format_sequence(digits, has_dash, cue):
+    if cue == 'card' and len(digits) >= MIN_CREDIT_CARD:
+        return '-'.join(digits[i:i+4] for i in range(0, len(digits), 4))
+    if has_dash and len(digits) == 9:  # Likely SSN
+        return f"{digits[:3]}-{digits[3:5]}-{digits[5:]}"
+    if cue == 'phone' and len(digits) >= MIN_PHONE:
+        if len(digits) == 10:  # US phone number
+            return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+        return f"{digits[:3]}-{digits[3:]}"
+    if has_dash and len(digits) >= 6:  # Likely phone or credit card: dashes every 4 digits
+        return '-'.join(digits[i:i+4] for i in range(0, len(digits), 4))
+    return digits
+
+
+def convert_spoken_numbers_to_digits(text):
+    """
+    Convert sequences of spoken numbers to digits to preserve sensitive information like:
+    - Credit card numbers: "one two three four" -> "1234"
+    - Phone numbers: "five five five one two three" -> "555123"
+    - SSN: "one two three four five six seven eight nine" -> "123456789"
+
+    Runs in a single pass: "credit card number is" or "phone/number/call
+    (is|me at)" right before a sequence selects card or phone formatting.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Some characters lowercase to several; fall back to per-character lowering
+        lowered = ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+    pieces = []
+    position = 0
+    for match in SEQUENCE_RE.finditer(lowered):
+        sequence = match.group()
+        words = sequence.translate(SEPARATORS).split()
+        digits = ''.join(WORD_TO_DIGIT.get(word, '') for word in words)
+        if len(digits) < MIN_SEQUENCE:
+            # Keep original text for short sequences (normal speech)
+            continue
+        start, end = match.span()
+        cue = _cue(lowered, start) if len(digits) >= MIN_PHONE else None
+        has_dash = 'dash' in sequence or '-' in sequence
+        pieces.append(text[position:start])
+        pieces.append(_format_sequence(digits, has_dash, cue))
+        position = end
+    pieces.append(text[position:])
+    return ''.join(pieces)
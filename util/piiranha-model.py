@@ -1,5 +1,10 @@
+import os
+import sys
 from transformers import pipeline
-import re
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from entity_redaction import redact_entities
+from token_windows import window_spans, collect_entities, merge_entities, plan_batches
 
 
 pipe = pipeline("token-classification",
@@ -18,12 +23,66 @@ def main():
     print("Original:", text)
     print("Redacted:", redact_text(text, results))
 
-def redact_text(text, results):
-    redacted = text
-    # Process in reverse order to avoid messing up character indices
-    for r in sorted(results, key=lambda x: x['start'], reverse=True):
-        redacted = redacted[:r['start']] + "[REDACTED]" + redacted[r['end']:]
-    return re.sub(r'(\[REDACTED\])+', '[REDACTED]', redacted)
+# Tokens shared by neighbouring windows when a long text is split
+WINDOW_OVERLAP = 64
+
+
+def _window_tokens():
+    # Leave room for the special tokens the pipeline adds around every window
+    return min(pipe.tokenizer.model_max_length, 512) - 2
+
+
+def _windows(text, max_tokens, overlap):
+    """Token windows over a text; see ``window_spans``"""
+    offsets = pipe.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+    return window_spans(offsets, len(text), max_tokens, overlap)
+
+
+def detect_long(text, batch_size=16):
+    """
+    Run the pipeline over a text of any length.
+
+    Texts longer than the model's token limit are tokenised once, split into
+    overlapping windows that run as one batch, and their entities are mapped
+    back to offsets in the original string. Each window only keeps entities
+    that start in its core, so nothing is reported twice.
+    """
+    spans = _windows(text, _window_tokens(), WINDOW_OVERLAP)
+    if spans is None:
+        return pipe(text)
+
+    outputs = pipe([text[start:end] for start, end, _, _ in spans], batch_size=batch_size)
+    return merge_entities(text, collect_entities(spans, outputs))
+
+
+def detect_batch(texts, batch_size=16):
+    """
+    Run the pipeline over many texts and return their results in input order.
+
+    Texts are sorted by token count and batched in that order, so each batch
+    holds similar lengths and padding to the longest text in a batch is
+    minimal. Texts over the model's token limit go through ``detect_long``.
+    """
+    results = [[] for _ in texts]
+    present = [i for i, text in enumerate(texts) if text.strip()]
+    token_counts = [None] * len(texts)
+    if present:
+        token_ids = pipe.tokenizer([texts[i] for i in present], add_special_tokens=False)["input_ids"]
+        for i, ids in zip(present, token_ids):
+            token_counts[i] = len(ids)
+
+    long_texts, batches = plan_batches(token_counts, _window_tokens(), batch_size)
+    for i in long_texts:
+        results[i] = detect_long(texts[i], batch_size)
+    for bucket in batches:
+        outputs = pipe([texts[i] for i in bucket], batch_size=batch_size)
+        for i, output in zip(bucket, outputs):
+            results[i] = output
+    return results
+
+def redact_text(text, results, typed=False):
+    """Redacted text; see ``redact_entities`` for the offset map as well"""
+    return redact_entities(text, results, typed)[0]
 
 
 
@@ -0,0 +1,66 @@
+def window_spans(offsets, text_length, max_tokens, overlap):
+    """
+    Split a tokenised text into overlapping token windows.
+
+    ``offsets`` holds the (char_start, char_end) of every token. Returns
+    (char_start, char_end, core_start, core_end) per window, where the core
+    is the part of the text the window is responsible for: each overlap is
+    split down the middle between the two windows that share it. Returns
+    None when the text fits in a single window.
+    """
+    if len(offsets) <= max_tokens:
+        return None
+
+    starts = list(range(0, len(offsets) - overlap, max_tokens - overlap))
+    spans = []
+    for n, start in enumerate(starts):
+        end = min(start + max_tokens, len(offsets))
+        core_start = 0 if n == 0 else offsets[start + overlap // 2][0]
+        core_end = text_length if n == len(starts) - 1 else offsets[starts[n + 1] + overlap // 2][0]
+        spans.append((offsets[start][0], offsets[end - 1][1], core_start, core_end))
+    return spans
+
+
+def collect_entities(spans, outputs):
+    """
+    Map each window's entities back to offsets in the original text.
+
+    A window only keeps entities that start in its core, so an entity seen by
+    two overlapping windows is reported once, by the window that sees it whole.
+    """
+    entities = []
+    for (char_start, _, core_start, core_end), results in zip(spans, outputs):
+        for r in results:
+            start, end = r['start'] + char_start, r['end'] + char_start
+            if core_start <= start < core_end:
+                entities.append({**r, 'start': start, 'end': end})
+    return entities
+
+
+def merge_entities(text, entities):
+    """Join same-type entities that overlap or touch, e.g. across a window boundary"""
+    merged = []
+    for entity in sorted(entities, key=lambda e: e['start']):
+        last = merged[-1] if merged else None
+        if last and entity['entity_group'] == last['entity_group'] and entity['start'] <= last['end']:
+            last['end'] = max(last['end'], entity['end'])
+            last['score'] = max(last['score'], entity['score'])
+        else:
+            merged.append(dict(entity))
+    for entity in merged:
+        entity['word'] = text[entity['start']:entity['end']]
+    return merged
+
+
+def plan_batches(token_counts, max_tokens, batch_size):
+    """
+    Split texts into ones needing windows and length-sorted batches of the rest.
+
+    ``token_counts`` has each text's token count, or None to skip the text.
+    The decision uses tokens, not characters: a tokenizer can produce more
+    tokens than a text has characters. Returns (long_indices, batches).
+    """
+    order = sorted((i for i, count in enumerate(token_counts) if count), key=lambda i: token_counts[i])
+    long_indices = [i for i in order if token_counts[i] > max_tokens]
+    short = [i for i in order if token_counts[i] <= max_tokens]
+    return long_indices, [short[start:start + batch_size] for start in range(0, len(short), batch_size)]